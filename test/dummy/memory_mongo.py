@@ -0,0 +1,325 @@
+""" In-memory MongoDB client for the unit tests
+
+    The client implements the subset of the PyMongo 4 API used by
+    :class:`tori.db.driver.mongodriver.Driver` so that the sessions can be
+    tested without a server. Every call is recorded in
+    :attr:`MemoryClient.operations` as a tuple of the name of the operation
+    and the name of the collection.
+"""
+import copy
+import re
+
+from bson    import ObjectId
+from tornado import gen
+
+from tori.db.driver.interface   import AsyncDriverInterface
+from tori.db.driver.mongodriver import Driver
+
+def _resolve(document, field):
+    value = document
+
+    for key in field.split('.'):
+        value = value.get(key) if isinstance(value, dict) else None
+
+    return value
+
+def _compare(value, operand, expected):
+    if operand == '$eq':
+        return value == expected if not isinstance(value, list) else expected in value or value == expected
+    elif operand == '$ne':
+        return not _compare(value, '$eq', expected)
+    elif operand == '$in':
+        candidates = value if isinstance(value, list) else [value]
+
+        return any([candidate in expected for candidate in candidates])
+    elif operand == '$nin':
+        return not _compare(value, '$in', expected)
+    elif operand == '$exists':
+        return (value is not None) == bool(expected)
+    elif operand == '$regex':
+        return isinstance(value, str) and re.search(expected, value) is not None
+
+    if value is None or expected is None:
+        return False
+
+    try:
+        if operand == '$gt':
+            return value > expected
+        elif operand == '$gte':
+            return value >= expected
+        elif operand == '$lt':
+            return value < expected
+        elif operand == '$lte':
+            return value <= expected
+    except TypeError:
+        return False # MongoDB only compares the values of the same type.
+
+    raise NotImplementedError('Unsupported operator: {}'.format(operand))
+
+def match(document, criteria):
+    """ Check if the document matches the criteria """
+    for key in criteria:
+        condition = criteria[key]
+
+        if key == '$or':
+            if not any([match(document, sub_criteria) for sub_criteria in condition]):
+                return False
+
+            continue
+
+        if key == '$and':
+            if not all([match(document, sub_criteria) for sub_criteria in condition]):
+                return False
+
+            continue
+
+        value = _resolve(document, key)
+
+        if isinstance(condition, dict) and condition and all([name[0] == '$' for name in condition]):
+            if not all([_compare(value, operand, condition[operand]) for operand in condition]):
+                return False
+
+            continue
+
+        if not _compare(value, '$eq', condition):
+            return False
+
+    return True
+
+def _sorting_key(field):
+    def key(document):
+        value = _resolve(document, field)
+
+        # The missing values come first in the ascending order.
+        return (0, None) if value is None else (1, value)
+
+    return key
+
+class MemoryCursor(object):
+    def __init__(self, document_list, projection):
+        self._document_list = document_list
+        self._projection    = projection
+        self._offset        = 0
+        self._limit         = 0
+
+    def sort(self, key_or_list, direction=1):
+        order_list = key_or_list if isinstance(key_or_list, list) else [(key_or_list, direction)]
+
+        # As the sorting is stable, the least significant key is sorted first.
+        for field, direction in reversed(order_list):
+            self._document_list.sort(key=_sorting_key(field), reverse=direction < 0)
+
+        return self
+
+    def skip(self, offset):
+        self._offset = offset
+
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def explain(self):
+        return {'documents': len(self._document_list)}
+
+    def __iter__(self):
+        document_list = self._document_list[self._offset:]
+
+        if self._limit:
+            document_list = document_list[:self._limit]
+
+        for document in document_list:
+            yield self._project(copy.deepcopy(document))
+
+    def _project(self, document):
+        if not self._projection:
+            return document
+
+        projection = self._projection
+
+        if isinstance(projection, list):
+            projection = dict([(name, True) for name in projection])
+
+        # The object ID is included unless excluded explicitly.
+        if any([projection[name] for name in projection]):
+            return dict([
+                (name, document[name])
+                for name in document
+                if projection.get(name, name == '_id')
+            ])
+
+        return dict([(name, document[name]) for name in document if name not in projection])
+
+class InsertManyResult(object):
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+class MemoryCollection(object):
+    def __init__(self, client, name):
+        self.name = name
+
+        self._client        = client
+        self._document_map  = {} # object ID => document, in the insertion order
+        self._insertion_ids = []
+
+    @property
+    def documents(self):
+        """ The stored documents in the insertion order """
+        return [self._document_map[object_id] for object_id in self._insertion_ids if object_id in self._document_map]
+
+    def find(self, filter=None, projection=None):
+        self._client.record('find', self.name)
+
+        return MemoryCursor(
+            [document for document in self.documents if match(document, filter or {})],
+            projection
+        )
+
+    def find_one(self, filter=None, projection=None):
+        for document in self.find(filter, projection).limit(1):
+            return document
+
+        return None
+
+    def insert_many(self, documents):
+        self._client.record('insert_many', self.name)
+
+        for document in documents:
+            if '_id' not in document:
+                document['_id'] = ObjectId()
+
+        if any([document['_id'] in self._document_map for document in documents]):
+            raise ValueError('Duplicate key')
+
+        for document in documents:
+            self._document_map[document['_id']] = copy.deepcopy(document)
+            self._insertion_ids.append(document['_id'])
+
+        return InsertManyResult([document['_id'] for document in documents])
+
+    def bulk_write(self, requests, ordered=True):
+        self._client.record('bulk_write', self.name)
+
+        for request in requests:
+            for document in self.documents:
+                if not match(document, request._filter):
+                    continue
+
+                self._update(document, request._doc)
+
+                break
+
+    def delete_many(self, filter):
+        self._client.record('delete_many', self.name)
+
+        for document in [document for document in self.documents if match(document, filter)]:
+            del self._document_map[document['_id']]
+
+    def count_documents(self, filter):
+        self._client.record('count_documents', self.name)
+
+        return len([document for document in self.documents if match(document, filter)])
+
+    def estimated_document_count(self):
+        self._client.record('estimated_document_count', self.name)
+
+        return len(self._document_map)
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def ensure_index(self, *args, **kwargs):
+        pass
+
+    def _update(self, document, change_set):
+        for name in change_set.get('$set', {}):
+            document[name] = copy.deepcopy(change_set['$set'][name])
+
+        for name in change_set.get('$unset', {}):
+            if name in document:
+                del document[name]
+
+class MemoryDatabase(object):
+    def __init__(self, client):
+        self._client         = client
+        self._collection_map = {}
+
+    def __getitem__(self, name):
+        if name not in self._collection_map:
+            self._collection_map[name] = MemoryCollection(self._client, name)
+
+        return self._collection_map[name]
+
+class MemoryClient(object):
+    def __init__(self):
+        self.operations = []
+
+        self._database_map = {}
+
+    def record(self, operation, collection_name):
+        self.operations.append((operation, collection_name))
+
+    def count(self, operation, collection_name=None):
+        """ Count the recorded operations """
+        return len([
+            recorded
+            for recorded in self.operations
+            if recorded[0] == operation and collection_name in (None, recorded[1])
+        ])
+
+    def __getitem__(self, name):
+        if name not in self._database_map:
+            self._database_map[name] = MemoryDatabase(self)
+
+        return self._database_map[name]
+
+class MemoryDriver(Driver):
+    """ MongoDB driver on the in-memory client """
+    def __init__(self):
+        super(MemoryDriver, self).__init__({'name': 'tori_test'})
+
+        self.client = MemoryClient()
+
+    def documents(self, collection_name):
+        """ Retrieve the stored documents of the collection """
+        return self.collection(collection_name).documents
+
+class AsyncMemoryDriver(MemoryDriver, AsyncDriverInterface):
+    """ Asynchronous driver on the in-memory client
+
+        Every operation yields to the event loop once before it is executed.
+    """
+    @gen.coroutine
+    def _defer(self, method, *args):
+        yield gen.moment
+
+        raise gen.Return(method(*args))
+
+    def find_one_async(self, collection_name, criteria, fields=None):
+        return self._defer(self.find_one, collection_name, criteria, fields)
+
+    def query_async(self, metadata, query, iterating_constrains):
+        return self._defer(self.query, metadata, query, iterating_constrains)
+
+    def count_async(self, metadata, query):
+        return self._defer(self.count, metadata, query)
+
+    def aggregate_async(self, metadata, native_aggregation):
+        return self._defer(self.aggregate, metadata, native_aggregation)
+
+    def insert_many_async(self, collection_name, data_list):
+        return self._defer(self.insert_many, collection_name, data_list)
+
+    def update_many_async(self, collection_name, update_list):
+        return self._defer(self.update_many, collection_name, update_list)
+
+    def remove_async(self, collection_name, criteria):
+        return self._defer(self.remove, collection_name, criteria)
+
+    def remove_many_async(self, collection_name, object_id_list):
+        return self._defer(self.remove_many, collection_name, object_id_list)
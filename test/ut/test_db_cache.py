@@ -0,0 +1,154 @@
+import unittest
+
+from tori.db.cache  import CachePolicy, EntityCache, QueryCache
+from tori.db.entity import entity
+from tori.db.metadata.helper import EntityMetadataHelper
+
+@entity('countries', cache=CachePolicy(max_size=2))
+class Country(object):
+    def __init__(self, name):
+        self.name = name
+
+@entity('rates', cache=CachePolicy(ttl=-1))
+class Rate(object):
+    def __init__(self, value):
+        self.value = value
+
+@entity('orders')
+class Order(object):
+    def __init__(self, amount):
+        self.amount = amount
+
+class TestDbQueryCache(unittest.TestCase):
+    """ Test the query result cache. """
+    def setUp(self):
+        self.cache = QueryCache(max_size=2)
+
+    def test_positive_copy(self):
+        """ Test if the cached result is not changed by the consumers. """
+        data_set = [{'_id': 1, 'name': 'th'}]
+
+        self.cache.put('countries', {}, {}, data_set)
+
+        data_set[0]['name'] = 'jp'
+
+        result = self.cache.get('countries', {}, {})
+
+        result[0]['name'] = 'kr'
+
+        self.assertEqual(self.cache.get('countries', {}, {}), [{'_id': 1, 'name': 'th'}])
+
+    def test_positive_least_recently_used(self):
+        """ Test if the least recently used result is evicted first. """
+        self.cache.put('countries', {'a': 1}, {}, [])
+        self.cache.put('countries', {'a': 2}, {}, [])
+
+        self.cache.get('countries', {'a': 1}, {})
+        self.cache.put('countries', {'a': 3}, {}, [])
+
+        self.assertEqual(self.cache.size, 2)
+        self.assertEqual(self.cache.get('countries', {'a': 1}, {}), [])
+        self.assertIsNone(self.cache.get('countries', {'a': 2}, {}))
+        self.assertEqual(self.cache.get('countries', {'a': 3}, {}), [])
+
+    def test_positive_constrains_in_key(self):
+        """ Test if the same query with different constrains is cached separately. """
+        self.cache.put('countries', {}, {'limit': 1}, [{'_id': 1}])
+
+        self.assertIsNone(self.cache.get('countries', {}, {'limit': 2}))
+        self.assertEqual(self.cache.hit_count, 0)
+        self.assertEqual(self.cache.miss_count, 1)
+
+    def test_positive_expiry(self):
+        """ Test if the expired result is not returned. """
+        self.cache.put('countries', {}, {}, [{'_id': 1}], ttl=-1)
+
+        self.assertIsNone(self.cache.get('countries', {}, {}))
+        self.assertEqual(self.cache.size, 0)
+
+    def test_positive_invalidation(self):
+        """ Test if only the results of the invalidated collection are removed. """
+        self.cache.put('countries', {}, {}, [{'_id': 1}])
+        self.cache.put('orders', {}, {}, [{'_id': 2}])
+
+        self.cache.invalidate('countries')
+
+        self.assertIsNone(self.cache.get('countries', {}, {}))
+        self.assertEqual(self.cache.get('orders', {}, {}), [{'_id': 2}])
+
+    def test_negative_stale_version(self):
+        """ Test if the result read before the invalidation is not stored. """
+        version = self.cache.version('countries')
+
+        self.cache.invalidate('countries')
+        self.cache.put('countries', {}, {}, [{'_id': 1}], version=version)
+
+        self.assertIsNone(self.cache.get('countries', {}, {}))
+
+        self.cache.put('countries', {}, {}, [{'_id': 1}], version=self.cache.version('countries'))
+
+        self.assertEqual(self.cache.get('countries', {}, {}), [{'_id': 1}])
+
+class TestDbEntityCache(unittest.TestCase):
+    """ Test the second-level entity cache. """
+    def setUp(self):
+        self.cache    = EntityCache()
+        self.metadata = EntityMetadataHelper.extract(Country)
+
+    def test_positive_copy(self):
+        """ Test if the cached document is not changed by the consumers. """
+        self.cache.put(self.metadata, [{'_id': 1, 'name': 'th'}])
+
+        self.cache.get(self.metadata, 1)['name'] = 'jp'
+
+        self.assertEqual(self.cache.get(self.metadata, 1), {'_id': 1, 'name': 'th'})
+
+    def test_positive_least_recently_used(self):
+        """ Test if the least recently used document of the class is evicted first. """
+        self.cache.put(self.metadata, [{'_id': 1}, {'_id': 2}])
+
+        self.cache.get(self.metadata, 1)
+        self.cache.put(self.metadata, [{'_id': 3}])
+
+        self.assertEqual(sorted(self.cache.get_many(self.metadata, [1, 2, 3]).keys()), [1, 3])
+        self.assertEqual(self.cache.hit_count, 3)
+        self.assertEqual(self.cache.miss_count, 1)
+
+    def test_positive_expiry(self):
+        """ Test if the expired document is not returned. """
+        metadata = EntityMetadataHelper.extract(Rate)
+
+        self.cache.put(metadata, [{'_id': 1, 'value': 0.5}])
+
+        self.assertIsNone(self.cache.get(metadata, 1))
+        self.assertEqual(self.cache.size, 0)
+
+    def test_positive_invalidation(self):
+        """ Test if the invalidated documents are removed. """
+        self.cache.put(self.metadata, [{'_id': 1}, {'_id': 2}])
+
+        self.cache.invalidate('countries', [1])
+
+        self.assertEqual(list(self.cache.get_many(self.metadata, [1, 2]).keys()), [2])
+
+        self.cache.invalidate('countries')
+
+        self.assertEqual(self.cache.size, 0)
+
+    def test_negative_stale_version(self):
+        """ Test if the documents read before the invalidation are not stored. """
+        version = self.cache.version('countries')
+
+        self.cache.invalidate('countries', [1])
+        self.cache.put(self.metadata, [{'_id': 1}], version)
+
+        self.assertIsNone(self.cache.get(self.metadata, 1))
+
+    def test_negative_without_policy(self):
+        """ Test if the documents of the classes without a caching policy are not cached. """
+        metadata = EntityMetadataHelper.extract(Order)
+
+        self.cache.put(metadata, [{'_id': 1}])
+
+        self.assertIsNone(self.cache.get(metadata, 1))
+        self.assertEqual(self.cache.size, 0)
@@ -0,0 +1,60 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.common  import ProxyObject
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+from tori.db.mapper  import link, AssociationType
+
+@entity('customers')
+class Customer(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('customer', target=Customer, association=AssociationType.MANY_TO_ONE)
+@entity('orders')
+class Order(object):
+    def __init__(self, number, customer):
+        self.number   = number
+        self.customer = customer
+
+class TestDbCommonProxyBatchLoader(unittest.TestCase):
+    """ Test the batched loading of the proxy objects. """
+    def setUp(self):
+        self.driver  = MemoryDriver()
+        self.manager = Manager(self.driver)
+
+        session       = self.manager.open_session()
+        customer_list = [Customer('customer {}'.format(index)) for index in range(3)]
+
+        session.persist(*customer_list)
+        session.persist(*[Order(index, customer_list[index % 3]) for index in range(6)])
+        session.flush()
+
+        self.session    = self.manager.open_session()
+        self.repository = self.session.repository(Order)
+
+        self.driver.client.operations = []
+
+    def test_positive_one_query_per_class(self):
+        """ Test if the pending proxies of the same class are loaded with one query. """
+        order_list = self.repository.find(self.repository.new_criteria('e'))
+
+        self.assertTrue(all([isinstance(order.customer, ProxyObject) for order in order_list]))
+        self.assertEqual(self.driver.client.count('find', 'customers'), 0)
+
+        self.assertEqual(
+            sorted([(order.number, order.customer.name) for order in order_list]),
+            [(index, 'customer {}'.format(index % 3)) for index in range(6)]
+        )
+        self.assertEqual(self.driver.client.count('find', 'customers'), 1)
+
+    def test_positive_identity_map(self):
+        """ Test if the proxies of the same entity resolve to the same instance. """
+        order_list = self.repository.find(self.repository.new_criteria('e'))
+        customers  = dict([(order.number, order.customer._actual) for order in order_list])
+
+        self.assertIs(customers[0], customers[3])
+        self.assertIs(self.session.repository(Customer).get(customers[0].id), customers[0])
+        self.assertEqual(self.driver.client.count('find', 'customers'), 1)
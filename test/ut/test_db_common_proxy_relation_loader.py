@@ -0,0 +1,87 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+from tori.db.mapper  import link, AssociationType
+
+@link('songs', target=__name__ + '.Song', inverted_by='album', association=AssociationType.ONE_TO_MANY)
+@entity('albums')
+class Album(object):
+    def __init__(self, name, songs=[]):
+        self.name  = name
+        self.songs = songs
+
+@entity('genres')
+class Genre(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('album', target=Album, association=AssociationType.MANY_TO_ONE)
+@link('genres', target=Genre, association=AssociationType.MANY_TO_MANY)
+@entity('songs')
+class Song(object):
+    def __init__(self, title, album, genres=[]):
+        self.title  = title
+        self.album  = album
+        self.genres = genres
+
+class TestDbCommonProxyRelationLoader(unittest.TestCase):
+    """ Test the lazy loading of the relations across the result. """
+    def setUp(self):
+        self.driver  = MemoryDriver()
+        self.manager = Manager(self.driver)
+
+        session    = self.manager.open_session()
+        genre_list = [Genre('genre {}'.format(index)) for index in range(2)]
+        album_list = [Album('album {}'.format(index)) for index in range(3)]
+
+        session.persist(*genre_list)
+        session.persist(*album_list)
+        session.persist(*[
+            Song('song {}'.format(index), album_list[index % 3], genre_list[:index % 2 + 1])
+            for index in range(6)
+        ])
+        session.flush()
+
+        self.session = self.manager.open_session()
+
+        self.driver.client.operations = []
+
+    def _find(self, cls):
+        repository = self.session.repository(cls)
+
+        return repository.find(repository.new_criteria('e'))
+
+    def test_positive_reverse_mapping(self):
+        """ Test if the reverse mapping of the whole result is loaded with one query on first access. """
+        album_list = self._find(Album)
+
+        self.assertEqual(self.driver.client.count('find', 'songs'), 0)
+
+        self.assertEqual(
+            sorted([(album.name, sorted([song.title for song in album.songs])) for album in album_list]),
+            [
+                ('album 0', ['song 0', 'song 3']),
+                ('album 1', ['song 1', 'song 4']),
+                ('album 2', ['song 2', 'song 5'])
+            ]
+        )
+        self.assertEqual(self.driver.client.count('find', 'songs'), 1)
+
+    def test_positive_many_to_many(self):
+        """ Test if the associations of the whole result are loaded with one query on first access. """
+        song_list = self._find(Song)
+
+        self.assertEqual(self.driver.client.count('find', 'songs_genres'), 0)
+
+        self.assertEqual(
+            sorted([(song.title, sorted([genre.name for genre in song.genres])) for song in song_list]),
+            [
+                ('song {}'.format(index), ['genre 0', 'genre 1'][:index % 2 + 1])
+                for index in range(6)
+            ]
+        )
+        self.assertEqual(self.driver.client.count('find', 'songs_genres'), 1)
+        self.assertEqual(self.driver.client.count('find', 'genres'), 1)
@@ -0,0 +1,57 @@
+import base64
+import unittest
+
+from bson import BSON
+
+from tori.db.criteria import Order, Query
+
+class Score(object):
+    def __init__(self, id, score):
+        self.id    = id
+        self.score = score
+
+class TestDbCriteriaCursor(unittest.TestCase):
+    """ Test the cursor tokens of the keyset pagination. """
+    def setUp(self):
+        self.query = Query('e')
+
+        self.query.order('score', Order.DESC)
+
+    def _forge(self, keyset, signature=b'\0' * 32):
+        encoded = BSON.encode({'keyset': keyset})
+
+        return base64.urlsafe_b64encode(signature + encoded).decode('ascii')
+
+    def test_positive_round_trip(self):
+        """ Test if the cursor token seeks after the entity. """
+        token = self.query.cursor_of(Score('x', 5))
+
+        self.query.after(token)
+
+        self.assertEqual(self.query.seek, (True, [5, 'x']))
+
+    def test_negative_unsigned_token(self):
+        """ Test if the token without the valid signature is rejected. """
+        with self.assertRaises(ValueError):
+            self.query.after(self._forge([5, 'x']))
+
+    def test_negative_tampered_token(self):
+        """ Test if the token is rejected once the keyset is modified. """
+        decoded   = base64.urlsafe_b64decode(self.query.cursor_of(Score('x', 5)).encode('ascii'))
+        signature = decoded[:32]
+
+        with self.assertRaises(ValueError):
+            self.query.after(self._forge([6, 'x'], signature))
+
+    def test_negative_operator_in_keyset(self):
+        """ Test if the query operators are rejected even with the valid signature. """
+        encoded = BSON.encode({'keyset': [{'$gt': ''}, 'x']})
+        token   = base64.urlsafe_b64encode(self.query._sign_cursor(encoded) + encoded).decode('ascii')
+
+        with self.assertRaises(ValueError):
+            self.query.before(token)
+
+    def test_negative_garbage(self):
+        """ Test if the malformed token is rejected. """
+        with self.assertRaises(ValueError):
+            self.query.after('not a token')
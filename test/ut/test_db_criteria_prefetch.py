@@ -0,0 +1,116 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity    import entity
+from tori.db.exception import IntegrityConstraintError
+from tori.db.manager   import Manager
+from tori.db.mapper    import link, AssociationType
+
+@entity('profiles')
+class Profile(object):
+    def __init__(self, bio):
+        self.bio = bio
+
+@link('profile', target=Profile, association=AssociationType.ONE_TO_ONE)
+@link('posts', target=__name__ + '.Post', inverted_by='author', association=AssociationType.ONE_TO_MANY)
+@entity('authors')
+class Author(object):
+    def __init__(self, name, profile, posts=[]):
+        self.name    = name
+        self.profile = profile
+        self.posts   = posts
+
+@entity('labels')
+class Label(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('author', target=Author, association=AssociationType.MANY_TO_ONE)
+@link('labels', target=Label, association=AssociationType.MANY_TO_MANY)
+@entity('posts')
+class Post(object):
+    def __init__(self, title, author, labels=[]):
+        self.title  = title
+        self.author = author
+        self.labels = labels
+
+class TestDbCriteriaPrefetch(unittest.TestCase):
+    """ Test the eager loading of the relations. """
+    def setUp(self):
+        self.driver  = MemoryDriver()
+        self.manager = Manager(self.driver)
+
+        session     = self.manager.open_session()
+        label_list  = [Label('label {}'.format(index)) for index in range(3)]
+        author_list = [Author('author {}'.format(index), Profile('bio {}'.format(index))) for index in range(2)]
+
+        session.persist(*label_list)
+        session.persist(*[author.profile for author in author_list])
+        session.persist(*author_list)
+        session.persist(*[
+            Post('post {}'.format(index), author_list[index % 2], label_list[:index % 3 + 1])
+            for index in range(4)
+        ])
+        session.flush()
+
+        self.session = self.manager.open_session()
+
+        self.driver.client.operations = []
+
+    def _find(self, cls, *property_paths):
+        repository = self.session.repository(cls)
+        query      = repository.new_criteria('e')
+
+        query.prefetch(*property_paths)
+
+        return repository.find(query)
+
+    def test_positive_many_to_one_and_many_to_many(self):
+        """ Test if each prefetched relation is loaded with one query. """
+        post_list = self._find(Post, 'e.author', 'e.labels')
+
+        self.assertEqual(self.driver.client.count('find', 'authors'), 1)
+        self.assertEqual(self.driver.client.count('find', 'posts_labels'), 1)
+        self.assertEqual(self.driver.client.count('find', 'labels'), 1)
+
+        operation_count = len(self.driver.client.operations)
+
+        self.assertEqual(
+            sorted([(post.title, post.author.name, sorted([label.name for label in post.labels])) for post in post_list]),
+            [
+                ('post 0', 'author 0', ['label 0']),
+                ('post 1', 'author 1', ['label 0', 'label 1']),
+                ('post 2', 'author 0', ['label 0', 'label 1', 'label 2']),
+                ('post 3', 'author 1', ['label 0'])
+            ]
+        )
+        self.assertEqual(len(self.driver.client.operations), operation_count)
+
+    def test_positive_one_to_one_and_one_to_many(self):
+        """ Test if the reverse mapping is prefetched with one query. """
+        author_list = self._find(Author, 'e.profile', 'e.posts')
+
+        self.assertEqual(self.driver.client.count('find', 'profiles'), 1)
+        self.assertEqual(self.driver.client.count('find', 'posts'), 1)
+
+        operation_count = len(self.driver.client.operations)
+
+        self.assertEqual(
+            sorted([(author.name, author.profile.bio, sorted([post.title for post in author.posts])) for author in author_list]),
+            [
+                ('author 0', 'bio 0', ['post 0', 'post 2']),
+                ('author 1', 'bio 1', ['post 1', 'post 3'])
+            ]
+        )
+        self.assertEqual(len(self.driver.client.operations), operation_count)
+
+    def test_negative_unknown_property(self):
+        """ Test if the unknown relation is rejected. """
+        repository = self.session.repository(Post)
+        query      = repository.new_criteria('e')
+
+        query.prefetch('e.title')
+
+        with self.assertRaises(IntegrityConstraintError):
+            repository.find(query)
@@ -0,0 +1,53 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+class TestDbDriverMongodriver(unittest.TestCase):
+    """ Test the bulk operations of the MongoDB driver with the PyMongo 4 API. """
+    def setUp(self):
+        self.driver = MemoryDriver()
+
+    def test_positive_insert_many(self):
+        """ Test if the documents are inserted at once and the object IDs are in the same order. """
+        object_id_list = self.driver.insert_many('notes', [{'title': 'a'}, {'title': 'b'}])
+
+        self.assertEqual(self.driver.client.operations, [('insert_many', 'notes')])
+        self.assertEqual([document['_id'] for document in self.driver.documents('notes')], object_id_list)
+
+    def test_positive_update_many(self):
+        """ Test if the documents are updated with one bulk write. """
+        a, b = self.driver.insert_many('notes', [{'title': 'a'}, {'title': 'b'}])
+
+        self.driver.update_many('notes', [
+            ({'_id': a}, {'$set': {'title': 'c'}}),
+            ({'_id': b}, {'$unset': {'title': 1}})
+        ])
+
+        self.assertEqual(self.driver.client.count('bulk_write', 'notes'), 1)
+        self.assertEqual(self.driver.documents('notes'), [{'_id': a, 'title': 'c'}, {'_id': b}])
+
+    def test_positive_remove_many(self):
+        """ Test if the documents are removed with one deletion. """
+        a, b, c = self.driver.insert_many('notes', [{'title': 'a'}, {'title': 'b'}, {'title': 'c'}])
+
+        self.driver.remove_many('notes', [a, c])
+
+        self.assertEqual(self.driver.client.count('delete_many', 'notes'), 1)
+        self.assertEqual(self.driver.documents('notes'), [{'_id': b, 'title': 'b'}])
+
+    def test_positive_remove(self):
+        """ Test if the documents matching the criteria are removed. """
+        self.driver.insert_many('notes', [{'title': 'a'}, {'title': 'b'}, {'title': 'a'}])
+
+        self.driver.remove('notes', {'title': 'a'})
+
+        self.assertEqual([document['title'] for document in self.driver.documents('notes')], ['b'])
+
+    def test_negative_empty_batches(self):
+        """ Test if the empty batches are not sent. """
+        self.assertEqual(self.driver.insert_many('notes', []), [])
+
+        self.driver.update_many('notes', [])
+        self.driver.remove_many('notes', [])
+
+        self.assertEqual(self.driver.client.operations, [])
@@ -0,0 +1,156 @@
+import unittest
+
+from bson.son import SON
+
+from tori.db.criteria import Aggregate, Order, Query
+from tori.db.driver.mongodriver import Dialect
+
+class TestDbDriverMongodriverDialect(unittest.TestCase):
+    """ Test the MongoDB dialect. """
+    def setUp(self):
+        self.dialect = Dialect()
+
+    def test_positive_chunk_constrains(self):
+        """ Test if each chunk loads enough documents for the merged page. """
+        constrains = {'sort': [('score', Order.DESC)], 'skip': 2, 'limit': 3, '_fields': {'score': True}}
+
+        self.assertEqual(
+            self.dialect.get_chunk_constrains(constrains),
+            {'sort': [('score', Order.DESC)], 'limit': 5, '_fields': {'score': True}, '_force_loading': True}
+        )
+
+        # The original constrains are still applicable to the merged result.
+        self.assertEqual(constrains['skip'], 2)
+        self.assertEqual(constrains['limit'], 3)
+
+    def test_positive_chunk_constrains_without_sorting(self):
+        """ Test if the unsorted chunks are not forced to load the documents. """
+        self.assertEqual(self.dialect.get_chunk_constrains({'skip': 2}), {})
+
+    def test_positive_merge_chunk_results(self):
+        """ Test if the chunks are merged, sorted and paginated as one result. """
+        result_lists = [
+            [{'_id': 1, 'score': 10}, {'_id': 2, 'score': 30}, {'_id': 3}],
+            [{'_id': 2, 'score': 30}, {'_id': 4, 'score': 20}, {'_id': 5, 'score': 40}]
+        ]
+        constrains   = {'sort': [('score', Order.DESC)], 'skip': 1, 'limit': 3}
+
+        self.assertEqual(
+            [data['_id'] for data in self.dialect.merge_chunk_results(result_lists, constrains)],
+            [2, 4, 1]
+        )
+
+    def test_positive_merge_chunk_results_by_several_fields(self):
+        """ Test if the missing values come first in the ascending order. """
+        result_lists = [
+            [{'_id': 1, 'rank': 2, 'score': 10}, {'_id': 2, 'rank': 1, 'score': 10}],
+            [{'_id': 3, 'score': 10}, {'_id': 4, 'rank': 1, 'score': 20}]
+        ]
+        constrains   = {'sort': [('score', Order.ASC), ('rank', Order.ASC)], 'skip': 1}
+
+        self.assertEqual(
+            [data['_id'] for data in self.dialect.merge_chunk_results(result_lists, constrains)],
+            [2, 1, 4]
+        )
+
+    def test_positive_seek_ascending(self):
+        """ Test if the ascending keyset is sought after the reference. """
+        seek_order = [('score', Order.ASC), ('_id', Order.ASC)]
+
+        self.assertEqual(
+            self.dialect.process_seek_conditions({'status': 'on'}, seek_order, [5, 'x']),
+            {'$and': [
+                {'status': 'on'},
+                {'$or': [
+                    {'score': {'$gt': 5}},
+                    {'score': {'$eq': 5}, '_id': {'$gt': 'x'}}
+                ]}
+            ]}
+        )
+
+    def test_positive_seek_descending(self):
+        """ Test if the null values are sought after the lowest values in the descending order. """
+        seek_order = [('score', Order.DESC), ('_id', Order.DESC)]
+
+        self.assertEqual(
+            self.dialect.process_seek_conditions({}, seek_order, [5, 'x']),
+            {'$or': [
+                {'score': {'$lt': 5}},
+                {'score': None},
+                {'score': {'$eq': 5}, '_id': {'$lt': 'x'}},
+                {'score': {'$eq': 5}, '_id': None}
+            ]}
+        )
+
+    def test_positive_seek_null_ascending(self):
+        """ Test if every non-null value is sought after the null reference in the ascending order. """
+        seek_order = [('score', Order.ASC), ('_id', Order.ASC)]
+
+        self.assertEqual(
+            self.dialect.process_seek_conditions({}, seek_order, [None, 'x']),
+            {'$or': [
+                {'score': {'$ne': None}},
+                {'score': {'$eq': None}, '_id': {'$gt': 'x'}}
+            ]}
+        )
+
+    def test_positive_seek_null_descending(self):
+        """ Test if only the null values are sought after the null reference in the descending order. """
+        seek_order = [('score', Order.DESC), ('_id', Order.DESC)]
+
+        self.assertEqual(
+            self.dialect.process_seek_conditions({}, seek_order, [None, 'x']),
+            {'$or': [
+                {'score': {'$eq': None}, '_id': {'$lt': 'x'}},
+                {'score': {'$eq': None}, '_id': None}
+            ]}
+        )
+
+    def test_positive_union_query(self):
+        """ Test if the chunked queries are sent as one query. """
+        self.assertEqual(self.dialect.get_union_query([{'a': 1}]), {'a': 1})
+        self.assertEqual(self.dialect.get_union_query([{'a': 1}, {'a': 2}]), {'$or': [{'a': 1}, {'a': 2}]})
+
+    def test_positive_aggregation_pipeline(self):
+        """ Test if the aggregation is translated into a pipeline. """
+        query = Query('e')
+
+        query.group('e.country')
+        query.aggregate('orders', Aggregate.COUNT)
+        query.aggregate('revenue', Aggregate.SUM, 'e.amount')
+        query.having('revenue', '>=', 1000)
+        query.order('revenue', Order.DESC)
+        query.start(1)
+        query.limit(5)
+
+        self.assertEqual(
+            self.dialect.get_aggregation_pipeline([{'status': 'paid'}], query),
+            [
+                {'$match': {'status': 'paid'}},
+                {'$group': {
+                    '_id':     {'country': '$country'},
+                    'orders':  {'$sum': 1},
+                    'revenue': {'$sum': '$amount'}
+                }},
+                {'$project': {'_id': False, 'country': '$_id.country', 'orders': True, 'revenue': True}},
+                {'$match': {'revenue': {'$gte': 1000}}},
+                {'$sort': SON([('revenue', Order.DESC)])},
+                {'$skip': 1},
+                {'$limit': 5}
+            ]
+        )
+
+    def test_positive_aggregation_pipeline_without_grouping(self):
+        """ Test if the chunked conditions are matched once and all entities form one group. """
+        query = Query('e')
+
+        query.aggregate('highest', Aggregate.MAX, 'e.id')
+
+        self.assertEqual(
+            self.dialect.get_aggregation_pipeline([{'a': 1}, {'a': 2}], query),
+            [
+                {'$match': {'$or': [{'a': 1}, {'a': 2}]}},
+                {'$group': {'_id': None, 'highest': {'$max': '$_id'}}},
+                {'$project': {'_id': False, 'highest': True}}
+            ]
+        )
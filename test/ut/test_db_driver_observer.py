@@ -0,0 +1,122 @@
+import logging
+import unittest
+
+from bson import ObjectId
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.driver.observer import QueryObserver, QueryStats, QueryStatsCollector, SlowQueryLog
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+
+@entity('notes')
+class Note(object):
+    def __init__(self, title):
+        self.title = title
+
+class RecordingObserver(QueryObserver):
+    def __init__(self):
+        self.stats_list = []
+
+    def on_query(self, driver, stats):
+        self.stats_list.append(stats)
+
+class TestDbDriverObserver(unittest.TestCase):
+    """ Test the query observers. """
+    def setUp(self):
+        self.driver   = MemoryDriver()
+        self.observer = RecordingObserver()
+        self.logger   = logging.getLogger('{}.{}'.format(__name__, self.__class__.__name__))
+
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+
+        self.driver.insert_many('notes', [{'title': 'a'}, {'title': 'b'}])
+        self.driver.add_observer(self.observer)
+
+        self.session    = Manager(self.driver).open_session()
+        self.repository = self.session.repository(Note)
+
+    def _find(self, title):
+        query = self.repository.new_criteria('e')
+
+        query.expect('e.title = :title')
+        query.define('title', title)
+
+        return self.repository.find(query)
+
+    def test_positive_stats(self):
+        """ Test if the observers are notified of the driver calls and the session queries. """
+        self._find('a')
+        self.repository.get(ObjectId())
+
+        self.assertEqual(
+            [(stats.operation, stats.collection_name, stats.alias, stats.document_count) for stats in self.observer.stats_list],
+            [('query', 'notes', 'e', 1), ('session.query', 'notes', 'e', 1), ('find_one', 'notes', None, 0)]
+        )
+        self.assertEqual(self.observer.stats_list[0].native_query, {'title': 'a'})
+        self.assertTrue(all([stats.duration >= 0 for stats in self.observer.stats_list]))
+        self.assertIsNotNone(self.observer.stats_list[1].hydration_time)
+
+    def test_positive_remove_observer(self):
+        """ Test if the detached observer is no longer notified. """
+        self.driver.remove_observer(self.observer)
+
+        self._find('a')
+
+        self.assertEqual(self.observer.stats_list, [])
+
+    def test_positive_session_aggregates(self):
+        """ Test if the session aggregates its own queries. """
+        self._find('a')
+        self._find('b')
+
+        aggregates = self.session.query_stats.to_dict()
+
+        self.assertEqual(aggregates['query_count'], 2)
+        self.assertEqual(aggregates['document_count'], 2)
+        self.assertEqual(
+            sorted([(aggregate['operation'], aggregate['count']) for aggregate in aggregates['aggregates']]),
+            [('query', 2), ('session.query', 2)]
+        )
+
+        self.session.query_stats.reset()
+
+        self.assertEqual(self.session.query_stats.aggregates(), [])
+
+    def test_positive_collector(self):
+        """ Test if the statistics are aggregated per operation and collection. """
+        collector = QueryStatsCollector()
+
+        for duration in [0.1, 0.3]:
+            stats = QueryStats('query', 'notes', {})
+
+            stats.queried(2, duration)
+            collector.on_query(self.driver, stats)
+
+        aggregate = collector.aggregates()[0]
+
+        self.assertEqual(aggregate['count'], 2)
+        self.assertAlmostEqual(aggregate['total_duration'], 0.4)
+        self.assertAlmostEqual(aggregate['max_duration'], 0.3)
+        self.assertEqual(aggregate['document_count'], 4)
+
+    def test_positive_slow_query_log(self):
+        """ Test if only the slow queries are logged with the execution plans of the driver calls. """
+        slow_query_log = SlowQueryLog(threshold=0, explain=True, logger=self.logger)
+
+        self.driver.add_observer(slow_query_log)
+        self._find('a')
+
+        entries = slow_query_log.entries
+
+        self.assertEqual([entry['operation'] for entry in entries], ['query', 'session.query'])
+        self.assertIsNotNone(entries[0]['explain'])
+        self.assertIsNone(entries[1]['explain'])
+
+        slow_query_log.clear()
+        slow_query_log.threshold = 60
+
+        self._find('a')
+
+        self.assertEqual(slow_query_log.entries, [])
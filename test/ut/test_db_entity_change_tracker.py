@@ -0,0 +1,79 @@
+import unittest
+
+from bson import ObjectId
+
+from tori.db.driver.mongodriver import Driver
+from tori.db.entity  import entity, ChangeTracker
+from tori.db.manager import Manager
+
+@entity('notes', change_tracking=True)
+class Note(object):
+    def __init__(self, title, body, tags):
+        self.title = title
+        self.body  = body
+        self.tags  = tags
+
+class TestDbEntityChangeTracker(unittest.TestCase):
+    """ Test the property change tracking. """
+    def setUp(self):
+        self.uow  = Manager(Driver({'name': 'tori_test'})).open_session()._uow
+        self.note = Note('draft', 'text', ['a'])
+
+        self.note.id = ObjectId()
+
+        self.uow.register_clean(self.note)
+
+    def _change_set(self):
+        return self.uow._compute_change_set(self.uow.retrieve_record(self.note))
+
+    def test_positive_enabled(self):
+        """ Test if the change tracking is enabled per entity class. """
+        @entity('memos')
+        class Memo(object): pass
+
+        self.assertTrue(ChangeTracker.enabled(self.note))
+        self.assertTrue(ChangeTracker.enabled(Note))
+        self.assertFalse(ChangeTracker.enabled(Memo))
+
+    def test_positive_mark(self):
+        """ Test if the private properties and the ID are never recorded. """
+        ChangeTracker.mark(self.note, 'title', '_secret', 'id')
+
+        self.assertEqual(ChangeTracker.changes(self.note), set(['title']))
+
+        ChangeTracker.reset(self.note)
+
+        self.assertEqual(ChangeTracker.changes(self.note), set())
+
+    def test_positive_clean(self):
+        """ Test if the registration forgets the changes of the construction. """
+        self.assertEqual(ChangeTracker.changes(self.note), set())
+        self.assertEqual(self._change_set(), {})
+
+    def test_positive_assignment(self):
+        """ Test if only the re-assigned properties are in the change set. """
+        self.note.title = 'final'
+
+        self.uow.register_dirty(self.note)
+
+        self.assertEqual(self._change_set(), {'$set': {'title': 'final'}})
+
+    def test_positive_deletion(self):
+        """ Test if the deleted properties are unset. """
+        del self.note.body
+
+        self.uow.register_dirty(self.note)
+
+        self.assertEqual(self._change_set(), {'$unset': {'body': 1}})
+
+    def test_positive_in_place_modification(self):
+        """ Test if the in-place modifications are only saved once marked. """
+        self.note.tags.append('b')
+
+        self.uow.register_dirty(self.note)
+
+        self.assertEqual(self._change_set(), {})
+
+        ChangeTracker.mark(self.note, 'tags')
+
+        self.assertEqual(self._change_set(), {'$set': {'tags': ['a', 'b']}})
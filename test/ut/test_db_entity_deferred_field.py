@@ -0,0 +1,88 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+
+@entity('documents', deferred_fields=['content'])
+class Document(object):
+    def __init__(self, title, summary, content):
+        self.title   = title
+        self.summary = summary
+        self.content = content
+
+class TestDbEntityDeferredField(unittest.TestCase):
+    """ Test the projection and the deferred fields. """
+    def setUp(self):
+        self.driver = MemoryDriver()
+
+        self.driver.insert_many('documents', [
+            {'title': 'a', 'summary': 'first', 'content': 'large a'},
+            {'title': 'b', 'summary': 'second', 'content': 'large b'}
+        ])
+
+        self.session    = Manager(self.driver).open_session()
+        self.repository = self.session.repository(Document)
+
+        self.driver.client.operations = []
+
+    def _find(self, *property_paths):
+        query = self.repository.new_criteria('e')
+
+        query.order('title')
+        query.select(*property_paths)
+
+        return self.repository.find(query)
+
+    def _change_set(self, document):
+        uow = self.session._uow
+
+        return uow._compute_change_set(uow.retrieve_record(document))
+
+    def test_positive_deferred_on_first_access(self):
+        """ Test if the deferred field is loaded on first access. """
+        document = self._find()[0]
+
+        self.assertNotIn('content', document.__dict__)
+        self.assertEqual(document.content, 'large a')
+        self.assertEqual(self.driver.client.count('find', 'documents'), 2)
+
+        self.assertEqual(self._change_set(document), {})
+
+    def test_positive_deferred_not_unset(self):
+        """ Test if the unloaded deferred field is unchanged on update. """
+        document = self._find()[0]
+
+        document.title = 'c'
+
+        self.session.persist(document)
+
+        self.assertEqual(self._change_set(document), {'$set': {'title': 'c'}})
+
+        self.session.flush()
+
+        self.assertEqual(
+            self.driver.documents('documents')[0],
+            {'_id': document.id, 'title': 'c', 'summary': 'first', 'content': 'large a'}
+        )
+
+    def test_positive_select(self):
+        """ Test if only the selected fields are loaded and the others are not unset. """
+        document = self._find('e.title')[1]
+
+        self.assertNotIn('summary', document.__dict__)
+        self.assertNotIn('content', document.__dict__)
+
+        document.title = 'd'
+
+        self.session.persist(document)
+        self.session.flush()
+
+        self.assertEqual(
+            self.driver.documents('documents')[1],
+            {'_id': document.id, 'title': 'd', 'summary': 'second', 'content': 'large b'}
+        )
+        self.assertEqual(self.driver.client.count('find', 'documents'), 1)
+        self.assertEqual(document.summary, 'second')
+        self.assertEqual(self.driver.client.count('find', 'documents'), 2)
@@ -0,0 +1,65 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+from tori.db.mapper  import link, AssociationType
+from tori.db.session import JoinExecutor
+
+@entity('authors')
+class Author(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('author', target=Author, association=AssociationType.MANY_TO_ONE)
+@entity('books')
+class Book(object):
+    def __init__(self, title, author):
+        self.title  = title
+        self.author = author
+
+class TestDbRepositoryCount(unittest.TestCase):
+    """ Test the counting of the repository. """
+    def setUp(self):
+        self.driver     = MemoryDriver()
+        self.manager    = Manager(self.driver, JoinExecutor(chunk_size=2))
+        self.session    = self.manager.open_session()
+        self.repository = self.session.repository(Book)
+
+        author_list = [Author('author {}'.format(index)) for index in range(5)]
+
+        self.session.persist(*author_list)
+        self.session.persist(*[Book('book {}'.format(index), author) for index, author in enumerate(author_list)])
+        self.session.flush()
+
+        self.driver.client.operations = []
+
+    def _query_by_author(self, operand, name='author 0'):
+        query = self.repository.new_criteria('b')
+
+        query.join('b.author', 'a')
+        query.expect('a.name {} :name'.format(operand))
+        query.define('name', name)
+
+        return query
+
+    def test_positive_count_with_chunked_join(self):
+        """ Test if the chunks of the joined keys are counted with one request. """
+        self.assertEqual(self.repository.count(self._query_by_author('!=')), 4)
+        self.assertEqual(self.driver.client.count('count_documents', 'books'), 1)
+        self.assertEqual(self.driver.client.count('find', 'books'), 0)
+
+    def test_positive_exists(self):
+        """ Test if the existence is checked without loading the entities. """
+        self.assertTrue(self.repository.exists(self._query_by_author('=')))
+        self.assertFalse(self.repository.exists(self._query_by_author('=', 'nobody')))
+        self.assertEqual(self.driver.client.count('count_documents'), 0)
+
+    def test_positive_length(self):
+        """ Test if the length is the exact count and the estimation is opt-in. """
+        self.assertEqual(len(self.repository), 5)
+        self.assertEqual(self.driver.client.count('estimated_document_count'), 0)
+
+        self.assertEqual(self.repository.estimated_size(), 5)
+        self.assertEqual(self.driver.client.count('estimated_document_count', 'books'), 1)
@@ -0,0 +1,94 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.criteria import Order
+from tori.db.entity   import entity
+from tori.db.manager  import Manager
+from tori.db.mapper   import link, AssociationType
+from tori.db.session  import JoinExecutor
+
+@entity('writers')
+class Writer(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('writer', target=Writer, association=AssociationType.MANY_TO_ONE)
+@entity('articles')
+class Article(object):
+    def __init__(self, title, writer):
+        self.title  = title
+        self.writer = writer
+
+class TestDbRepositoryIterate(unittest.TestCase):
+    """ Test the streaming of the entities. """
+    def setUp(self):
+        self.driver  = MemoryDriver()
+        self.manager = Manager(self.driver, JoinExecutor(chunk_size=2))
+
+        session     = self.manager.open_session()
+        writer_list = [Writer('writer {}'.format(index)) for index in range(5)]
+
+        session.persist(*writer_list)
+        session.persist(*[Article('article {}'.format(index), writer) for index, writer in enumerate(writer_list)])
+        session.flush()
+
+        self.session    = self.manager.open_session()
+        self.repository = self.session.repository(Article)
+
+    def _query(self):
+        query = self.repository.new_criteria('e')
+
+        query.order('title', Order.DESC)
+
+        return query
+
+    def test_positive_release(self):
+        """ Test if the entities of each batch are released once the next batch is requested. """
+        title_list  = []
+        record_size = []
+
+        for article in self.repository.iterate(self._query(), batch_size=2, release=True):
+            title_list.append(article.title)
+            record_size.append(len(self.session._uow._record_map))
+
+        self.assertEqual(title_list, ['article {}'.format(index) for index in [4, 3, 2, 1, 0]])
+        self.assertEqual(record_size, [2, 2, 2, 2, 1])
+        self.assertEqual(len(self.session._uow._record_map), 0)
+
+    def test_positive_without_release(self):
+        """ Test if the entities stay in the identity map by default. """
+        article_list = list(self.repository.iterate(self._query(), batch_size=2))
+
+        self.assertEqual(len(self.session._uow._record_map), 5)
+        self.assertIs(self.repository.get(article_list[0].id), article_list[0])
+
+    def test_positive_changed_entities_not_released(self):
+        """ Test if the entities with uncommitted changes are not released. """
+        for article in self.repository.iterate(self._query(), batch_size=2, release=True):
+            if article.title == 'article 4':
+                article.title = 'draft'
+
+                self.session.persist(article)
+
+        self.assertEqual(
+            [record.entity.title for record in self.session._uow._record_map.values()],
+            ['draft']
+        )
+
+    def test_positive_chunked_join(self):
+        """ Test if the results of the chunked joins are merged in order. """
+        query = self._query()
+
+        query.join('e.writer', 'w')
+        query.expect('w.name != :name')
+        query.define('name', 'writer 2')
+
+        self.driver.client.operations = []
+
+        self.assertEqual(
+            [article.title for article in self.repository.iterate(query, batch_size=2)],
+            ['article 4', 'article 3', 'article 1', 'article 0']
+        )
+        self.assertEqual(self.driver.client.count('find', 'writers'), 1)
+        self.assertEqual(self.driver.client.count('find', 'articles'), 2)
@@ -0,0 +1,98 @@
+import unittest
+
+from tornado        import gen
+from tornado.ioloop import IOLoop
+
+from dummy.memory_mongo import AsyncMemoryDriver, MemoryDriver
+
+from tori.db.entity    import entity
+from tori.db.exception import UnsupportedDriverError, UOWCommitInProgressError
+from tori.db.manager   import Manager
+
+@entity('notes')
+class Note(object):
+    def __init__(self, title):
+        self.title = title
+
+class TestDbSessionAsync(unittest.TestCase):
+    """ Test the asynchronous operations of the session. """
+    def setUp(self):
+        self.driver  = AsyncMemoryDriver()
+        self.manager = Manager(self.driver)
+
+    def _run(self, coroutine):
+        return IOLoop.current().run_sync(coroutine)
+
+    def test_positive_flush_and_query(self):
+        """ Test if the entities are flushed and queried asynchronously. """
+        session = self.manager.open_session()
+        note    = Note('a')
+
+        @gen.coroutine
+        def flush():
+            session.persist(note)
+
+            report = yield session.flush_async()
+
+            raise gen.Return(report)
+
+        report = self._run(flush)
+
+        self.assertEqual(report.driver_calls, {'insert_many': 1})
+        self.assertEqual([document['title'] for document in self.driver.documents('notes')], ['a'])
+
+        session    = self.manager.open_session()
+        repository = session.repository(Note)
+        query      = repository.new_criteria('n')
+
+        query.expect('n.title = :title')
+        query.define('title', 'a')
+
+        @gen.coroutine
+        def find():
+            entity_list = yield repository.find_async(query)
+            count       = yield repository.count_async(query)
+            loaded      = yield repository.get_async(note.id)
+
+            raise gen.Return((entity_list, count, loaded))
+
+        entity_list, count, loaded = self._run(find)
+
+        self.assertEqual([entity.title for entity in entity_list], ['a'])
+        self.assertEqual(count, 1)
+        self.assertIs(loaded, entity_list[0])
+
+    def test_negative_commit_in_progress(self):
+        """ Test if the unit of work rejects the changes and commits during an asynchronous commit. """
+        session = self.manager.open_session()
+
+        session.persist(Note('a'))
+
+        @gen.coroutine
+        def flush_twice():
+            pending = session.flush_async()
+
+            with self.assertRaises(UOWCommitInProgressError):
+                yield session.flush_async()
+
+            with self.assertRaises(UOWCommitInProgressError):
+                session.persist(Note('b'))
+
+            yield pending
+
+        self._run(flush_twice)
+
+        self.assertEqual([document['title'] for document in self.driver.documents('notes')], ['a'])
+
+        # The unit of work is usable again once the commit ends.
+        session.persist(Note('c'))
+        session.flush()
+
+        self.assertEqual(len(self.driver.documents('notes')), 2)
+
+    def test_negative_synchronous_driver(self):
+        """ Test if the asynchronous operations require an asynchronous driver. """
+        session = Manager(MemoryDriver()).open_session()
+
+        with self.assertRaises(UnsupportedDriverError):
+            self._run(session.flush_async)
@@ -0,0 +1,107 @@
+import threading
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.criteria import Order
+from tori.db.entity   import entity
+from tori.db.manager  import Manager
+from tori.db.mapper   import link, AssociationType
+from tori.db.session  import JoinExecutor
+
+@entity('brands')
+class Brand(object):
+    def __init__(self, name):
+        self.name = name
+
+@entity('shops')
+class Shop(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('brand', target=Brand, association=AssociationType.MANY_TO_ONE)
+@link('shop', target=Shop, association=AssociationType.MANY_TO_ONE)
+@entity('products')
+class Product(object):
+    def __init__(self, name, price, brand, shop):
+        self.name  = name
+        self.price = price
+        self.brand = brand
+        self.shop  = shop
+
+class TestDbSessionJoinExecutor(unittest.TestCase):
+    """ Test the chunked and concurrent execution of the joins. """
+    def setUp(self):
+        self.driver = MemoryDriver()
+
+        session    = Manager(self.driver).open_session()
+        brand_list = [Brand('brand {}'.format(index)) for index in range(6)]
+        shop_list  = [Shop('shop {}'.format(index)) for index in range(2)]
+
+        session.persist(*brand_list)
+        session.persist(*shop_list)
+        session.persist(*[
+            Product('product {}'.format(index), index * 10, brand_list[index % 6], shop_list[index % 2])
+            for index in range(12)
+        ])
+        session.flush()
+
+    def _find(self, executor, *conditions):
+        session    = Manager(self.driver, executor).open_session()
+        repository = session.repository(Product)
+        query      = repository.new_criteria('p')
+
+        query.join('p.brand', 'b')
+        query.join('p.shop', 's')
+        query.expect('b.name != :brand')
+        query.expect('s.name = :shop')
+        query.define('brand', 'brand 0')
+        query.define('shop', 'shop 1')
+        query.order('price', Order.DESC)
+        query.start(1)
+        query.limit(3)
+
+        self.driver.client.operations = []
+
+        return [product.name for product in repository.find(query)]
+
+    def test_positive_chunk(self):
+        """ Test if the keys are split into chunks of the given size. """
+        executor = JoinExecutor(chunk_size=2)
+
+        self.assertEqual(executor.chunk([1, 2, 3, 4, 5]), [[1, 2], [3, 4], [5]])
+        self.assertEqual(executor.chunk([]), [[]])
+        self.assertEqual(JoinExecutor().chunk_size, JoinExecutor.default_chunk_size)
+
+    def test_positive_chunked_result(self):
+        """ Test if the results of the chunks are merged, sorted and paginated as one result. """
+        expected = self._find(JoinExecutor())
+
+        self.assertEqual(expected, ['product 9', 'product 7', 'product 5'])
+        self.assertEqual(self.driver.client.count('find', 'products'), 1)
+
+        self.assertEqual(self._find(JoinExecutor(chunk_size=2)), expected)
+        self.assertEqual(self.driver.client.count('find', 'products'), 3)
+
+    def test_positive_concurrent_branches(self):
+        """ Test if the aliases joined to the same entity are queried concurrently. """
+        thread_names = set()
+        executor     = JoinExecutor(chunk_size=2, max_workers=4)
+        original_map = executor.map
+
+        def record(callback, task_list):
+            def recording_callback(task):
+                thread_names.add(threading.current_thread().name)
+
+                return callback(task)
+
+            return original_map(recording_callback, task_list)
+
+        executor.map = record
+
+        try:
+            self.assertEqual(self._find(executor), ['product 9', 'product 7', 'product 5'])
+        finally:
+            executor.shutdown()
+
+        self.assertNotIn(threading.current_thread().name, thread_names)
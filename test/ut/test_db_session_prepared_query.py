@@ -0,0 +1,93 @@
+import threading
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+from tori.db.mapper  import link, AssociationType
+
+@entity('cities')
+class City(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('city', target=City, association=AssociationType.MANY_TO_ONE)
+@entity('residents')
+class Resident(object):
+    def __init__(self, name, city):
+        self.name = name
+        self.city = city
+
+class TestDbSessionPreparedQuery(unittest.TestCase):
+    """ Test the prepared queries. """
+    def setUp(self):
+        self.driver  = MemoryDriver()
+        self.manager = Manager(self.driver)
+
+        session   = self.manager.open_session()
+        city_list = [City('oslo'), City('rome')]
+
+        session.persist(*city_list)
+        session.persist(*[Resident('resident {}'.format(index), city_list[index % 2]) for index in range(4)])
+        session.flush()
+
+        self.session = self.manager.open_session()
+        self.query   = self.session.repository(Resident).new_criteria('r')
+
+        self.query.join('r.city', 'c')
+        self.query.expect('c.name = :city')
+        self.query.order('name')
+
+    def _names(self, entity_list):
+        return [entity.name for entity in entity_list]
+
+    def test_positive_reuse(self):
+        """ Test if the plan runs many times with different parameters. """
+        plan = self.session.prepare(self.query)
+
+        self.assertEqual(list(plan.parameters), ['city'])
+        self.assertEqual(self._names(plan.find(self.session, city='oslo')), ['resident 0', 'resident 2'])
+        self.assertEqual(self._names(plan.find(self.session, {'city': 'rome'})), ['resident 1', 'resident 3'])
+        self.assertEqual(plan.count(self.session, city='rome'), 2)
+
+    def test_positive_query_unmodified(self):
+        """ Test if neither preparing nor querying modifies the query. """
+        join_map = dict([(alias, dict(config)) for alias, config in self.query.join_map.items()])
+
+        self.query.define('city', 'oslo')
+
+        self.session.repository(Resident).find(self.query)
+
+        self.assertEqual(self.query.join_map, join_map)
+
+    def test_positive_frozen(self):
+        """ Test if the later changes of the query do not affect the plan. """
+        plan = self.session.prepare(self.query)
+
+        self.query.order('name', -1)
+        self.query.define('city', 'rome')
+
+        self.assertEqual(self._names(plan.find(self.session, city='oslo')), ['resident 0', 'resident 2'])
+
+    def test_positive_shared_across_threads(self):
+        """ Test if the plan is shared by the sessions of several threads. """
+        plan        = self.session.prepare(self.query)
+        result_map  = {}
+        thread_list = []
+
+        def find(city):
+            session = self.manager.open_session()
+
+            result_map[city] = self._names(plan.find(session, city=city))
+
+        for city in ['oslo', 'rome'] * 4:
+            thread_list.append(threading.Thread(target=find, args=(city,)))
+
+        for thread in thread_list:
+            thread.start()
+
+        for thread in thread_list:
+            thread.join()
+
+        self.assertEqual(result_map, {'oslo': ['resident 0', 'resident 2'], 'rome': ['resident 1', 'resident 3']})
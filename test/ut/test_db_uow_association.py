@@ -0,0 +1,61 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity  import entity, BasicAssociation
+from tori.db.manager import Manager
+from tori.db.mapper  import link, AssociationType
+
+@entity('players')
+class Player(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('players', target=Player, association=AssociationType.MANY_TO_MANY)
+@entity('teams')
+class Team(object):
+    def __init__(self, name, players=[]):
+        self.name    = name
+        self.players = players
+
+class TestDbUowAssociation(unittest.TestCase):
+    """ Test the many-to-many associations of the unit of work. """
+    def setUp(self):
+        self.driver  = MemoryDriver()
+        self.session = Manager(self.driver).open_session()
+        self.players = [Player('ann'), Player('bob')]
+        self.team    = Team('red', list(self.players))
+
+        self.session.persist(self.team, *self.players)
+        self.session.flush()
+
+    def _association_records(self):
+        return [
+            record
+            for record in self.session._uow._record_map.values()
+            if isinstance(record.entity, BasicAssociation)
+        ]
+
+    def test_positive_removed_destination(self):
+        """ Test if only the association of the removed destination is deleted. """
+        self.team.players = [self.players[0]]
+
+        self.session.persist(self.team)
+        self.session.flush()
+
+        self.assertEqual(
+            [document['destination'] for document in self.driver.documents('teams_players')],
+            [self.players[0].id]
+        )
+        self.assertEqual(len(self._association_records()), 1)
+
+    def test_positive_purge(self):
+        """ Test if the associations of the deleted origin are forgotten with the index. """
+        self.assertEqual(len(self._association_records()), 2)
+
+        self.session.delete(self.team)
+        self.session.flush()
+
+        self.assertEqual(self.driver.documents('teams_players'), [])
+        self.assertEqual(self._association_records(), [])
+        self.assertEqual(self.session._uow._association_map, {})
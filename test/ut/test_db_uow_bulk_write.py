@@ -0,0 +1,51 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+
+@entity('notes')
+class Note(object):
+    def __init__(self, title):
+        self.title = title
+
+class TestDbUowBulkWrite(unittest.TestCase):
+    """ Test if the unit of work sends the changes in bulk. """
+    def setUp(self):
+        self.driver  = MemoryDriver()
+        self.manager = Manager(self.driver)
+
+    def test_positive_insertion(self):
+        """ Test if the new entities of the same collection are inserted at once. """
+        session   = self.manager.open_session()
+        note_list = [Note(title) for title in ['a', 'b', 'c']]
+
+        for note in note_list:
+            session.persist(note)
+
+        session.flush()
+
+        self.assertEqual(self.driver.client.count('insert_many', 'notes'), 1)
+        self.assertEqual(
+            [document['_id'] for document in self.driver.documents('notes')],
+            [note.id for note in note_list]
+        )
+
+    def test_positive_update_and_removal(self):
+        """ Test if the changed and deleted entities are written with one call each. """
+        self.driver.insert_many('notes', [{'title': 'a'}, {'title': 'b'}, {'title': 'c'}, {'title': 'd'}])
+
+        session   = self.manager.open_session()
+        note_list = session.repository(Note).filter()
+
+        note_list[0].title = 'e'
+        note_list[1].title = 'f'
+
+        session.persist(note_list[0], note_list[1])
+        session.delete(note_list[2], note_list[3])
+        session.flush()
+
+        self.assertEqual(self.driver.client.count('bulk_write', 'notes'), 1)
+        self.assertEqual(self.driver.client.count('delete_many', 'notes'), 1)
+        self.assertEqual([document['title'] for document in self.driver.documents('notes')], ['e', 'f'])
@@ -0,0 +1,76 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.cache   import CachePolicy
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+from tori.db.metadata.helper import EntityMetadataHelper
+
+@entity('countries', cache=CachePolicy())
+class Country(object):
+    def __init__(self, name):
+        self.name = name
+
+class FailingMemoryDriver(MemoryDriver):
+    """ Driver failing after the changes are written """
+    def update_many(self, collection_name, update_list):
+        super(FailingMemoryDriver, self).update_many(collection_name, update_list)
+
+        raise RuntimeError('Connection lost')
+
+class TestDbUowCacheInvalidation(unittest.TestCase):
+    """ Test the invalidation of the caches by the unit of work. """
+    def setUp(self):
+        self.driver   = FailingMemoryDriver()
+        self.manager  = Manager(self.driver)
+        self.metadata = EntityMetadataHelper.extract(Country)
+
+        self.object_id = self.driver.insert_many('countries', [{'name': 'th'}])[0]
+
+    def _load(self):
+        session    = self.manager.open_session()
+        repository = session.repository(Country)
+
+        repository.cacheable()
+
+        country = repository.get(self.object_id)
+        query   = repository.new_criteria('c')
+
+        query.expect('c.name = :name')
+        query.define('name', 'th')
+
+        repository.find(query)
+
+        return session, country
+
+    def test_positive_invalidation(self):
+        """ Test if the caches are filled by the queries and invalidated by the writes. """
+        self.driver.update_many = super(FailingMemoryDriver, self.driver).update_many
+
+        session, country = self._load()
+
+        self.assertEqual(self.manager.query_cache.size, 1)
+        self.assertIsNotNone(self.manager.entity_cache.get(self.metadata, self.object_id))
+
+        country.name = 'jp'
+
+        session.persist(country)
+        session.flush()
+
+        self.assertEqual(self.manager.query_cache.size, 0)
+        self.assertIsNone(self.manager.entity_cache.get(self.metadata, self.object_id))
+
+    def test_negative_failed_commit(self):
+        """ Test if the caches are invalidated even if the write fails halfway. """
+        session, country = self._load()
+
+        country.name = 'jp'
+
+        session.persist(country)
+
+        with self.assertRaises(RuntimeError):
+            session.flush()
+
+        self.assertEqual(self.manager.query_cache.size, 0)
+        self.assertIsNone(self.manager.entity_cache.get(self.metadata, self.object_id))
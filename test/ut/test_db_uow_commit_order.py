@@ -0,0 +1,72 @@
+import unittest
+
+from bson import ObjectId
+
+from tori.db.driver.mongodriver import Driver
+from tori.db.entity    import entity
+from tori.db.manager   import Manager
+from tori.db.mapper    import link, AssociationType, CascadingType
+from tori.exception    import CircularDependencyError
+
+@link('partner', target=__name__ + '.Dancer', association=AssociationType.ONE_TO_ONE, cascading=[CascadingType.PERSIST])
+@entity('singers')
+class Singer(object):
+    def __init__(self, name, partner=None):
+        self.name    = name
+        self.partner = partner
+
+@link('partner', target=Singer, association=AssociationType.ONE_TO_ONE, cascading=[CascadingType.PERSIST])
+@entity('dancers')
+class Dancer(object):
+    def __init__(self, name, partner=None):
+        self.name    = name
+        self.partner = partner
+
+class TestDbUowCommitOrder(unittest.TestCase):
+    """ Test the commit order of the unit of work. """
+    def setUp(self):
+        # The commit order is computed before connecting to the database.
+        self.session = Manager(Driver({'name': 'tori_test'})).open_session()
+
+    def test_positive_order_of_new_references(self):
+        """ Test if a new entity is committed before the new entities referring to it. """
+        singer = Singer('ann')
+        dancer = Dancer('bob', singer)
+
+        self.session.persist(dancer)
+
+        order = self.session._uow._compute_order()
+
+        self.assertEqual([node.record.entity for node in order], [singer, dancer])
+
+    def test_positive_mutual_references_of_stored_entities(self):
+        """ Test if the stored entities may refer to each other. """
+        singer = Singer('ann')
+        dancer = Dancer('bob', singer)
+
+        singer.id = ObjectId()
+        dancer.id = ObjectId()
+
+        self.session._uow.register_clean(singer)
+        self.session._uow.register_clean(dancer)
+        self.session._uow.register_dirty(dancer)
+
+        singer.partner = dancer
+
+        order = self.session._uow._compute_order()
+
+        self.assertEqual(set([node.record.entity for node in order]), set([singer, dancer]))
+
+    def test_negative_cycle_of_new_entities(self):
+        """ Test if the new entities referring to each other are rejected. """
+        singer = Singer('ann')
+        dancer = Dancer('bob', singer)
+
+        singer.partner = dancer
+
+        self.session.persist(singer)
+
+        with self.assertRaises(CircularDependencyError) as context:
+            self.session.flush()
+
+        self.assertEqual(set([node.record.entity for node in context.exception.nodes]), set([singer, dancer]))
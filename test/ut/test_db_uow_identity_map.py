@@ -0,0 +1,86 @@
+import unittest
+
+from dummy.memory_mongo import MemoryDriver
+
+from tori.db.entity  import entity
+from tori.db.manager import Manager
+
+@entity('notes')
+class Note(object):
+    def __init__(self, title):
+        self.title = title
+
+class TestDbUowIdentityMap(unittest.TestCase):
+    """ Test the bounded identity map of the unit of work. """
+    def setUp(self):
+        self.driver         = MemoryDriver()
+        self.object_id_list = self.driver.insert_many('notes', [{'title': title} for title in ['a', 'b', 'c']])
+        self.session        = Manager(self.driver).open_session()
+        self.repository     = self.session.repository(Note)
+
+    def _recorded_titles(self):
+        return sorted([record.entity.title for record in self.session._uow._record_map.values()])
+
+    def test_positive_unbounded_by_default(self):
+        """ Test if every clean entity is kept without the limit. """
+        for object_id in self.object_id_list:
+            self.repository.get(object_id)
+
+        self.assertEqual(self._recorded_titles(), ['a', 'b', 'c'])
+
+    def test_positive_least_recently_used(self):
+        """ Test if the least recently used clean entity is evicted beyond the limit. """
+        a, b, c = self.object_id_list
+
+        self.session.identity_map_size = 2
+
+        self.repository.get(a)
+        self.repository.get(b)
+        self.repository.get(a) # "b" is now the least recently used one.
+        self.repository.get(c)
+
+        self.assertEqual(self._recorded_titles(), ['a', 'c'])
+
+    def test_positive_changed_entities_pinned(self):
+        """ Test if the entities with uncommitted changes are never evicted. """
+        a, b, c = self.object_id_list
+
+        self.session.identity_map_size = 1
+
+        note = self.repository.get(a)
+
+        note.title = 'd'
+
+        self.session.persist(note)
+
+        self.repository.get(b)
+        self.repository.get(c)
+
+        self.assertEqual(self._recorded_titles(), ['c', 'd'])
+
+        self.session.flush()
+
+        self.assertEqual([document['title'] for document in self.driver.documents('notes')], ['d', 'b', 'c'])
+
+    def test_positive_detach(self):
+        """ Test if the uncommitted changes of the detached entity are discarded. """
+        note = self.repository.get(self.object_id_list[0])
+
+        note.title = 'd'
+
+        self.session.persist(note)
+        self.session.detach(note)
+        self.session.flush()
+
+        self.assertEqual(self._recorded_titles(), [])
+        self.assertEqual(self.driver.client.count('bulk_write'), 0)
+        self.assertIsNot(self.repository.get(self.object_id_list[0]), note)
+
+    def test_positive_clear(self):
+        """ Test if every entity is detached from the session. """
+        note_list = [self.repository.get(object_id) for object_id in self.object_id_list]
+
+        self.session.clear()
+
+        self.assertEqual(self._recorded_titles(), [])
+        self.assertIsNot(self.repository.get(self.object_id_list[0]), note_list[0])
@@ -0,0 +1,88 @@
+import unittest
+
+from tori.exception import CircularDependencyError
+from tori.graph     import DependencyNode, DependencyManager
+
+class TestGraphDependencyManager(unittest.TestCase):
+    """ Test the topological sort of the dependency graph. """
+    class IndependentNode(DependencyNode):
+        def _depends_on(self, node):
+            return False
+
+    def _make_map(self, size, node_class=DependencyNode):
+        return dict([(index, node_class()) for index in range(size)])
+
+    def test_positive_dependencies_first(self):
+        """ Test if every node is placed after its dependencies. """
+        node_map = self._make_map(4)
+
+        node_map[0].connect(node_map[1])
+        node_map[0].connect(node_map[2])
+        node_map[1].connect(node_map[3])
+        node_map[2].connect(node_map[3])
+
+        order = DependencyManager.get_order(node_map)
+
+        self.assertEqual(len(order), 4)
+
+        for node in order:
+            for dependency in node.adjacent_nodes:
+                self.assertLess(order.index(dependency), order.index(node))
+
+    def test_positive_unconstrained_nodes_in_map_order(self):
+        """ Test if the nodes without any ordering constraint keep the order of the map. """
+        node_map = self._make_map(5)
+
+        self.assertEqual(DependencyManager.get_order(node_map), [node_map[index] for index in range(5)])
+
+    def test_positive_long_chain(self):
+        """ Test if a chain longer than the recursion limit is sorted. """
+        node_map = self._make_map(20000)
+
+        for index in range(19999):
+            node_map[index].connect(node_map[index + 1])
+
+        order = DependencyManager.get_order(node_map)
+
+        self.assertEqual(order[0], node_map[19999])
+        self.assertEqual(order[-1], node_map[0])
+
+    def test_positive_unique_identity(self):
+        """ Test if the nodes created at the same time are distinguishable. """
+        node_list = [DependencyNode() for index in range(1000)]
+
+        self.assertEqual(len(set(node_list)), 1000)
+
+    def test_positive_cached_score(self):
+        """ Test if the score is updated after a new connection. """
+        a, b, c = DependencyNode(), DependencyNode(), DependencyNode()
+
+        a.connect(c)
+
+        self.assertEqual(c.score, 1)
+
+        b.connect(c)
+
+        self.assertEqual(c.score, 2)
+
+    def test_positive_disregarded_cycle(self):
+        """ Test if the connections not constraining the order allow cycles. """
+        node_map = self._make_map(2, self.IndependentNode)
+
+        node_map[0].connect(node_map[1])
+        node_map[1].connect(node_map[0])
+
+        self.assertEqual(DependencyManager.get_order(node_map), [node_map[0], node_map[1]])
+
+    def test_negative_cycle(self):
+        """ Test if the nodes in or depending on a cycle are reported. """
+        node_map = self._make_map(4)
+
+        node_map[0].connect(node_map[1])
+        node_map[1].connect(node_map[2])
+        node_map[2].connect(node_map[1])
+
+        with self.assertRaises(CircularDependencyError) as context:
+            DependencyManager.get_order(node_map)
+
+        self.assertEqual(set(context.exception.nodes), set([node_map[0], node_map[1], node_map[2]]))
@@ -241,7 +241,38 @@ class SimpleController(Controller):
 class RestController(Controller):
     """ Abstract REST-capable controller based on a single primary key. """
     def list(self):
-        """ Retrieve the list of all entities. """
+        """ Retrieve the list of all entities.
+
+            For a large collection, the implementation may return one page
+            at a time with the cursor token of the keyset pagination (see
+            :meth:`tori.db.criteria.Query.after`). For example,
+
+            .. code-block:: python
+
+                def list(self):
+                    query = self.repository.new_criteria('e')
+                    query.order('created_at', Order.DESC)
+                    query.limit(20)
+
+                    cursor = self.get_argument('cursor', None)
+
+                    if cursor:
+                        try:
+                            query.after(cursor)
+                        except ValueError: # tampered or for another order
+                            raise HTTPError(400)
+
+                    entities = self.repository.find(query)
+
+                    self.finish({
+                        'items':  [self.serialize(entity) for entity in entities],
+                        'cursor': query.cursor_of(entities[-1]) if entities else None
+                    })
+
+            .. versionchanged:: 3.1
+
+                Documented the keyset pagination.
+        """
         self.set_status(405)
 
     def retrieve(self, key):
@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+"""
+:mod:`tori.db.cache` -- Caches
+==============================
+
+.. module:: tori.db.cache
+   :platform: All
+   :synopsis: The caches shared by the sessions of the same entity manager
+"""
+import copy
+from collections import OrderedDict
+from threading   import Lock
+from time        import time
+
+class QueryCache(object):
+    """ Query Result Cache
+
+        The cache of the raw data sets returned by the driver, keyed by the
+        collection, the native query and the iterating constrains. It is
+        shared by the sessions of the same entity manager.
+
+        :param max_size: the maximum number of cached results
+        :type  max_size: int
+        :param default_ttl: the default time-to-live of a result (in seconds)
+        :type  default_ttl: float
+
+        The queries are only cached if caching is enabled for the query (see
+        :meth:`tori.db.criteria.Query.cacheable`) or for the repository of the
+        queried entities (see :meth:`tori.db.repository.Repository.cacheable`).
+        The results of a collection are invalidated whenever a unit of work
+        writes to the collection.
+
+        .. versionadded:: 3.1
+    """
+    def __init__(self, max_size=1000, default_ttl=60):
+        self.max_size    = max_size
+        self.default_ttl = default_ttl
+
+        self._lock           = Lock()
+        self._entry_map      = OrderedDict() # key => (collection name, expiry time, data set), least recently used first
+        self._version_map    = {}            # collection name => the number of invalidations
+        self._policy_map     = {}            # collection name => (enabled, ttl)
+        self._hit_count      = 0
+        self._miss_count     = 0
+        self._eviction_count = 0
+
+    @property
+    def hit_count(self):
+        """ The number of the queries answered by the cache """
+        return self._hit_count
+
+    @property
+    def miss_count(self):
+        """ The number of the cacheable queries sent to the driver """
+        return self._miss_count
+
+    @property
+    def size(self):
+        """ The number of cached results """
+        return len(self._entry_map)
+
+    def enable(self, collection_name, ttl=None):
+        """ Enable caching for the queries of the collection
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :param ttl: the time-to-live of the results (``None`` for the default TTL)
+            :type  ttl: float
+        """
+        self._policy_map[collection_name] = (True, ttl)
+
+    def disable(self, collection_name):
+        """ Disable caching for the queries of the collection
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+        """
+        self._policy_map[collection_name] = (False, None)
+
+    def policy(self, collection_name):
+        """ Retrieve the caching policy of the collection
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :return: the tuple of the flag whether caching is enabled and the
+                     time-to-live or ``None`` if undefined
+            :rtype: tuple
+        """
+        return self._policy_map.get(collection_name)
+
+    def version(self, collection_name):
+        """ Retrieve the version of the collection
+
+            The version changes whenever the results of the collection are
+            invalidated. A result read from the driver before the
+            invalidation is not stored (see :meth:`put`).
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :rtype: int
+        """
+        return self._version_map.get(collection_name, 0)
+
+    def get(self, collection_name, native_query, constrains):
+        """ Retrieve the cached result
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :param native_query: the native query
+            :param constrains: the iterating constrains
+            :type  constrains: dict
+            :return: the copy of the cached data sets or ``None`` if not cached
+            :rtype: list
+        """
+        key = self._make_key(collection_name, native_query, constrains)
+
+        with self._lock:
+            entry = self._entry_map.get(key)
+
+            if entry and entry[1] < time():
+                del self._entry_map[key]
+
+                entry = None
+
+            if not entry:
+                self._miss_count += 1
+
+                return None
+
+            # Mark as the most recently used.
+            del self._entry_map[key]
+
+            self._entry_map[key] = entry
+            self._hit_count     += 1
+
+        return copy.deepcopy(entry[2])
+
+    def put(self, collection_name, native_query, constrains, data_set, ttl=None, version=None):
+        """ Store the result
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :param native_query: the native query
+            :param constrains: the iterating constrains
+            :type  constrains: dict
+            :param data_set: the data sets returned by the driver
+            :type  data_set: list
+            :param ttl: the time-to-live (``None`` for the default TTL)
+            :type  ttl: float
+            :param version: the version of the collection before the query
+                            was sent (see :meth:`version`)
+            :type  version: int
+        """
+        key   = self._make_key(collection_name, native_query, constrains)
+        entry = (collection_name, time() + (self.default_ttl if ttl is None else ttl), copy.deepcopy(data_set))
+
+        with self._lock:
+            # The collection has been changed since the query was sent.
+            if version is not None and version != self.version(collection_name):
+                return
+
+            if key in self._entry_map:
+                del self._entry_map[key]
+
+            self._entry_map[key] = entry
+
+            while len(self._entry_map) > self.max_size:
+                self._entry_map.popitem(last=False)
+
+                self._eviction_count += 1
+
+    def invalidate(self, *collection_names):
+        """ Invalidate the results of the collections
+
+            :param collection_names: the names of the collections
+        """
+        if not collection_names:
+            return
+
+        with self._lock:
+            for collection_name in collection_names:
+                self._version_map[collection_name] = self.version(collection_name) + 1
+
+            for key in [key for key in self._entry_map if self._entry_map[key][0] in collection_names]:
+                del self._entry_map[key]
+
+    def clear(self):
+        """ Remove all cached results """
+        with self._lock:
+            self._entry_map = OrderedDict()
+
+    def to_dict(self):
+        return {
+            'size':           self.size,
+            'hit_count':      self._hit_count,
+            'miss_count':     self._miss_count,
+            'eviction_count': self._eviction_count
+        }
+
+    def _make_key(self, collection_name, native_query, constrains):
+        return (collection_name, self._freeze(native_query), self._freeze(constrains))
+
+    def _freeze(self, value):
+        """ Make the hashable version of the value """
+        if isinstance(value, dict):
+            return tuple(sorted(
+                [(str(key), self._freeze(value[key])) for key in value],
+                key = lambda item: item[0]
+            ))
+
+        if isinstance(value, (list, tuple)):
+            return tuple([self._freeze(item) for item in value])
+
+        try:
+            hash(value)
+        except TypeError:
+            return repr(value)
+
+        return (type(value).__name__, value)
+
+class CachePolicy(object):
+    """ Caching Policy of an Entity Class
+
+        :param max_size: the maximum number of cached documents of the class
+        :type  max_size: int
+        :param ttl: the time-to-live of a cached document in seconds (``None``
+                    to keep the documents until they are evicted or changed)
+        :type  ttl: float
+
+        For example,
+
+        .. code-block:: python
+
+            @entity('countries', cache = CachePolicy(max_size = 500, ttl = 3600))
+            class Country(object):
+                ...
+
+        .. versionadded:: 3.1
+    """
+    def __init__(self, max_size=1000, ttl=None):
+        self.max_size = max_size
+        self.ttl      = ttl
+
+class EntityCache(object):
+    """ Second-level Entity Cache
+
+        The cache of the raw documents of the entities, keyed by the collection
+        and the object ID. It is shared by the sessions of the same entity
+        manager and only applies to the entity classes declared with a caching
+        policy (see :class:`CachePolicy`).
+
+        The cache is checked before the driver by
+        :meth:`tori.db.repository.Repository.get` and the proxy objects. The
+        documents written or deleted by any unit of work of the same process
+        are invalidated when the commit ends.
+
+        .. versionadded:: 3.1
+    """
+    def __init__(self):
+        self._lock        = Lock()
+        self._region_map  = {} # collection name => OrderedDict(object ID => (expiry time, document)), least recently used first
+        self._version_map = {} # collection name => the number of invalidations
+        self._hit_count   = 0
+        self._miss_count  = 0
+
+    @property
+    def hit_count(self):
+        """ The number of the documents taken from the cache """
+        return self._hit_count
+
+    @property
+    def miss_count(self):
+        """ The number of the cacheable documents requested from the driver """
+        return self._miss_count
+
+    @property
+    def size(self):
+        """ The number of cached documents """
+        return sum([len(region) for region in self._region_map.values()])
+
+    def version(self, collection_name):
+        """ Retrieve the version of the collection (see :meth:`QueryCache.version`)
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :rtype: int
+        """
+        return self._version_map.get(collection_name, 0)
+
+    def get(self, metadata, object_id):
+        """ Retrieve the cached document
+
+            :param metadata: the metadata of the entity class
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param object_id: the object ID
+            :return: the copy of the document or ``None`` if not cached
+            :rtype: dict
+        """
+        return self.get_many(metadata, [object_id]).get(object_id)
+
+    def get_many(self, metadata, object_id_list):
+        """ Retrieve the cached documents
+
+            :param metadata: the metadata of the entity class
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param object_id_list: the list of object IDs
+            :type  object_id_list: list
+            :return: the map of the object IDs to the copies of the cached documents
+            :rtype: dict
+        """
+        if not metadata.cache_policy:
+            return {}
+
+        document_map = {}
+        now          = time()
+
+        with self._lock:
+            region = self._region_map.get(metadata.collection_name) or {}
+
+            for object_id in object_id_list:
+                entry = region.get(object_id)
+
+                if entry and entry[0] is not None and entry[0] < now:
+                    del region[object_id]
+
+                    entry = None
+
+                if not entry:
+                    self._miss_count += 1
+
+                    continue
+
+                # Mark as the most recently used.
+                del region[object_id]
+
+                region[object_id] = entry
+                self._hit_count  += 1
+
+                document_map[object_id] = entry[1]
+
+        return dict([
+            (object_id, copy.deepcopy(document_map[object_id]))
+            for object_id in document_map
+        ])
+
+    def put(self, metadata, document_list, version=None):
+        """ Store the whole documents
+
+            :param metadata: the metadata of the entity class
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param document_list: the list of the documents loaded from the driver
+            :type  document_list: list
+            :param version: the version of the collection before the documents
+                            were requested (see :meth:`version`)
+            :type  version: int
+        """
+        policy = metadata.cache_policy
+
+        if not policy or not document_list:
+            return
+
+        collection_name = metadata.collection_name
+        expiry_time     = time() + policy.ttl if policy.ttl is not None else None
+        entry_list      = [(document['_id'], (expiry_time, copy.deepcopy(document))) for document in document_list]
+
+        with self._lock:
+            # The collection has been changed since the documents were requested.
+            if version is not None and version != self.version(collection_name):
+                return
+
+            if collection_name not in self._region_map:
+                self._region_map[collection_name] = OrderedDict()
+
+            region = self._region_map[collection_name]
+
+            for object_id, entry in entry_list:
+                if object_id in region:
+                    del region[object_id]
+
+                region[object_id] = entry
+
+            while len(region) > policy.max_size:
+                region.popitem(last=False)
+
+    def invalidate(self, collection_name, object_id_list=None):
+        """ Invalidate the cached documents
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :param object_id_list: the list of the object IDs (``None`` for
+                                   the whole collection)
+            :type  object_id_list: list
+        """
+        with self._lock:
+            self._version_map[collection_name] = self.version(collection_name) + 1
+
+            if collection_name not in self._region_map:
+                return
+
+            if object_id_list is None:
+                del self._region_map[collection_name]
+
+                return
+
+            region = self._region_map[collection_name]
+
+            for object_id in object_id_list:
+                if object_id in region:
+                    del region[object_id]
+
+    def clear(self):
+        """ Remove all cached documents """
+        with self._lock:
+            self._region_map = {}
+
+    def to_dict(self):
+        return {
+            'size':       self.size,
+            'hit_count':  self._hit_count,
+            'miss_count': self._miss_count
+        }
@@ -4,45 +4,154 @@
 :Stability: Stable
 """
 
-from bson import ObjectId
+from weakref  import WeakSet, WeakValueDictionary
+from bson     import ObjectId
+from tornado  import gen
 
 from tori.data.serializer import ArraySerializer
 from tori.db.exception import ReadOnlyProxyException
 from tori.db.metadata.helper import EntityMetadataHelper
 
+class EncodingPlan(object):
+    """ Encoding Plan
+
+        This is the pre-computed knowledge of a class used by :class:`Serializer`
+        to encode its instances without inspecting the class on every call.
+
+        :param cls: the class of the encoded objects
+        :type  cls: type
+        :param is_entity: the flag to indicate if the class is an entity class
+        :type  is_entity: bool
+
+        .. note::
+
+            The plan is compiled when the class is encoded for the first time.
+            Class-level properties or relational mappings defined after that
+            are not recognized.
+    """
+    def __init__(self, cls, is_entity):
+        self.cls       = cls
+        self.is_entity = is_entity
+
+        # Names to ignore when they are found on an instance.
+        self.ignored_names = set()
+
+        # Non-callable class-level names (e.g., properties)
+        self.class_property_names = []
+
+        # Names of properties with many-to-many associations (direct mapping only)
+        self.many_to_many_names = []
+
+        relational_map = EntityMetadataHelper.extract(cls).relational_map if is_entity else {}
+
+        for name in relational_map:
+            guide = relational_map[name]
+
+            # Skip all pseudo properties used for reverse mapping.
+            if guide.inverted_by:
+                self.ignored_names.add(name)
+
+                continue
+
+            if guide.association_class:
+                self.many_to_many_names.append(name)
+
+        for name in dir(cls):
+            if name in self.ignored_names:
+                continue
+
+            # Skip all protected/private/reserved properties.
+            if name[0] == '_' or name == 'id':
+                self.ignored_names.add(name)
+
+                continue
+
+            reference = getattr(cls, name)
+
+            # Properties are evaluated on every instance.
+            if isinstance(reference, property):
+                self.class_property_names.append(name)
+
+                continue
+
+            # Skip all methods and other callable class-level attributes.
+            if callable(reference):
+                self.ignored_names.add(name)
+
+                continue
+
+            self.class_property_names.append(name)
+
+    def property_names(self, data):
+        """ Retrieve the names of the encodable properties of the given instance
+
+            :param data: an instance of the class of this plan
+            :rtype: list
+        """
+        if not hasattr(data, '__dict__'):
+            return [name for name in dir(data) if name not in self.ignored_names and name[0] != '_']
+
+        property_names = [
+            name
+            for name in data.__dict__
+            if name[0] != '_' and name not in self.ignored_names
+        ]
+
+        for name in self.class_property_names:
+            if name not in data.__dict__:
+                property_names.append(name)
+
+        return property_names
+
 class Serializer(ArraySerializer):
     """ Object Serializer for Entity
+
+        .. versionchanged:: 3.1
+
+            The serializer compiles an :class:`EncodingPlan` per class and
+            re-uses it for every instance of that class.
     """
+    _plan_map = {}
+
+    def plan(self, data):
+        """ Retrieve the encoding plan for the class of the given object
+
+            :param data: the object to encode
+            :rtype: tori.db.common.EncodingPlan
+        """
+        cls = data.__class__
+
+        if cls not in Serializer._plan_map:
+            Serializer._plan_map[cls] = EncodingPlan(cls, self._is_entity(data))
+
+        return Serializer._plan_map[cls]
+
     def extra_associations(self, data, stack_depth=0):
         if not isinstance(data, object):
             raise TypeError('The provided data must be an object')
 
-        returnee           = {}
-        relational_map     = EntityMetadataHelper.extract(data).relational_map if self._is_entity(data) else {}
+        plan               = self.plan(data)
         extra_associations = {}
 
-        for name in dir(data):
-            # Skip all protected/private/reserved properties.
-            if self._is_preserved_property(name):
+        for name in plan.many_to_many_names:
+            if not hasattr(data, name):
                 continue
 
-            guide = self._retrieve_guide(relational_map, name)
+            property_reference = data.__getattribute__(name)
 
-            # Skip all properties without an associative guide or with reverse mapping or without pseudo association class.
-            if not guide or guide.inverted_by or not guide.association_class:
+            # Skip all non-list properties
+            if not isinstance(property_reference, list):
                 continue
 
-            property_reference = data.__getattribute__(name)
+            # The unloaded proxy collection stands for the associations on the
+            # storage until it is loaded. (See UnitOfWork._compute_connection_changes.)
+            if isinstance(property_reference, ProxyCollection) and not property_reference._loaded:
+                extra_associations[name] = property_reference
 
-            # Skip all callable properties and non-list properties
-            if callable(property_reference) or not isinstance(property_reference, list):
                 continue
 
             # With a valid association class, this property has the many-to-many relationship with the other entity.
-            extra_associations[name] = []
-
-            for destination in property_reference:
-                extra_associations[name].append(destination.id)
+            extra_associations[name] = [destination.id for destination in property_reference]
 
         return extra_associations
 
@@ -56,58 +165,84 @@ class Serializer(ArraySerializer):
         if not isinstance(data, object):
             raise TypeError('The provided data must be an object')
 
-        returnee       = {}
-        relational_map = EntityMetadataHelper.extract(data).relational_map if self._is_entity(data) else {}
+        plan     = self.plan(data)
+        returnee = self._encode_properties(plan, data, plan.property_names(data), stack_depth, convert_object_id_to_str)
 
-        for name in dir(data):
-            # Skip all protected/private/reserved properties.
-            if self._is_preserved_property(name):
-                continue
+        # If this is not a pseudo object ID, add the reserved key '_id' with the property 'id' .
+        if data.id and not isinstance(data.id, PseudoObjectId):
+            returnee['_id'] = self._process_value(plan, data, stack_depth, convert_object_id_to_str)
 
-            guide = self._retrieve_guide(relational_map, name)
+        return returnee
 
-            # Skip all pseudo properties used for reverse mapping.
-            if guide and guide.inverted_by:
-                continue
+    def encode_properties(self, data, property_names, stack_depth=0, convert_object_id_to_str=False):
+        """ Encode only the given properties of the entity.
+
+            The properties which are no longer defined are excluded from the
+            result.
+
+            :param data:           the entity to encode
+            :param property_names: the names of the properties to encode
+            :param stack_depth:    traversal depth limit
+            :param convert_object_id_to_str: flag to convert object ID into string
+        """
+        plan = self.plan(data)
+
+        property_names = [
+            name
+            for name in property_names
+            if name not in plan.ignored_names and not self._is_preserved_property(name) and hasattr(data, name)
+        ]
 
+        return self._encode_properties(plan, data, property_names, stack_depth, convert_object_id_to_str)
+
+    def _encode_properties(self, plan, data, property_names, stack_depth, convert_object_id_to_str):
+        returnee = {}
+
+        if not self._primitive_types:
+            self._primitive_types = self.default_primitive_types()
+
+        # Primitive values are kept as they are unless object IDs must be converted.
+        fast_types = self._primitive_types if not convert_object_id_to_str else ()
+
+        for name in property_names:
             property_reference = data.__getattribute__(name)
+            reference_type     = type(property_reference)
 
-            is_list = isinstance(property_reference, list)
-            value   = None
+            if reference_type in fast_types and reference_type is not list:
+                returnee[name] = property_reference
+
+                continue
 
             # Skip all callable properties
             if callable(property_reference):
                 continue
 
-            # For one-to-many relationship, this property relies on the built-in list type.
-            if is_list:
-                value = []
+            # The unloaded proxy collection is encoded as stored without loading it.
+            if isinstance(property_reference, ProxyCollection) and not property_reference._loaded:
+                property_reference = list(property_reference._stored_value or [])
 
-                for item in property_reference:
-                    value.append(self._process_value(data, item, stack_depth, convert_object_id_to_str))
-            else:
-                value = self._process_value(data, property_reference, stack_depth, convert_object_id_to_str)
+            # For one-to-many relationship, this property relies on the built-in list type.
+            if isinstance(property_reference, list):
+                returnee[name] = [
+                    item if type(item) in fast_types else self._process_value(plan, item, stack_depth, convert_object_id_to_str)
+                    for item in property_reference
+                ]
 
-            returnee[name] = value
+                continue
 
-        # If this is not a pseudo object ID, add the reserved key '_id' with the property 'id' .
-        if data.id and not isinstance(data.id, PseudoObjectId):
-            returnee['_id'] = self._process_value(data, data, stack_depth, convert_object_id_to_str)
+            returnee[name] = self._process_value(plan, property_reference, stack_depth, convert_object_id_to_str)
 
         return returnee
 
-    def _retrieve_guide(self, relational_map, name):
-        return relational_map[name] if name in relational_map else None
-
     def _is_preserved_property(self, name):
         return name[0] == '_' or name == 'id'
 
     def _is_entity(self, data):
         return EntityMetadataHelper.hasMetadata(data)
 
-    def _process_value(self, data, value, stack_depth, convert_object_id_to_str):
+    def _process_value(self, plan, value, stack_depth, convert_object_id_to_str):
         is_proxy    = isinstance(value, ProxyObject)
-        is_document = isinstance(data, object) and self._is_entity(data)
+        is_document = plan.is_entity
 
         processed_data = value
 
@@ -127,7 +262,7 @@ class Serializer(ArraySerializer):
         return processed_data
 
     def default_primitive_types(self):
-        return super(Serializer, self).default_primitive_types() + [PseudoObjectId, ObjectId]
+        return set(super(Serializer, self).default_primitive_types() + [PseudoObjectId, ObjectId])
 
 class PseudoObjectId(ObjectId):
     """ Pseudo Object ID
@@ -153,46 +288,84 @@ class ProxyObject(object):
         :type  session: tori.db.session.Session
         :param cls: the class to map the data
         :type  cls: type
-        :param object_id: the object ID
+        :param object_id: the object ID (``None`` only with a relation loader)
         :param read_only: the read-only flag
         :type  read_only: bool
         :param cascading_options: the cascading options
         :type  cascading_options: list or tuple
         :param is_reverse_proxy: the reverse proxy flag
         :type  is_reverse_proxy: bool
+        :param relation_loader: the loader to resolve the object ID of the
+                                reverse proxy (optional)
+        :type  relation_loader: tori.db.common.ProxyRelationLoader
+
+        .. versionchanged:: 3.1
+
+            The reverse proxy can be resolved lazily by a relation loader.
+            Reading ``id`` no longer loads the entity. The proxy has no
+            instance dictionary (``__slots__``) and does not touch the session
+            until the entity is loaded.
     """
-    def __init__(self, session, cls, object_id, read_only, cascading_options, is_reverse_proxy):
-        if isinstance(cls, ProxyObject) or not object_id:
+    __slots__ = (
+        '_session', '_class', '_object_id', '_object', '_read_only', '_cascading_options', '_is_reverse_proxy',
+        '_relation_loader', '__weakref__'
+    )
+
+    def __init__(self, session, cls, object_id, read_only, cascading_options, is_reverse_proxy, relation_loader=None):
+        if isinstance(cls, ProxyObject) or not (object_id or relation_loader):
             raise RuntimeError('Cannot initiate a proxy')
 
-        self.__dict__['_class']      = cls
-        self.__dict__['_collection'] = session.collection(cls)
-        self.__dict__['_object_id']  = object_id
-        self.__dict__['_object']     = None
-        self.__dict__['_read_only']  = read_only
-        self.__dict__['_cascading_options'] = cascading_options
-        self.__dict__['_is_reverse_proxy']  = is_reverse_proxy
+        # The attributes are set directly as the assignments are forwarded to the entity.
+        object.__setattr__(self, '_session', session)
+        object.__setattr__(self, '_class', cls)
+        object.__setattr__(self, '_object_id', object_id)
+        object.__setattr__(self, '_object', None)
+        object.__setattr__(self, '_read_only', read_only)
+        object.__setattr__(self, '_cascading_options', cascading_options)
+        object.__setattr__(self, '_is_reverse_proxy', is_reverse_proxy)
+        object.__setattr__(self, '_relation_loader', relation_loader)
+
+    def _bind(self, entity):
+        """ Bind the proxy to the loaded entity
+
+            :param entity: the actual entity
+        """
+        object.__setattr__(self, '_object', entity)
+
+        if entity is not None and not self._object_id:
+            object.__setattr__(self, '_object_id', entity.id)
+
+    def _use_relation_loader(self, relation_loader):
+        object.__setattr__(self, '_relation_loader', relation_loader)
+
+    def __get_object_id(self):
+        relation_loader = self._relation_loader
+
+        if not self._object_id and relation_loader and not relation_loader.loaded:
+            relation_loader.load()
+
+        return self._object_id
 
     def __get_object(self):
-        if not self.__dict__['_object_id']:
-            raise RuntimeError('Cannot load the proxy')
+        if not self.__get_object_id():
+            if self._relation_loader:
+                return None
 
-        if not self.__dict__['_object']:
-            entity = self._collection.get(self.__dict__['_object_id'])
+            raise RuntimeError('Cannot load the proxy')
 
-            if entity:
-                self.__dict__['_object'] = entity
+        if not self._object:
+            self._session.proxy_loader.load(self)
 
-        return self.__dict__['_object']
+        return self._object
 
     def __getattr__(self, item):
         if item == '_actual':
             return self.__get_object()
-        #elif item == 'id':
-        #    return self.__dict__['_object_id']
+        elif item == 'id':
+            return self.__get_object_id() # The identity is known without loading the entity.
         elif item[0] == '_':
-            return self.__dict__[item]
-        elif not self.__dict__['_object_id'] or not self.__get_object():
+            raise AttributeError(item)
+        elif not self.__get_object():
             return None
 
         return self.__get_object().__getattribute__(item)
@@ -215,15 +388,41 @@ class ProxyCollection(list):
         :type  origin: object
         :param guide: the relational guide
         :type  guide: tori.db.mapper.RelatingGuide
+        :param relation_loader: the loader shared with the other collections of
+                                the same relation (optional)
+        :type  relation_loader: tori.db.common.ProxyRelationLoader
+        :param stored_value: the value of the property on the storage (optional)
 
-        .. note:: To replace with criteria and driver
+        .. versionchanged:: 3.1
+
+            The collections of the same result set are loaded together by the
+            shared relation loader. The collection also supports the reverse
+            one-to-many mapping.
     """
-    def __init__(self, session, origin, guide):
+    def __init__(self, session, origin, guide, relation_loader=None, stored_value=None):
         self._session = session
         self._origin  = origin
         self._guide   = guide
         self._loaded  = False
 
+        self._stored_value     = stored_value
+        self._original_id_list = None
+        self._relation_loader  = None
+
+        (relation_loader or ProxyRelationLoader(session, guide)).add(origin.id, self)
+
+    @property
+    def original_id_list(self):
+        """ The list of the object IDs of the associated entities on the storage
+
+            The collection is loaded if necessary.
+
+            :rtype: list
+        """
+        self._prepare_list()
+
+        return self._original_id_list
+
     def reload(self):
         """ Reload the data list
 
@@ -233,49 +432,63 @@ class ProxyCollection(list):
                 :meth:`tori.db.session.Session.refresh` on the owned object
                 instead.
         """
-        while len(self):
-            self.pop(0)
+        del self[:]
 
         self._loaded = False
 
+        ProxyRelationLoader(self._session, self._guide).add(self._origin.id, self)
+
         self._prepare_list()
 
     def _prepare_list(self):
         if self._loaded:
             return
 
-        self._loaded = True
+        self._relation_loader.load()
 
-        association_class = self._guide.association_class.cls
-        collection        = self._session.collection(association_class)
+    def _fill(self, mapping_list):
+        """ Fill the list with the proxies of the associated entities
+
+            :param mapping_list: the list of associations (or the list of the
+                                 entities for the reverse one-to-many mapping)
+            :type  mapping_list: list
+        """
+        self._loaded = True
 
-        if self._guide.inverted_by:
-            criteria     = collection.new_criteria()
+        if not self._guide.association_class:
+            proxy_list = []
 
-            criteria.where('destination', self._origin.id)
+            for entity in mapping_list:
+                proxy = ProxyFactory.make(self._session, entity.id, self._guide)
 
-            mapping_list = collection.find(criteria)
+                proxy._bind(entity)
 
-            self.extend([
+                proxy_list.append(proxy)
+        elif self._guide.inverted_by:
+            proxy_list = [
                 ProxyFactory.make(self._session, association.origin, self._guide)
                 for association in mapping_list
-            ])
-
-            return
+            ]
+        else:
+            proxy_list = [
+                ProxyFactory.make(self._session, association.destination, self._guide)
+                for association in mapping_list
+            ]
 
-        criteria     = {'origin': self._origin.id}
-        mapping_list = collection.filter(criteria)
+        self._original_id_list = [proxy._object_id for proxy in proxy_list]
 
-        self.extend([
-            ProxyFactory.make(self._session, association.destination, self._guide)
-            for association in mapping_list
-        ])
+        super(ProxyCollection, self).extend(proxy_list)
 
     def __iter__(self):
         self._prepare_list()
 
         return super(ProxyCollection, self).__iter__()
 
+    def __reversed__(self):
+        self._prepare_list()
+
+        return super(ProxyCollection, self).__reversed__()
+
     def __len__(self):
         self._prepare_list()
 
@@ -306,6 +519,198 @@ class ProxyCollection(list):
 
         super(ProxyCollection, self).__setitem__(key, value)
 
+    def __iadd__(self, other):
+        self._prepare_list()
+
+        return super(ProxyCollection, self).__iadd__(other)
+
+    def append(self, item):
+        self._prepare_list()
+
+        super(ProxyCollection, self).append(item)
+
+    def extend(self, other):
+        self._prepare_list()
+
+        super(ProxyCollection, self).extend(other)
+
+    def insert(self, index, item):
+        self._prepare_list()
+
+        super(ProxyCollection, self).insert(index, item)
+
+    def pop(self, *args):
+        self._prepare_list()
+
+        return super(ProxyCollection, self).pop(*args)
+
+    def remove(self, item):
+        self._prepare_list()
+
+        super(ProxyCollection, self).remove(item)
+
+    def index(self, *args):
+        self._prepare_list()
+
+        return super(ProxyCollection, self).index(*args)
+
+    def count(self, item):
+        self._prepare_list()
+
+        return super(ProxyCollection, self).count(item)
+
+    def sort(self, *args, **kwargs):
+        self._prepare_list()
+
+        super(ProxyCollection, self).sort(*args, **kwargs)
+
+    def reverse(self):
+        self._prepare_list()
+
+        super(ProxyCollection, self).reverse()
+
+class ProxyRelationLoader(object):
+    """ Proxy Relation Loader
+
+        This loader resolves one relation (the reverse mapping or the
+        many-to-many association) of many entities with one query. The holders
+        of the relation, i.e., the proxy collections and the reverse proxy
+        objects, are registered with the object IDs of their owners and filled
+        together when any of them is accessed for the first time.
+
+        :param session: the managed session
+        :type  session: tori.db.session.Session
+        :param guide: the relational guide
+        :type  guide: tori.db.mapper.RelatingGuide
+
+        .. versionadded:: 3.1
+
+        .. note::
+
+            The loader only keeps weak references to the holders.
+    """
+    def __init__(self, session, guide):
+        self._session    = session
+        self._guide      = guide
+        self._holder_map = WeakValueDictionary() # owner ID => proxy collection or reverse proxy object
+        self._loaded     = False
+
+    @property
+    def loaded(self):
+        """ The flag to indicate if the relation is loaded """
+        return self._loaded
+
+    def add(self, owner_id, holder):
+        """ Add the holder of the relation of the owner
+
+            The holder is taken over from its previous loader.
+
+            :param owner_id: the object ID of the owner
+            :param holder: the proxy collection or the reverse proxy object
+        """
+        previous_loader = holder._relation_loader
+
+        if previous_loader and previous_loader is not self and owner_id in previous_loader._holder_map:
+            del previous_loader._holder_map[owner_id]
+
+        if isinstance(holder, ProxyObject):
+            holder._use_relation_loader(self)
+        else:
+            holder._relation_loader = self
+
+        self._holder_map[owner_id] = holder
+
+    def load(self):
+        """ Load the relation of every registered owner """
+        if self._loaded:
+            return
+
+        holder_map = dict(self._holder_map)
+
+        repository, condition = self._prepare(holder_map)
+
+        self._complete(holder_map, repository.filter(condition, True) if holder_map else [])
+
+    @gen.coroutine
+    def load_async(self):
+        """ Asynchronous version of :meth:`load` """
+        if self._loaded:
+            return
+
+        holder_map  = dict(self._holder_map)
+        result_list = []
+
+        repository, condition = self._prepare(holder_map)
+
+        if holder_map:
+            result_list = yield repository.filter_async(condition, True)
+
+        self._complete(holder_map, result_list)
+
+    def _prepare(self, holder_map):
+        """ Prepare the query for the relation
+
+            :return: the tuple of the repository and the condition
+            :rtype: tuple
+        """
+        guide         = self._guide
+        owner_id_list = list(holder_map.keys())
+
+        if guide.association_class:
+            owner_key = 'destination' if guide.inverted_by else 'origin'
+
+            return self._session.repository(guide.association_class.cls), {owner_key: {'$in': owner_id_list}}
+
+        return self._session.repository(guide.target_class), {guide.inverted_by: {'$in': owner_id_list}}
+
+    def _complete(self, holder_map, result_list):
+        """ Fill the holders with the loaded associations or entities """
+        mapping_map = {} # owner ID => list of associations or entities
+
+        for owner_id in holder_map:
+            mapping_map[owner_id] = []
+
+        for result in result_list:
+            for owner_id in self._retrieve_owner_ids(result):
+                if owner_id in mapping_map:
+                    mapping_map[owner_id].append(result)
+
+        self._loaded = True
+
+        for owner_id in holder_map:
+            holder = holder_map[owner_id]
+
+            if isinstance(holder, ProxyCollection):
+                if not holder._loaded:
+                    holder._fill(mapping_map[owner_id])
+
+                continue
+
+            # The reverse one-to-one or many-to-one mapping
+            if mapping_map[owner_id] and not holder._object:
+                holder._bind(mapping_map[owner_id][0])
+
+    def _retrieve_owner_ids(self, result):
+        """ Retrieve the object IDs of the owners referred by the loaded association or entity
+
+            :rtype: list
+        """
+        if self._guide.association_class:
+            return [result.destination if self._guide.inverted_by else result.origin]
+
+        references = result.__dict__[self._guide.inverted_by] if self._guide.inverted_by in result.__dict__ else None
+
+        if not isinstance(references, list):
+            references = [references]
+
+        return [
+            reference._object_id if isinstance(reference, ProxyObject) else (
+                reference if isinstance(reference, ObjectId) else reference.id
+            )
+            for reference in references
+            if reference
+        ]
+
 class ProxyFactory(object):
     """ Proxy Factory
 
@@ -316,16 +721,254 @@ class ProxyFactory(object):
         :param id: the object ID
         :param mapping_guide: the relational guide
         :type  mapping_guide: tori.db.mapper.RelatingGuide
+        :param relation_loader: the relation loader of the reverse proxy (optional)
+        :type  relation_loader: tori.db.common.ProxyRelationLoader
     """
     @staticmethod
-    def make(session, id, mapping_guide):
+    def make(session, id, mapping_guide, relation_loader=None):
         is_reverse_proxy = mapping_guide.inverted_by != None
 
-        return ProxyObject(
+        proxy = ProxyObject(
             session,
             mapping_guide.target_class,
             id,
             mapping_guide.read_only or is_reverse_proxy,
             mapping_guide.cascading_options,
-            is_reverse_proxy
-        )
\ No newline at end of file
+            is_reverse_proxy,
+            relation_loader
+        )
+
+        if id:
+            session.proxy_loader.register(proxy)
+
+        return proxy
+
+class ProxyBatchLoader(object):
+    """ Proxy Batch Loader
+
+        This loader keeps track of the unloaded proxy objects of a session.
+        When one of them is accessed, the pending proxies of the same class
+        are resolved together with one ``$in`` query and the loaded entities
+        are recognized by the session.
+
+        :param session: the managed session
+        :type  session: tori.db.session.Session
+        :param batch_size: the maximum number of object IDs per query
+                           (``None`` for unlimited)
+        :type  batch_size: int
+
+        .. versionadded:: 3.1
+
+        .. note::
+
+            The loader only keeps weak references to the pending proxies.
+    """
+    def __init__(self, session, batch_size=1000):
+        self._session     = session
+        self._batch_size  = batch_size
+        self._pending_map = {} # class => weak set of unloaded proxies
+
+    @property
+    def batch_size(self):
+        """ The maximum number of object IDs per query """
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, value):
+        self._batch_size = value
+
+    def register(self, proxy):
+        """ Register the unloaded proxy
+
+            :param proxy: the proxy object
+            :type  proxy: tori.db.common.ProxyObject
+        """
+        cls = proxy._class
+
+        if cls not in self._pending_map:
+            self._pending_map[cls] = WeakSet()
+
+        self._pending_map[cls].add(proxy)
+
+    def load(self, proxy):
+        """ Load the proxy together with the other pending proxies of the same class
+
+            :param proxy: the proxy object
+            :type  proxy: tori.db.common.ProxyObject
+            :return: the actual entity or ``None`` if it does not exist
+        """
+        self._load_batch(proxy._class, self._take_batch(proxy))
+
+        return proxy._object
+
+    @gen.coroutine
+    def load_async(self, proxy):
+        """ Asynchronous version of :meth:`load` """
+        yield self._load_batch_async(proxy._class, self._take_batch(proxy))
+
+        raise gen.Return(proxy._object)
+
+    def load_all(self, proxy_list):
+        """ Load the given proxies with one query per class regardless of the batch size
+
+            :param proxy_list: the list of proxy objects
+            :type  proxy_list: list
+        """
+        class_to_batch_map = self._group_batches(proxy_list)
+
+        for cls in class_to_batch_map:
+            self._load_batch(cls, class_to_batch_map[cls])
+
+    @gen.coroutine
+    def load_all_async(self, proxy_list):
+        """ Asynchronous version of :meth:`load_all` """
+        class_to_batch_map = self._group_batches(proxy_list)
+
+        yield [
+            self._load_batch_async(cls, class_to_batch_map[cls])
+            for cls in class_to_batch_map
+        ]
+
+    def _take_batch(self, proxy):
+        """ Take the proxy and the pending proxies of the same class out of the queue
+
+            :rtype: list
+        """
+        cls         = proxy._class
+        pending_set = self._pending_map[cls] if cls in self._pending_map else WeakSet()
+        batch       = [proxy]
+
+        object_id_set = set([proxy._object_id])
+
+        pending_set.discard(proxy)
+
+        for pending_proxy in list(pending_set):
+            if self._batch_size and len(object_id_set) >= self._batch_size:
+                break
+
+            pending_set.discard(pending_proxy)
+
+            if pending_proxy._object:
+                continue
+
+            batch.append(pending_proxy)
+            object_id_set.add(pending_proxy._object_id)
+
+        return batch
+
+    def _group_batches(self, proxy_list):
+        """ Take the unloaded proxies out of the queue grouped by class
+
+            :rtype: dict
+        """
+        class_to_batch_map = {}
+
+        for proxy in proxy_list:
+            if proxy._object:
+                continue
+
+            cls = proxy._class
+
+            if cls in self._pending_map:
+                self._pending_map[cls].discard(proxy)
+
+            if cls not in class_to_batch_map:
+                class_to_batch_map[cls] = []
+
+            class_to_batch_map[cls].append(proxy)
+
+        return class_to_batch_map
+
+    def _load_batch(self, cls, batch):
+        repository, criteria, entity_map, cached_data_list = self._prepare_batch(cls, batch)
+
+        data_list = []
+
+        if criteria:
+            version   = self._session.entity_cache.version(repository.name)
+            data_list = self._session.query(criteria)
+
+            self._cache_batch(criteria, data_list, version)
+
+        self._complete_batch(repository, criteria, batch, data_list, entity_map, cached_data_list)
+
+    @gen.coroutine
+    def _load_batch_async(self, cls, batch):
+        repository, criteria, entity_map, cached_data_list = self._prepare_batch(cls, batch)
+
+        data_list = []
+
+        if criteria:
+            version   = self._session.entity_cache.version(repository.name)
+            data_list = yield self._session.query_async(criteria)
+
+            self._cache_batch(criteria, data_list, version)
+
+        self._complete_batch(repository, criteria, batch, data_list, entity_map, cached_data_list)
+
+    def _prepare_batch(self, cls, batch):
+        """ Prepare the query for the batch
+
+            :return: the tuple of the repository, the criteria (or ``None``
+                     if every entity is already recognized by the session or
+                     cached), the map of the object IDs to the recognized
+                     entities and the list of the cached documents
+            :rtype: tuple
+        """
+        repository     = self._session.repository(cls)
+        entity_map     = {} # object ID => entity
+        object_id_list = []
+
+        # The recognized entities are taken from the identity map. They are
+        # kept here as loading the others may evict them from the session.
+        for object_id in set([proxy._object_id for proxy in batch]):
+            record = self._session.find_record(object_id, cls)
+
+            if record:
+                entity_map[object_id] = record.entity
+
+                continue
+
+            object_id_list.append(object_id)
+
+        # Then, the documents shared by the sessions (second-level cache).
+        cached_data_map = self._session.entity_cache.get_many(EntityMetadataHelper.extract(cls), object_id_list)
+        object_id_list  = [object_id for object_id in object_id_list if object_id not in cached_data_map]
+
+        if not object_id_list:
+            return repository, None, entity_map, list(cached_data_map.values())
+
+        criteria = repository.new_criteria()
+
+        criteria.where({'_id': {'$in': object_id_list}})
+
+        return repository, criteria, entity_map, list(cached_data_map.values())
+
+    def _cache_batch(self, criteria, data_list, version):
+        """ Store the loaded documents in the second-level cache
+
+            The documents loaded with a projection are not cached.
+        """
+        if criteria.projection:
+            return
+
+        self._session.entity_cache.put(EntityMetadataHelper.extract(criteria.origin), data_list, version)
+
+    def _complete_batch(self, repository, criteria, batch, data_list, entity_map, cached_data_list):
+        """ Bind the loaded entities to the proxies in the batch """
+        relation_loader_map = {} # The relations are loaded for the whole batch at once.
+        projection          = criteria.projection if criteria else None
+
+        for data in data_list:
+            entity_map[data['_id']] = repository._dehydrate_object(data, relation_loader_map, projection)
+
+        # The cached documents are always whole.
+        for data in cached_data_list:
+            entity_map[data['_id']] = repository._dehydrate_object(data, relation_loader_map)
+
+        for member in batch:
+            if member._object:
+                continue
+
+            if member._object_id in entity_map:
+                member._bind(entity_map[member._object_id])
@@ -8,9 +8,17 @@
 .. moduleauthor:: Juti Noppornpitak <jnopporn@shiroyuki.com>
 """
 
+import base64
+import hashlib
+import hmac
+import os
 import pymongo
+from bson import BSON
+from bson.errors import BSONError
 from imagination.decorator.validator import restrict_type
+from tori.db.common import ProxyObject
 from tori.db.expression import Criteria
+from tori.db.metadata.helper import EntityMetadataHelper
 
 class Order(object):
     """ Sorting Order Definition """
@@ -19,6 +27,24 @@ class Order(object):
     DESC = pymongo.DESCENDING
     """ Descending Order """
 
+class Aggregate(object):
+    """ Aggregate Function Definition
+
+        .. versionadded:: 3.1
+    """
+    COUNT = 'count'
+    """ The number of the entities """
+    SUM   = 'sum'
+    """ The sum of the values """
+    AVG   = 'avg'
+    """ The average of the values """
+    MIN   = 'min'
+    """ The minimum value """
+    MAX   = 'max'
+    """ The maximum value """
+
+    function_list = [COUNT, SUM, AVG, MIN, MAX]
+
 class Query(object):
     """ Criteria
 
@@ -28,6 +54,8 @@ class Query(object):
             associated entities.
 
     """
+    cursor_secret = os.urandom(32) # the secret key to sign the cursor tokens (see cursor_of)
+
     def __init__(self, alias):
         self._alias     = alias
         self._condition = {}
@@ -42,6 +70,13 @@ class Query(object):
         self._criteria = None
         self._join_map   = {}
         self._definition_map  = {}
+        self._prefetch_list   = []
+        self._select_list     = []
+        self._seek_reference  = None # (forward, entity or decoded keyset)
+        self._cache_policy    = None # (enabled, ttl)
+        self._group_list      = []
+        self._aggregate_list  = [] # [(name, function, property name)]
+        self._having_list     = [] # [(name, operand, value)]
 
     @property
     def is_new_style(self):
@@ -167,6 +202,211 @@ class Query(object):
 
         return self
 
+    def after(self, reference):
+        """ Define the position after which the entities are retrieved (keyset pagination)
+
+            :param reference: the last entity of the previous page or its
+                              cursor token (see :meth:`cursor_of`)
+
+            Unlike :meth:`start`, the backend datastore seeks the position
+            with the range conditions on the sorting fields (see
+            :attr:`seek_order`) instead of skipping the preceding entities.
+            Hence, a deep page costs the same as the first page as long as
+            the sorting fields are indexed. For example,
+
+            .. code-block:: python
+
+                query = repository.new_criteria('e')
+                query.order('created_at', Order.DESC)
+                query.limit(20)
+
+                if cursor:
+                    query.after(cursor)
+
+                entities = repository.find(query)
+                cursor   = query.cursor_of(entities[-1]) if entities else None
+
+            The missing (or ``None``) values of the sorting fields are
+            supported and follow the order of MongoDB, i.e., they come first
+            in the ascending order and last in the descending order.
+
+            :raise ValueError: if the cursor token is invalid, e.g., not
+                               signed with :attr:`cursor_secret`
+
+            .. versionadded:: 3.1
+        """
+        self._seek_reference = (True, self._seek_keyset(reference))
+
+        return self
+
+    def before(self, reference):
+        """ Define the position before which the entities are retrieved (keyset pagination)
+
+            :param reference: the first entity of the next page or its
+                              cursor token (see :meth:`cursor_of`)
+
+            The result is still in the defined order, i.e., the entities
+            right before the reference (see :meth:`after`).
+
+            :raise ValueError: if the cursor token is invalid
+
+            .. versionadded:: 3.1
+        """
+        self._seek_reference = (False, self._seek_keyset(reference))
+
+        return self
+
+    @property
+    def seek_order(self):
+        """ The sorting order used by the keyset pagination
+
+            This is the defined order with the identifier as the tiebreaker.
+            The directions are reversed to seek backward (see :meth:`before`).
+
+            .. versionadded:: 3.1
+        """
+        seek_order = list(self._order_by)
+
+        if '_id' not in [field for field, direction in seek_order]:
+            seek_order.append(('_id', Order.ASC))
+
+        if self._seek_reference and not self._seek_reference[0]:
+            seek_order = [
+                (field, Order.DESC if direction == Order.ASC else Order.ASC)
+                for field, direction in seek_order
+            ]
+
+        return seek_order
+
+    @property
+    def seek(self):
+        """ The tuple of the flag whether the keyset pagination seeks forward
+            and the keyset (the list of the values of :attr:`seek_order`) or
+            ``None`` without the keyset pagination
+
+            :raise ValueError: if the cursor token does not match the sorting order
+
+            .. versionadded:: 3.1
+        """
+        if not self._seek_reference:
+            return None
+
+        forward, reference = self._seek_reference
+
+        # The entities always have the identifiers unlike the decoded keysets.
+        keyset = self._keyset_of(reference) if hasattr(reference, 'id') else reference
+
+        if len(keyset) != len(self.seek_order):
+            raise ValueError('The cursor token does not match the sorting order.')
+
+        return forward, keyset
+
+    def cursor_of(self, entity):
+        """ Make the opaque cursor token of the entity for :meth:`after` and :meth:`before`
+
+            :param entity: the entity in the result of this query
+            :return: the URL-safe cursor token
+            :rtype: str
+
+            The token is signed with :attr:`cursor_secret`, which is random
+            per process by default. Set the same secret on every process
+            accepting the tokens of the others, e.g.,
+            ``Query.cursor_secret = b'...'``.
+
+            .. versionadded:: 3.1
+        """
+        encoded = BSON.encode({'keyset': self._keyset_of(entity)})
+
+        return base64.urlsafe_b64encode(self._sign_cursor(encoded) + encoded).decode('ascii')
+
+    def _keyset_of(self, entity):
+        keyset = []
+
+        for field, direction in self.seek_order:
+            if field == '_id':
+                keyset.append(entity.id)
+
+                continue
+
+            value = entity
+
+            for name in field.split('.'):
+                value = value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+
+            # The associated entities are stored as their identifiers.
+            if isinstance(value, ProxyObject) or (value is not None and EntityMetadataHelper.hasMetadata(value)):
+                value = value.id
+
+            keyset.append(value)
+
+        return keyset
+
+    def _seek_keyset(self, reference):
+        # The entities are kept to compute the keysets with the final sorting order.
+        return reference if hasattr(reference, 'id') else self._decode_cursor(reference)
+
+    def _sign_cursor(self, encoded):
+        return hmac.new(self.cursor_secret, encoded, hashlib.sha256).digest()
+
+    def _decode_cursor(self, token):
+        try:
+            if not isinstance(token, bytes):
+                token = token.encode('ascii')
+
+            decoded   = base64.urlsafe_b64decode(token)
+            signature = decoded[:hashlib.sha256().digest_size]
+            encoded   = decoded[hashlib.sha256().digest_size:]
+
+            if not hmac.compare_digest(signature, self._sign_cursor(encoded)):
+                raise ValueError('Invalid signature')
+
+            keyset = BSON(encoded).decode()['keyset']
+        except (BSONError, KeyError, TypeError, ValueError):
+            raise ValueError('Invalid cursor token')
+
+        # The values are used in the native query as they are. Only the values
+        # of the sorting fields, never documents or operators, are accepted.
+        if not isinstance(keyset, list) or any([isinstance(value, (dict, list)) for value in keyset]):
+            raise ValueError('Invalid cursor token')
+
+        return keyset
+
+    def cacheable(self, ttl=None, enabled=True):
+        """ Define whether the result of the query is cached
+
+            :param ttl: the time-to-live of the result in seconds (``None``
+                        for the default TTL of the cache)
+            :type  ttl: float
+            :param enabled: the flag to enable caching (``False`` to disable
+                            caching even if it is enabled for the repository)
+            :type  enabled: bool
+
+            The raw data sets are cached by the query cache of the session
+            (see :class:`tori.db.cache.QueryCache`) until they expire or the
+            queried collections are written. For example,
+
+            .. code-block:: python
+
+                query = repository.new_criteria('e')
+                query.expect('e.code = :code')
+                query.define(code = 'th')
+                query.cacheable(ttl = 300)
+
+            .. versionadded:: 3.1
+        """
+        self._cache_policy = (enabled, ttl)
+
+        return self
+
+    @property
+    def cache_policy(self):
+        """ The tuple of the flag whether the result is cached and the
+            time-to-live or ``None`` if undefined (see :meth:`cacheable`)
+
+            .. versionadded:: 3.1
+        """
+        return self._cache_policy
+
     def force_loading(self, flag):
         self._force_loading = flag
 
@@ -177,6 +417,228 @@ class Query(object):
 
         return self
 
+    def prefetch(self, *property_paths):
+        """ Define the relations to load alongside the result
+
+            :param property_paths: the property paths of the root entity
+                                   (e.g., ``e.author``)
+
+            Instead of loading each reference lazily, the repository loads
+            every prefetched relation of the result with one query per
+            relation (two for many-to-many relations). For example,
+
+            .. code-block:: python
+
+                query = repository.new_criteria('e')
+                query.prefetch('e.author', 'e.tags')
+
+            .. versionadded:: 3.1
+        """
+        for property_path in property_paths:
+            property_name = self._root_property_name(property_path, 'prefetched')
+
+            if property_name not in self._prefetch_list:
+                self._prefetch_list.append(property_name)
+
+        return self
+
+    @property
+    def prefetch_list(self):
+        """ The names of the prefetched properties
+
+            .. versionadded:: 3.1
+        """
+        return self._prefetch_list
+
+    def select(self, *property_paths):
+        """ Define the properties to load (projection)
+
+            :param property_paths: the property paths of the root entity
+                                   (e.g., ``e.title``)
+
+            Only the selected properties, the identifier and the direct
+            relations of the root entity are loaded. The other properties
+            are loaded with one query on first access. For example,
+
+            .. code-block:: python
+
+                query = repository.new_criteria('e')
+                query.select('e.title', 'e.updated_at')
+
+            .. versionadded:: 3.1
+        """
+        for property_path in property_paths:
+            property_name = self._root_property_name(property_path, 'selected')
+
+            if property_name != 'id' and property_name not in self._select_list:
+                self._select_list.append(property_name)
+
+        return self
+
+    @property
+    def select_list(self):
+        """ The names of the selected properties
+
+            .. versionadded:: 3.1
+        """
+        return self._select_list
+
+    @property
+    def projection(self):
+        """ The projection of the root entity
+
+            This is the map of the field names to the flags whether the fields
+            are loaded (see :class:`tori.db.entity.DeferredFieldLoader`) or
+            ``None`` if the whole documents are loaded.
+
+            .. versionadded:: 3.1
+        """
+        if not self._origin or not EntityMetadataHelper.hasMetadata(self._origin):
+            return None
+
+        metadata       = EntityMetadataHelper.extract(self._origin)
+        relational_map = metadata.relational_map
+
+        if self._select_list:
+            projection = dict([(name, True) for name in self._select_list])
+
+            # The direct relations are always loaded to make the proxies.
+            for name in relational_map:
+                if not relational_map[name].inverted_by:
+                    projection[name] = True
+
+            return projection
+
+        if not metadata.deferred_field_list:
+            return None
+
+        return dict([
+            (name, False)
+            for name in metadata.deferred_field_list
+            if name not in relational_map
+        ]) or None
+
+    def group(self, *property_paths):
+        """ Define the properties to group the entities by for the aggregation
+
+            :param property_paths: the property paths of the root entity
+                                   (e.g., ``e.country``)
+
+            See :meth:`aggregate`.
+
+            .. versionadded:: 3.1
+        """
+        for property_path in property_paths:
+            property_name = self._root_property_name(property_path, 'grouped')
+
+            if property_name not in self._group_list:
+                self._group_list.append(property_name)
+
+        return self
+
+    @property
+    def group_list(self):
+        """ The names of the grouping properties
+
+            .. versionadded:: 3.1
+        """
+        return self._group_list
+
+    def aggregate(self, name, function, property_path=None):
+        """ Define an aggregated value
+
+            :param name: the name of the value in the resulting rows
+            :type  name: str
+            :param function: the aggregate function (see :class:`Aggregate`)
+            :type  function: str
+            :param property_path: the property path of the root entity (not
+                                  required by :attr:`Aggregate.COUNT`)
+            :type  property_path: str
+
+            The query with any aggregated values is executed by the backend
+            datastore with :meth:`tori.db.repository.Repository.aggregate`,
+            which returns one row (dictionary) per group with the grouping
+            properties and the aggregated values. The sorting and pagination
+            apply to the rows. For example,
+
+            .. code-block:: python
+
+                query = repository.new_criteria('e')
+                query.expect('e.status = :status')
+                query.define(status = 'paid')
+                query.group('e.country')
+                query.aggregate('orders', Aggregate.COUNT)
+                query.aggregate('revenue', Aggregate.SUM, 'e.amount')
+                query.having('revenue', '>=', 1000)
+                query.order('revenue', Order.DESC)
+
+                rows = repository.aggregate(query) # e.g., [{'country': 'th', 'orders': 12, 'revenue': 3400}]
+
+            .. versionadded:: 3.1
+        """
+        if function not in Aggregate.function_list:
+            raise ValueError('Unknown aggregate function: {}'.format(function))
+
+        if function != Aggregate.COUNT and not property_path:
+            raise ValueError('The aggregate function {} requires a property path.'.format(function))
+
+        if name in self._group_list or name in [aggregated[0] for aggregated in self._aggregate_list]:
+            raise ValueError('The name {} is already used in the aggregation.'.format(name))
+
+        property_name = self._root_property_name(property_path, 'aggregated') if property_path else None
+
+        self._aggregate_list.append((name, function, property_name))
+
+        return self
+
+    @property
+    def aggregate_list(self):
+        """ The list of the tuples of the names, the aggregate functions and
+            the names of the aggregated properties
+
+            .. versionadded:: 3.1
+        """
+        return self._aggregate_list
+
+    def having(self, name, operand, value):
+        """ Define a condition on an aggregated value or a grouping property
+
+            :param name: the name of the aggregated value or the grouping property
+            :type  name: str
+            :param operand: the generic operand (see :class:`tori.db.expression.ExpressionOperand`)
+            :type  operand: str
+            :param value: the value to compare with
+
+            .. versionadded:: 3.1
+        """
+        self._having_list.append((name, operand, value))
+
+        return self
+
+    @property
+    def having_list(self):
+        """ The list of the tuples of the names, the operands and the values
+
+            .. versionadded:: 3.1
+        """
+        return self._having_list
+
+    @property
+    def is_aggregation(self):
+        """ The flag whether any aggregated value is defined
+
+            .. versionadded:: 3.1
+        """
+        return bool(self._aggregate_list)
+
+    def _root_property_name(self, property_path, action):
+        alias, property_name = property_path.split('.', 1) if '.' in property_path else (None, None)
+
+        if alias != self.alias or not property_name or '.' in property_name:
+            raise ValueError('Only the properties of the root entity (alias: {}) can be {}, not {}.'.format(self.alias, action, property_path))
+
+        return property_name
+
     def new_criteria(self):
         """ Get a new expression for this criteria
 
@@ -257,6 +719,15 @@ class Query(object):
         if self._condition:
             statements.append('WHERE ' + str(self._condition))
 
+        if self._group_list:
+            statements.append('GROUP BY ' + str(self._group_list))
+
+        if self._aggregate_list:
+            statements.append('AGGREGATE ' + str(self._aggregate_list))
+
+        if self._having_list:
+            statements.append('HAVING ' + str(self._having_list))
+
         if self._order_by:
             statements.append('ORDER BY ' + str(self._order_by))
 
@@ -266,4 +737,7 @@ class Query(object):
         if self._limit:
             statements.append('LIMIT ' + str(self._limit))
 
+        if self._seek_reference:
+            statements.append(('AFTER ' if self._seek_reference[0] else 'BEFORE ') + str(self.seek[1]))
+
         return ' '.join(statements)
\ No newline at end of file
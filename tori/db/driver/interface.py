@@ -96,11 +96,94 @@ class DialectInterface(object):
     def get_iterating_constrains(self, query):
         """ Retrieve the query constrains.
 
+            The constrains whose names start with an underscore are the options
+            for the driver, e.g., ``_fields`` for the projection of the root
+            entity (see :attr:`tori.db.criteria.Query.projection`).
+
             :raise NotImplemented: only if the interface is not overridden.
         """
 
         raise NotImplemented('Define the native constrains.')
 
+    def get_chunk_constrains(self, constrains):
+        """ Retrieve the constrains of the root query of a chunk of joined keys
+
+            When the joined keys are split into chunks, the root query is
+            executed once per chunk. The results are then merged by
+            :meth:`merge_chunk_results`.
+
+            :param dict constrains: the constrains of the whole query
+            :rtype: dict
+
+            :raise NotImplemented: only if the interface is not overridden.
+
+            .. versionadded:: 3.1
+        """
+
+        raise NotImplemented('Define the constrains of the chunks.')
+
+    def merge_chunk_results(self, result_lists, constrains):
+        """ Merge the results of the root query of the chunks
+
+            :param list result_lists: the list of the results of the chunks
+            :param dict constrains:   the constrains of the whole query
+            :return: the result of the whole query
+            :rtype: list
+
+            :raise NotImplemented: only if the interface is not overridden.
+
+            .. versionadded:: 3.1
+        """
+
+        raise NotImplemented('Merge the results of the chunks.')
+
+    def process_seek_conditions(self, native_query, seek_order, keyset):
+        """ Process the range conditions of the keyset pagination.
+
+            :param native_query:    the native query of the root alias
+            :param list seek_order: the sorting order (see :attr:`tori.db.criteria.Query.seek_order`)
+            :param list keyset:     the values of the sorting fields to seek after
+            :return: the native query with the range conditions
+
+            :raise NotImplemented: only if the interface is not overridden.
+
+            .. versionadded:: 3.1
+        """
+
+        raise NotImplemented('Add the range conditions.')
+
+    def get_union_query(self, native_query_list):
+        """ Combine the native queries into one matching any of them.
+
+            This is used to count or aggregate the root alias at once when the
+            joined keys are split into chunks.
+
+            :param list native_query_list: the native queries (at least one)
+            :return: the native query
+
+            :raise NotImplemented: only if the interface is not overridden.
+
+            .. versionadded:: 3.1
+        """
+
+        raise NotImplemented('Combine the native queries.')
+
+    def get_aggregation_pipeline(self, native_query_list, query):
+        """ Compile the aggregation of the query into the native aggregation.
+
+            :param list native_query_list: the native queries of the root alias
+                                           (one per chunk of the joined keys)
+            :param tori.db.criteria.Query query: the query with the grouping
+                                                 properties and the aggregated values
+            :return: the native aggregation (e.g., the pipeline of MongoDB)
+
+            :raise NotImplemented: only if the interface is not overridden.
+
+            .. versionadded:: 3.1
+        """
+
+        raise NotImplemented('Compile the aggregation.')
+
     def process_join_conditions(self, alias_to_conditions_map, alias, join_config, parent_alias):
         """ Process the join conditions.
 
@@ -140,6 +223,7 @@ class DriverInterface(object):
         self._client = None
         self._database_name = None
         self._dialect = dialect
+        self._observer_list = []
 
     @property
     def config(self):
@@ -159,6 +243,47 @@ class DriverInterface(object):
     def dialect(self, value):
         self._dialect = value
 
+    @property
+    def observers(self):
+        """ The list of the query observers (see :mod:`tori.db.driver.observer`)
+
+            .. versionadded:: 3.1
+        """
+        return self._observer_list
+
+    def add_observer(self, observer):
+        """ Attach a query observer
+
+            :param observer: the observer
+            :type  observer: tori.db.driver.observer.QueryObserver
+
+            .. versionadded:: 3.1
+        """
+        if observer not in self._observer_list:
+            self._observer_list.append(observer)
+
+    def remove_observer(self, observer):
+        """ Detach a query observer
+
+            :param observer: the observer
+            :type  observer: tori.db.driver.observer.QueryObserver
+
+            .. versionadded:: 3.1
+        """
+        if observer in self._observer_list:
+            self._observer_list.remove(observer)
+
+    def notify_query(self, stats):
+        """ Notify the query observers of the statistics of a query
+
+            :param stats: the statistics of the query
+            :type  stats: tori.db.driver.observer.QueryStats
+
+            .. versionadded:: 3.1
+        """
+        for observer in self._observer_list:
+            observer.on_query(self, stats)
+
     @property
     def client(self):
         """ Driver Connection / Client """
@@ -205,6 +330,141 @@ class DriverInterface(object):
 
         raise NotImplemented()
 
+    def insert_many(self, collection_name, data_list):
+        """ Low-level bulk insert function
+
+            The default implementation falls back to :meth:`insert` for each
+            item. Drivers supporting bulk operations should override this
+            method.
+
+            :param str  collection_name: the name of the collection
+            :param list data_list:       the list of inserting data
+            :return: the list of object IDs in the same order as ``data_list``
+            :rtype:  list
+        """
+        return [self.insert(collection_name, data) for data in data_list]
+
+    def update_many(self, collection_name, update_list):
+        """ Low-level bulk update function
+
+            The default implementation falls back to ``update`` for each item.
+            Drivers supporting bulk operations should override this method.
+
+            :param str  collection_name: the name of the collection
+            :param list update_list:     the list of tuples of the criteria and
+                                         the updating data
+        """
+        for criteria, new in update_list:
+            self.update(collection_name, criteria, new)
+
+    def remove_many(self, collection_name, object_id_list):
+        """ Low-level bulk removal function
+
+            The default implementation falls back to ``remove`` for each
+            object ID. Drivers supporting bulk operations should override this
+            method.
+
+            :param str  collection_name: the name of the collection
+            :param list object_id_list:  the list of object IDs
+        """
+        for object_id in object_id_list:
+            self.remove(collection_name, {'_id': object_id})
+
+    def iterate(self, metadata, query, iterating_constrains, batch_size=None):
+        """ Low-level function to iterate the data sets
+
+            The default implementation falls back to ``query``. Drivers
+            supporting cursors should override this method to stream the data
+            sets from the backend datastore.
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param query: the native query
+            :param dict iterating_constrains: the iterating constrains
+            :param int  batch_size:           the number of data sets fetched at once
+            :return: the generator of data sets
+
+            .. versionadded:: 3.1
+        """
+        for data in self.query(metadata, query, iterating_constrains):
+            yield data
+
+    def count(self, metadata, query):
+        """ Low-level function to count the data sets
+
+            The default implementation counts the object IDs returned by
+            ``query``. Drivers should override this method to count on the
+            server side.
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param query: the native query
+            :return: the number of data sets
+
+            .. versionadded:: 3.1
+        """
+        return len(self.query(metadata, query, {'_fields': {'_id': True}}))
+
+    def exists(self, metadata, query):
+        """ Low-level function to check if any data set matches the query
+
+            The default implementation falls back to ``query`` with the limit
+            of one object ID.
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param query: the native query
+            :rtype: bool
+
+            .. versionadded:: 3.1
+        """
+        return len(self.query(metadata, query, {'limit': 1, '_fields': {'_id': True}})) > 0
+
+    def estimated_size(self, metadata):
+        """ Low-level function to estimate the number of data sets in the collection
+
+            The default implementation counts the whole collection. Drivers
+            should override this method to use the metadata of the collection.
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :return: the (approximate) number of data sets
+
+            .. versionadded:: 3.1
+        """
+        return self.count(metadata, {})
+
+    def aggregate(self, metadata, native_aggregation):
+        """ Low-level function to run the aggregation on the server side
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param native_aggregation: the native aggregation (see
+                                       :meth:`DialectInterface.get_aggregation_pipeline`)
+            :return: the list of the resulting rows
+
+            :raise NotImplemented: only if the interface is not overridden.
+
+            .. versionadded:: 3.1
+        """
+        raise NotImplemented()
+
+    def explain(self, collection_name, native_query, iterating_constrains=None):
+        """ Low-level function to retrieve the execution plan of a native query
+
+            The default implementation returns ``None`` (unsupported).
+
+            :param str  collection_name:      the name of the collection
+            :param      native_query:         the native query
+            :param dict iterating_constrains: the iterating constrains used
+                                              with the query (e.g., sorting,
+                                              pagination and projection)
+            :return: the execution plan or ``None``
+
+            .. versionadded:: 3.1
+        """
+        return None
+
     def connect(self, config):
         """ Connect the client to the server.
 
@@ -234,4 +494,114 @@ class DriverInterface(object):
             :raise NotImplemented: only if the interface is not overridden.
         """
 
-        raise NotImplemented()
\ No newline at end of file
+        raise NotImplemented()
+
+
+class AsyncDriverInterface(DriverInterface):
+    """ The abstract asynchronous driver interface
+
+        In addition to the synchronous API of :class:`DriverInterface`, an
+        asynchronous driver provides the non-blocking counterparts of the
+        operations used by :class:`tori.db.session.Session` to query and flush.
+        Every asynchronous method returns a future (compatible with
+        :mod:`tornado.gen` and :mod:`asyncio`).
+
+        :param dict config: the configuration used to initialize the database connection / client
+        :param tori.db.driver.interface.DialectInterface dialect: the corresponding dialect
+
+        .. versionadded:: 3.1
+    """
+    def find_one_async(self, collection_name, criteria, fields=None):
+        """ Low-level asynchronous function to find one data set
+
+            :param str  collection_name: the name of the collection
+            :param dict criteria:        the native criteria
+            :param list fields:          the list of required fields
+            :return: the future of the data set or ``None``
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+    def query_async(self, metadata, query, iterating_constrains):
+        """ Low-level asynchronous function to find the data sets
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param query: the native query
+            :param dict iterating_constrains: the iterating constrains
+            :return: the future of the list of data sets
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+    def count_async(self, metadata, query):
+        """ Low-level asynchronous function to count the data sets
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param query: the native query
+            :return: the future of the number of data sets
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+    def aggregate_async(self, metadata, native_aggregation):
+        """ Low-level asynchronous function to run the aggregation on the server side
+
+            :param metadata: the metadata of the target collection / repository
+            :type  metadata: tori.db.metadata.entity.EntityMetadata
+            :param native_aggregation: the native aggregation
+            :return: the future of the list of the resulting rows
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+    def insert_many_async(self, collection_name, data_list):
+        """ Low-level asynchronous bulk insert function
+
+            :param str  collection_name: the name of the collection
+            :param list data_list:       the list of inserting data
+            :return: the future of the list of object IDs in the same order as
+                     ``data_list``
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+    def update_many_async(self, collection_name, update_list):
+        """ Low-level asynchronous bulk update function
+
+            :param str  collection_name: the name of the collection
+            :param list update_list:     the list of tuples of the criteria and
+                                         the updating data
+            :return: the future of the completion
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+    def remove_async(self, collection_name, criteria):
+        """ Low-level asynchronous removal function
+
+            :param str  collection_name: the name of the collection
+            :param dict criteria:        the native criteria
+            :return: the future of the completion
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+    def remove_many_async(self, collection_name, object_id_list):
+        """ Low-level asynchronous bulk removal function
+
+            :param str  collection_name: the name of the collection
+            :param list object_id_list:  the list of object IDs
+            :return: the future of the completion
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
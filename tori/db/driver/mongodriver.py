@@ -1,5 +1,8 @@
 import re
+import pymongo
+from bson.son import SON
 from pymongo import MongoClient
+from tori.db.criteria import Aggregate
 from tori.db.driver.interface import DriverInterface, QueryIteration, QuerySequence, DialectInterface
 from tori.db.entity import Index
 from tori.db.expression import Criteria, ExpressionOperand, ExpressionType, InvalidExpressionError as InvalidExpressionErrorBase
@@ -95,23 +98,170 @@ class Dialect(DialectInterface):
             self._OP_IN: joined_keys
         }
 
+    def process_seek_conditions(self, native_query, seek_order, keyset):
+        branch_list = []
+
+        # Either the first different sorting field is beyond the keyset or
+        # all preceding fields are equal to the keyset.
+        for index in range(len(seek_order)):
+            field, direction = seek_order[index]
+            value            = keyset[index]
+            ascending        = direction == pymongo.ASCENDING
+
+            # The values are always compared with $eq so that they are never
+            # interpreted as the query operators.
+            equal_conditions = dict([
+                (seek_order[preceding_index][0], {'$eq': keyset[preceding_index]})
+                for preceding_index in range(index)
+            ])
+
+            # The range operators never match null, which sorts lowest.
+            if value is None:
+                range_condition_list = [{'$ne': None}] if ascending else []
+            elif ascending:
+                range_condition_list = [{'$gt': value}]
+            else:
+                range_condition_list = [{'$lt': value}, None]
+
+            for range_condition in range_condition_list:
+                branch = dict(equal_conditions)
+
+                branch[field] = range_condition
+
+                branch_list.append(branch)
+
+        seek_condition = branch_list[0] if len(branch_list) == 1 else {'$or': branch_list}
+
+        if not native_query:
+            return seek_condition
+
+        return {'$and': [native_query, seek_condition]}
+
+    def get_union_query(self, native_query_list):
+        if len(native_query_list) == 1:
+            return native_query_list[0]
+
+        return {'$or': list(native_query_list)}
+
+    def get_aggregation_pipeline(self, native_query_list, query):
+        pipeline   = []
+        group      = {'_id': dict([(name, '$' + self._get_field(name)) for name in query.group_list]) or None}
+        projection = {'_id': False}
+
+        # The chunks of the joined keys may overlap. Each document is only matched once.
+        native_query = self.get_union_query(native_query_list)
+
+        if native_query:
+            pipeline.append({'$match': native_query})
+
+        for name in query.group_list:
+            projection[name] = '$_id.' + name
+
+        for name, function, property_name in query.aggregate_list:
+            group[name] = {'$sum': 1} \
+                if function == Aggregate.COUNT \
+                else {'$' + function: '$' + self._get_field(property_name)}
+
+            projection[name] = True
+
+        pipeline.append({'$group': group})
+        pipeline.append({'$project': projection})
+
+        having_list = []
+
+        for name, operand, value in query.having_list:
+            native_operand = self.get_native_operand(operand)
+
+            having_list.append({name: value if native_operand is None else {native_operand: value}})
+
+        if having_list:
+            pipeline.append({'$match': having_list[0] if len(having_list) == 1 else {'$and': having_list}})
+
+        # The sorting and pagination apply to the rows.
+        if query._order_by:
+            pipeline.append({'$sort': SON(query._order_by)})
+
+        if query._offset and query._offset > 0:
+            pipeline.append({'$skip': query._offset})
+
+        if query._limit and query._limit > 0:
+            pipeline.append({'$limit': query._limit})
+
+        return pipeline
+
+    def _get_field(self, property_name):
+        return '_id' if property_name == 'id' else property_name
+
     def get_iterating_constrains(self, query):
         option_map = {}
 
         if query._force_loading:
             option_map['_force_loading'] = query._force_loading # applicable only to MongoDB
 
-        if query._order_by:
+        if query.projection:
+            option_map['_fields'] = query.projection
+
+        if query.seek:
+            option_map['sort'] = query.seek_order
+        elif query._order_by:
             option_map['sort'] = query._order_by
 
         if query._offset and query._offset > 0:
-            option_map['skip'] = self._offset
+            option_map['skip'] = query._offset
 
         if query._limit and query._limit > 0:
             option_map['limit'] = query._limit
 
         return option_map
 
+    def get_chunk_constrains(self, constrains):
+        chunk_constrains = dict(constrains)
+
+        # The documents are only sorted across the chunks if they are fully loaded.
+        if 'sort' in chunk_constrains:
+            chunk_constrains['_force_loading'] = True
+
+        # The offset is only applicable to the merged result.
+        offset = chunk_constrains.pop('skip', 0)
+
+        if 'limit' in chunk_constrains:
+            chunk_constrains['limit'] += offset
+
+        return chunk_constrains
+
+    def merge_chunk_results(self, result_lists, constrains):
+        result_list = []
+        known_ids   = set()
+
+        for data_set in result_lists:
+            for data in data_set:
+                if data['_id'] in known_ids:
+                    continue
+
+                known_ids.add(data['_id'])
+                result_list.append(data)
+
+        # As the sorting is stable, the least significant key is sorted first.
+        for field, direction in reversed(constrains.get('sort', [])):
+            result_list.sort(
+                key     = lambda data: self._get_sorting_key(data, field),
+                reverse = direction == pymongo.DESCENDING
+            )
+
+        offset = constrains.get('skip', 0)
+        limit  = constrains.get('limit', 0)
+
+        return result_list[offset:offset + limit] if limit else result_list[offset:]
+
+    def _get_sorting_key(self, data, field):
+        value = data
+
+        for key in field.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+
+        # The missing values come first in the ascending order like MongoDB.
+        return (0, None) if value is None else (1, value)
+
 class Driver(DriverInterface):
     def __init__(self, config, dialect = Dialect()):
         super(Driver, self).__init__(config, dialect)
@@ -174,8 +324,55 @@ class Driver(DriverInterface):
 
     def remove(self, collection_name, criteria):
         api = self.collection(collection_name)
+
+        # The removal API is replaced since PyMongo 3.0 and removed in PyMongo 4.0.
+        if hasattr(api, 'delete_many'):
+            return api.delete_many(criteria)
+
         return api.remove(criteria)
 
+    def insert_many(self, collection_name, data_list):
+        if not data_list:
+            return []
+
+        api = self.collection(collection_name)
+
+        # The bulk insertion API is replaced since PyMongo 3.0 and removed in PyMongo 4.0.
+        if hasattr(api, 'insert_many'):
+            return api.insert_many(data_list).inserted_ids
+
+        return api.insert(data_list)
+
+    def update_many(self, collection_name, update_list):
+        if not update_list:
+            return
+
+        api = self.collection(collection_name)
+
+        # The bulk write API is available since PyMongo 3.0 and the only one since PyMongo 4.0.
+        if hasattr(api, 'bulk_write'):
+            return api.bulk_write(
+                [pymongo.UpdateOne(criteria, new) for criteria, new in update_list],
+                ordered = False
+            )
+
+        # The bulk operation is only available since PyMongo 2.7.
+        if not hasattr(api, 'initialize_unordered_bulk_op'):
+            return super(Driver, self).update_many(collection_name, update_list)
+
+        bulk = api.initialize_unordered_bulk_op()
+
+        for criteria, new in update_list:
+            bulk.find(criteria).update_one(new)
+
+        return bulk.execute()
+
+    def remove_many(self, collection_name, object_id_list):
+        if not object_id_list:
+            return
+
+        return self.remove(collection_name, {'_id': {'$in': list(object_id_list)}})
+
     def find_one(self, collection_name, criteria, fields=None):
         api = self.collection(collection_name)
 
@@ -206,14 +403,68 @@ class Driver(DriverInterface):
             :param query: the native query
             :param iterating_constrains: the iterating constrains
         """
+        return [data for data in self._cursor(metadata.collection_name, query, iterating_constrains)]
+
+    def count(self, metadata, query):
+        api = self.collection(metadata.collection_name)
+
+        # The server-side count of the matching documents is only available since PyMongo 3.7.
+        if not hasattr(api, 'count_documents'):
+            return api.find(query).count()
+
+        return api.count_documents(query)
+
+    def exists(self, metadata, query):
+        return self.find_one(metadata.collection_name, query, {'_id': True}) is not None
+
+    def estimated_size(self, metadata):
+        api = self.collection(metadata.collection_name)
+
+        # The collection metadata is only used since PyMongo 3.7.
+        if not hasattr(api, 'estimated_document_count'):
+            return api.count()
+
+        return api.estimated_document_count()
 
-        collection_name = metadata.collection_name
-        force_loading   = iterating_constrains['_force_loading'] if '_force_loading' in iterating_constrains else False
+    def iterate(self, metadata, query, iterating_constrains, batch_size=None):
+        # The documents are always fully loaded as they are streamed anyway.
+        cursor = self._cursor(metadata.collection_name, query, iterating_constrains, True)
 
-        cursor = self.find(collection_name, query)
+        if batch_size:
+            cursor.batch_size(batch_size)
 
-        if not force_loading and 'limit' in iterating_constrains and iterating_constrains['limit'] != 1:
+        for data in cursor:
+            yield data
+
+    def aggregate(self, metadata, pipeline):
+        result = self.collection(metadata.collection_name).aggregate(pipeline)
+
+        # PyMongo 2.x returns the whole response instead of a cursor.
+        if isinstance(result, dict):
+            return result['result']
+
+        return [row for row in result]
+
+    def explain(self, collection_name, native_query, iterating_constrains=None):
+        # Only the plans of the native queries (not the session-level queries or the pipelines) are available.
+        if not isinstance(native_query, dict):
+            return None
+
+        # The plan reflects the actual sorting, pagination and projection.
+        return self._cursor(collection_name, native_query, iterating_constrains or {}).explain()
+
+    def _cursor(self, collection_name, query, iterating_constrains, force_loading=False):
+        fields = iterating_constrains['_fields'] if '_fields' in iterating_constrains else None
+
+        if not force_loading and '_force_loading' in iterating_constrains:
+            force_loading = iterating_constrains['_force_loading']
+
+        if fields:
+            cursor = self.find(collection_name, query, fields=fields)
+        elif not force_loading and 'limit' in iterating_constrains and iterating_constrains['limit'] != 1:
             cursor = self.find(collection_name, query, fields=[])
+        else:
+            cursor = self.find(collection_name, query)
 
         for constrain in iterating_constrains:
             if '_' == constrain[0]:
@@ -221,7 +472,7 @@ class Driver(DriverInterface):
 
             cursor.__getattribute__(constrain)(iterating_constrains[constrain])
 
-        return [data for data in cursor]
+        return cursor
 
     def indice(self):
         return [index for index in self.collection('system.indexes').find()]
@@ -0,0 +1,141 @@
+""" Asynchronous MongoDB Driver
+
+    This driver requires **Motor** (the asynchronous MongoDB driver for
+    Tornado and :mod:`asyncio`). The synchronous API is inherited from
+    :class:`tori.db.driver.mongodriver.Driver` and shares the configuration.
+
+    .. versionadded:: 3.1
+"""
+from tornado import gen
+from pymongo import UpdateOne
+from tori.db.driver.interface import AsyncDriverInterface
+from tori.db.driver.mongodriver import Driver as MongoDriver, Dialect
+
+class Driver(MongoDriver, AsyncDriverInterface):
+    """ Asynchronous MongoDB driver
+
+        :param config: the configuration map or the URL (shared by both clients)
+        :param tori.db.driver.mongodriver.Dialect dialect: the dialect
+
+        .. warning::
+
+            Only the ``*_async`` methods use the Motor client. The inherited
+            synchronous methods, e.g., :meth:`find_one`, :meth:`query` or
+            :meth:`insert_many`, still send the blocking requests with a
+            separate PyMongo client, which is connected on the first use.
+            Calling them (or the synchronous methods of the session, such as
+            :meth:`tori.db.session.Session.flush`) from a coroutine blocks
+            the IO loop until the server responds. Use the asynchronous
+            counterparts, such as :meth:`tori.db.session.Session.flush_async`,
+            on the IO loop.
+    """
+    def __init__(self, config, dialect = Dialect()):
+        super(Driver, self).__init__(config, dialect)
+
+        self._async_client = None
+
+    @property
+    def async_client(self):
+        """ Asynchronous Client (lazily connected) """
+        if not self._async_client:
+            self.connect_async()
+
+        return self._async_client
+
+    def connect_async(self):
+        if self._async_client:
+            return
+
+        from motor.motor_tornado import MotorClient
+
+        config = self.config
+
+        if isinstance(config, dict):
+            self._async_client = MotorClient(**config) # as a config map
+
+            return
+
+        self._async_client = MotorClient(config) # as an URL
+
+    def disconnect(self):
+        if self._async_client:
+            self._async_client.close()
+
+            self._async_client = None
+
+        if self.client:
+            super(Driver, self).disconnect()
+
+    def async_collection(self, name):
+        return self.async_client[self.database_name][name]
+
+    def find_one_async(self, collection_name, criteria, fields=None):
+        api = self.async_collection(collection_name)
+
+        if fields:
+            return api.find_one(criteria, fields)
+
+        return api.find_one(criteria)
+
+    @gen.coroutine
+    def query_async(self, metadata, query, iterating_constrains):
+        api           = self.async_collection(metadata.collection_name)
+        force_loading = iterating_constrains['_force_loading'] if '_force_loading' in iterating_constrains else False
+        fields        = iterating_constrains['_fields'] if '_fields' in iterating_constrains else None
+
+        # Only the object IDs are loaded for the unforced multiple results (same as the synchronous driver).
+        if fields:
+            cursor = api.find(query, fields)
+        elif force_loading or 'limit' not in iterating_constrains or iterating_constrains['limit'] == 1:
+            cursor = api.find(query)
+        else:
+            cursor = api.find(query, {'_id': True})
+
+        for constrain in iterating_constrains:
+            if '_' == constrain[0]:
+                continue
+
+            cursor.__getattribute__(constrain)(iterating_constrains[constrain])
+
+        result_list = yield cursor.to_list(length=None)
+
+        raise gen.Return(result_list)
+
+    def count_async(self, metadata, query):
+        return self.async_collection(metadata.collection_name).count_documents(query)
+
+    @gen.coroutine
+    def aggregate_async(self, metadata, pipeline):
+        cursor   = self.async_collection(metadata.collection_name).aggregate(pipeline)
+        row_list = yield cursor.to_list(length=None)
+
+        raise gen.Return(row_list)
+
+    @gen.coroutine
+    def insert_many_async(self, collection_name, data_list):
+        if not data_list:
+            raise gen.Return([])
+
+        result = yield self.async_collection(collection_name).insert_many(data_list)
+
+        raise gen.Return(result.inserted_ids)
+
+    @gen.coroutine
+    def update_many_async(self, collection_name, update_list):
+        if not update_list:
+            return
+
+        yield self.async_collection(collection_name).bulk_write(
+            [UpdateOne(criteria, new) for criteria, new in update_list],
+            ordered = False
+        )
+
+    def remove_async(self, collection_name, criteria):
+        return self.async_collection(collection_name).delete_many(criteria)
+
+    @gen.coroutine
+    def remove_many_async(self, collection_name, object_id_list):
+        if not object_id_list:
+            return
+
+        yield self.async_collection(collection_name).delete_many({'_id': {'$in': list(object_id_list)}})
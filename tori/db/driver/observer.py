@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+:mod:`tori.db.driver.observer` -- Query Observers
+=================================================
+
+.. module:: tori.db.driver.observer
+   :platform: All
+   :synopsis: The statistics of the queries sent to the backend datastore
+
+The observers are attached to a driver with
+:meth:`tori.db.driver.interface.DriverInterface.add_observer` and are notified
+of every query of the sessions using the driver. For example,
+
+.. code-block:: python
+
+    slow_query_log = SlowQueryLog(threshold = 0.2, explain = True)
+
+    driver.add_observer(slow_query_log)
+
+Each session also aggregates the statistics of its own queries (see
+:attr:`tori.db.session.Session.query_stats`), which are the per-request
+statistics of a web application opening one session per request.
+
+.. versionadded:: 3.1
+"""
+from collections import deque
+from threading   import Lock
+from time        import time
+from tori.common import get_logger
+
+class QueryStats(object):
+    """ Statistics of a Query
+
+        :param operation: the operation, i.e., ``find_one`` or ``query`` for
+                          a driver call or ``session.query`` for a whole query
+                          of a session, including the joins
+        :type  operation: str
+        :param collection_name: the name of the collection
+        :type  collection_name: str
+        :param native_query: the native query (or the original query of
+                             ``session.query``)
+        :param alias: the alias of the queried entities
+        :type  alias: str
+        :param constrains: the iterating constrains of the native query, e.g.,
+                           the sorting, pagination and projection (see
+                           :meth:`tori.db.driver.interface.DialectInterface.get_iterating_constrains`)
+        :type  constrains: dict
+
+        The query is timed from the creation of the statistics. Call
+        :meth:`queried` once the data sets are returned and :meth:`hydrated`
+        once the entities are built.
+    """
+    def __init__(self, operation, collection_name, native_query, alias=None, constrains=None):
+        self.operation       = operation
+        self.collection_name = collection_name
+        self.native_query    = native_query
+        self.alias           = alias
+        self.constrains      = constrains
+        self.started_at      = time()
+        self.duration        = None # the time spent by the backend datastore in seconds
+        self.document_count  = None
+        self.hydration_time  = None # the time spent to build the entities in seconds
+
+        self._queried_at = None
+
+    def queried(self, document_count, duration=None):
+        """ Mark the data sets as returned
+
+            :param document_count: the number of returned documents
+            :type  document_count: int
+            :param duration: the time spent by the backend datastore (``None``
+                             for the time since the creation), e.g., excluding
+                             the time spent by the consumer of a stream
+            :type  duration: float
+        """
+        self._queried_at    = time()
+        self.duration       = self._queried_at - self.started_at if duration is None else duration
+        self.document_count = document_count
+
+    def hydrated(self):
+        """ Mark the entities as built """
+        self.hydration_time = time() - self._queried_at
+
+    def to_dict(self):
+        return {
+            'operation':       self.operation,
+            'collection_name': self.collection_name,
+            'native_query':    self.native_query,
+            'alias':           self.alias,
+            'constrains':      self.constrains,
+            'duration':        self.duration,
+            'document_count':  self.document_count,
+            'hydration_time':  self.hydration_time
+        }
+
+class QueryObserver(object):
+    """ Query Observer Interface """
+    def on_query(self, driver, stats):
+        """ Handle the statistics of a query
+
+            :param driver: the driver
+            :type  driver: tori.db.driver.interface.DriverInterface
+            :param stats: the statistics of the query
+            :type  stats: QueryStats
+
+            This method may be called by several threads at once (see
+            :class:`tori.db.session.JoinExecutor`).
+
+            :raise NotImplemented: only if the interface is not overridden.
+        """
+        raise NotImplemented()
+
+class QueryStatsCollector(QueryObserver):
+    """ Aggregated Query Statistics
+
+        The statistics are aggregated per operation and collection.
+    """
+    def __init__(self):
+        self._lock          = Lock()
+        self._aggregate_map = {} # (operation, collection name) => aggregate
+
+    def on_query(self, driver, stats):
+        key = (stats.operation, stats.collection_name)
+
+        with self._lock:
+            if key not in self._aggregate_map:
+                self._aggregate_map[key] = {
+                    'operation':       stats.operation,
+                    'collection_name': stats.collection_name,
+                    'count':           0,
+                    'total_duration':  0.0,
+                    'max_duration':    0.0,
+                    'document_count':  0,
+                    'hydration_time':  0.0
+                }
+
+            aggregate = self._aggregate_map[key]
+
+            aggregate['count']          += 1
+            aggregate['total_duration'] += stats.duration
+            aggregate['max_duration']    = max(aggregate['max_duration'], stats.duration)
+            aggregate['document_count'] += stats.document_count
+            aggregate['hydration_time'] += stats.hydration_time or 0.0
+
+    def aggregates(self):
+        """ Retrieve the aggregates
+
+            :return: the list of the aggregates, the slowest first
+            :rtype: list
+        """
+        with self._lock:
+            aggregate_list = [dict(aggregate) for aggregate in self._aggregate_map.values()]
+
+        aggregate_list.sort(key = lambda aggregate: aggregate['total_duration'], reverse = True)
+
+        return aggregate_list
+
+    def reset(self):
+        """ Remove all statistics """
+        with self._lock:
+            self._aggregate_map = {}
+
+    def to_dict(self):
+        aggregate_list = self.aggregates()
+
+        # The session-level queries are not added to the total as their driver calls are counted already.
+        driver_aggregate_list = [
+            aggregate
+            for aggregate in aggregate_list
+            if aggregate['operation'] != 'session.query'
+        ]
+
+        return {
+            'query_count':    sum([aggregate['count'] for aggregate in driver_aggregate_list]),
+            'total_duration': sum([aggregate['total_duration'] for aggregate in driver_aggregate_list]),
+            'document_count': sum([aggregate['document_count'] for aggregate in driver_aggregate_list]),
+            'hydration_time': sum([aggregate['hydration_time'] for aggregate in aggregate_list]),
+            'aggregates':     aggregate_list
+        }
+
+class SlowQueryLog(QueryObserver):
+    """ Slow Query Log
+
+        :param threshold: the minimum duration of a slow query in seconds
+        :type  threshold: float
+        :param explain: the flag to capture the execution plan of the slow
+                        driver calls (see
+                        :meth:`tori.db.driver.interface.DriverInterface.explain`)
+        :type  explain: bool
+        :param max_size: the maximum number of kept entries
+        :type  max_size: int
+        :param logger: the logger (``None`` for the default logger)
+        :type  logger: logging.Logger
+
+        The slow queries are logged as warnings and the latest entries are
+        kept in :attr:`entries`.
+    """
+    def __init__(self, threshold=0.1, explain=False, max_size=100, logger=None):
+        self.threshold = threshold
+        self.explain   = explain
+
+        self._logger  = logger or get_logger('{}.SlowQueryLog'.format(__name__))
+        self._lock    = Lock()
+        self._entries = deque(maxlen=max_size)
+
+    @property
+    def entries(self):
+        """ The list of the latest slow queries, each of which is the
+            dictionary of the statistics with the execution plan (``explain``)
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def on_query(self, driver, stats):
+        if stats.duration < self.threshold:
+            return
+
+        entry = stats.to_dict()
+
+        entry['explain'] = None
+
+        if self.explain and stats.operation != 'session.query':
+            entry['explain'] = driver.explain(stats.collection_name, stats.native_query, stats.constrains)
+
+        with self._lock:
+            self._entries.append(entry)
+
+        self._logger.warning(
+            'Slow %s on %s (%.3f s, %d documents): %s %s',
+            stats.operation,
+            stats.collection_name,
+            stats.duration,
+            stats.document_count,
+            stats.native_query,
+            stats.constrains or ''
+        )
+
+    def clear(self):
+        """ Remove all entries """
+        with self._lock:
+            self._entries.clear()
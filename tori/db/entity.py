@@ -3,6 +3,7 @@
 """
 import inspect
 from imagination.decorator.validator import restrict_type
+from tori.db.cache     import CachePolicy
 from tori.db.common    import PseudoObjectId
 from tori.db.exception import LockedIdException
 from tori.db.metadata.helper import EntityMetadataHelper
@@ -39,7 +40,7 @@ def entity(*args, **kwargs):
 
     return decorator
 
-def prepare_entity_class(cls, collection_name=None, indexes=[]):
+def prepare_entity_class(cls, collection_name=None, indexes=[], change_tracking=False, deferred_fields=[], cache=None):
     """ Create a entity class
 
     :param cls: the document class
@@ -48,6 +49,16 @@ def prepare_entity_class(cls, collection_name=None, indexes=[]):
                             default is the lowercase version of the name of the
                             given class (cls)
     :type  collection_name: str
+    :param change_tracking: the flag to enable the property change tracking
+                            (see :class:`ChangeTracker`)
+    :type  change_tracking: bool
+    :param deferred_fields: the names of the fields which are not loaded with
+                            the entity but on first access (see
+                            :class:`DeferredFieldLoader`)
+    :type  deferred_fields: list
+    :param cache: the policy of the second-level cache (``True`` for the
+                  default policy, see :class:`tori.db.cache.EntityCache`)
+    :type  cache: tori.db.cache.CachePolicy or bool
 
     The object decorated with this decorator will be automatically provided with
     a few additional attributes.
@@ -97,6 +108,20 @@ def prepare_entity_class(cls, collection_name=None, indexes=[]):
     .. tip::
 
         You can define it as "notes" by replacing ``@entity`` with ``@entity('notes')``.
+
+    .. versionadded:: 3.1
+
+        With ``@entity('notes', change_tracking=True)``, the unit of work only
+        computes the changes of the properties re-assigned since the entity was
+        loaded or flushed, instead of comparing the whole entity with its
+        snapshot.
+
+        With ``@entity('notes', deferred_fields=['content'])``, the content
+        of the notes is only loaded when it is accessed for the first time.
+
+        With ``@entity('countries', cache=CachePolicy(ttl=3600))``, the
+        documents of the countries are shared by all sessions of the entity
+        manager and only requested from the backend datastore once an hour.
     """
     if not cls:
         raise ValueError('Expecting a valid type')
@@ -121,11 +146,19 @@ def prepare_entity_class(cls, collection_name=None, indexes=[]):
     EntityMetadataHelper.imprint(
         cls,
         collection_name or cls.__name__.lower(),
-        indexes
+        indexes,
+        change_tracking,
+        deferred_fields,
+        CachePolicy() if cache is True else (cache or None)
     )
 
     cls.id = property(get_id, set_id)
 
+    if change_tracking:
+        ChangeTracker.install(cls)
+
+    DeferredFieldLoader.install(cls)
+
     return cls
 
 class Entity(object):
@@ -146,6 +179,249 @@ class Entity(object):
         for name in attributes:
             self.__setattr__(name, attributes[name])
 
+class ChangeTracker(object):
+    """ Property Change Tracker
+
+        This tracker records the name of every property re-assigned or deleted
+        on an entity whose class is decorated with ``change_tracking=True``.
+        The unit of work then only encodes the recorded properties on flush and
+        does not need to keep the snapshot of the whole entity.
+
+        .. warning::
+
+            In-place modifications, such as appending an item to a list, are
+            not detectable. Either re-assign the property or call
+            :meth:`ChangeTracker.mark` on the entity.
+
+        .. versionadded:: 3.1
+    """
+    attribute_name = '__t3_changes__'
+
+    @staticmethod
+    def install(cls):
+        """ Install the attribute hooks on the entity class
+
+            :param cls: the entity class
+            :type  cls: type
+        """
+        original_setattr = cls.__setattr__
+        original_delattr = cls.__delattr__
+
+        def tracked_setattr(self, name, value):
+            original_setattr(self, name, value)
+            ChangeTracker.mark(self, name)
+
+        def tracked_delattr(self, name):
+            original_delattr(self, name)
+            ChangeTracker.mark(self, name)
+
+        cls.__setattr__ = tracked_setattr
+        cls.__delattr__ = tracked_delattr
+
+    @staticmethod
+    def enabled(entity):
+        """ Check if the change tracking is enabled for the entity
+
+            :param entity: the entity or entity class
+            :rtype: bool
+        """
+        return EntityMetadataHelper.extract(entity).change_tracking
+
+    @staticmethod
+    def mark(entity, *property_names):
+        """ Mark the properties of the entity as changed
+
+            :param entity: the entity
+            :param property_names: the names of changed properties
+        """
+        changes = entity.__dict__.get(ChangeTracker.attribute_name)
+
+        if changes is None:
+            changes = entity.__dict__[ChangeTracker.attribute_name] = set()
+
+        for name in property_names:
+            if name[0] == '_' or name == 'id':
+                continue
+
+            changes.add(name)
+
+    @staticmethod
+    def changes(entity):
+        """ Retrieve the names of changed properties
+
+            :param entity: the entity
+            :rtype: set
+        """
+        return entity.__dict__.get(ChangeTracker.attribute_name) or set()
+
+    @staticmethod
+    def reset(entity):
+        """ Forget all recorded changes of the entity
+
+            :param entity: the entity
+        """
+        entity.__dict__[ChangeTracker.attribute_name] = set()
+
+class DeferredFieldLoader(object):
+    """ Deferred Field Loader
+
+        An entity loaded with a projection, i.e., with
+        :meth:`tori.db.criteria.Query.select` or with the deferred fields of
+        its class, only has the loaded fields. The first access to any of the
+        other fields loads all of them with one query through the session of
+        the entity.
+
+        The unloaded fields are not part of the snapshot of the entity. Hence,
+        they are considered unchanged until they are assigned.
+
+        The projection is a map of the field names to the flags whether the
+        fields are loaded, e.g., ``{'title': True}`` loads only the title and
+        ``{'content': False}`` loads everything but the content.
+
+        .. versionadded:: 3.1
+    """
+    attribute_name = '__t3_projection__'
+
+    @staticmethod
+    def install(cls):
+        """ Install the attribute hook on the entity class
+
+            The hook is only called when the attribute is not found.
+
+            :param cls: the entity class
+            :type  cls: type
+        """
+        original_getattr = getattr(cls, '__getattr__', None)
+
+        def deferred_getattr(self, name):
+            if name[0] != '_' and DeferredFieldLoader.is_deferred(self, name):
+                self.__session__.load_deferred_fields(self)
+
+                return getattr(self, name)
+
+            if original_getattr:
+                return original_getattr(self, name)
+
+            raise AttributeError('{} has no attribute {}.'.format(type(self).__name__, name))
+
+        cls.__getattr__ = deferred_getattr
+
+    @staticmethod
+    def defer(entity, projection, data):
+        """ Remove the unloaded fields from the newly loaded entity
+
+            :param entity: the entity
+            :param projection: the projection used to load the data
+            :type  projection: dict
+            :param data: the loaded data
+            :type  data: dict
+        """
+        entity.__dict__[DeferredFieldLoader.attribute_name] = (projection, {})
+
+        default_map = entity.__dict__[DeferredFieldLoader.attribute_name][1]
+
+        for name in list(entity.__dict__.keys()):
+            if name[0] == '_' or name == 'id' or name in data or DeferredFieldLoader._is_loaded(projection, name):
+                continue
+
+            # The values assigned by the constructor are restored if the fields do not exist.
+            default_map[name] = entity.__dict__[name]
+
+            del entity.__dict__[name]
+
+    @staticmethod
+    def is_deferred(entity, name):
+        """ Check if the field of the entity is not loaded
+
+            :param entity: the entity
+            :param name: the name of the field
+            :rtype: bool
+        """
+        pending = entity.__dict__.get(DeferredFieldLoader.attribute_name)
+
+        if not pending or name in entity.__dict__:
+            return False
+
+        return not DeferredFieldLoader._is_loaded(pending[0], name)
+
+    @staticmethod
+    def _is_loaded(projection, name):
+        if name in projection:
+            return projection[name]
+
+        # With the inclusive projection, the other fields are not loaded.
+        return not any(projection.values())
+
+    @staticmethod
+    def remaining_projection(entity):
+        """ Retrieve the projection to load the unloaded fields of the entity
+
+            :param entity: the entity
+            :return: the projection or ``None`` if the entity is fully loaded
+            :rtype: dict
+        """
+        pending = entity.__dict__.get(DeferredFieldLoader.attribute_name)
+
+        if not pending:
+            return None
+
+        projection = pending[0]
+
+        if any(projection.values()):
+            return dict([(name, False) for name in projection if projection[name] and name != '_id'])
+
+        return dict([(name, True) for name in projection])
+
+    @staticmethod
+    def complete(entity, data):
+        """ Fill the unloaded fields of the entity
+
+            The fields assigned since the entity was loaded are kept.
+
+            :param entity: the entity
+            :param data: the data of the unloaded fields
+            :type  data: dict
+            :return: the names of the filled fields
+            :rtype: list
+        """
+        pending = entity.__dict__.get(DeferredFieldLoader.attribute_name)
+
+        if not pending:
+            return []
+
+        filled_name_list = []
+
+        for name in data:
+            if name == '_id' or not DeferredFieldLoader.is_deferred(entity, name):
+                continue
+
+            entity.__dict__[name] = data[name]
+
+            filled_name_list.append(name)
+
+        default_map = pending[1]
+
+        for name in default_map:
+            if not DeferredFieldLoader.is_deferred(entity, name):
+                continue
+
+            entity.__dict__[name] = default_map[name]
+
+            filled_name_list.append(name)
+
+        DeferredFieldLoader.reset(entity)
+
+        return filled_name_list
+
+    @staticmethod
+    def reset(entity):
+        """ Consider the entity fully loaded
+
+            :param entity: the entity
+        """
+        if DeferredFieldLoader.attribute_name in entity.__dict__:
+            del entity.__dict__[DeferredFieldLoader.attribute_name]
+
 class Index(object):
     """ Index
 
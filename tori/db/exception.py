@@ -4,6 +4,9 @@ class UnsupportedRepositoryReferenceError(Exception):
 class UnknownDriverError(Exception):
     """ Unknown Driver Error """
 
+class UnsupportedDriverError(Exception):
+    """ Error raised when the driver does not support the requested operation """
+
 class InvalidUrlError(Exception):
     """ Invalid DB URL Error"""
 
@@ -28,6 +31,9 @@ class UOWUnknownRecordError(IOError):
 class UOWUpdateError(IOError):
     """ Error thrown when the given reference is already registered as a new reference or already existed. """
 
+class UOWCommitInProgressError(IOError):
+    """ Error thrown when the unit of work is modified or committed again while it is being committed. """
+
 class ReadOnlyProxyException(Exception):
     """ Exception raised when the proxy is for read only. """
 
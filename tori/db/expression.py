@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import json
 import re
+from collections import OrderedDict
+from threading   import Lock
 
 class InvalidExpressionError(Exception):
     """ Generic Invalid Expression Error """
@@ -103,31 +105,54 @@ class Criteria(object):
     """ Expression Criteria
 
         Support operands: =, <=, <, >, >=, in, like (SQL-like string pattern), rlike (Regular-expression pattern), indexed with (only for Riak)
+
+        .. versionchanged:: 3.1
+
+            The parsed expressions are cached per statement for the whole
+            process (up to :attr:`expression_cache_size` statements) and the
+            parameters stay symbolic until the query is executed. Hence, the
+            cached :class:`Expression` objects are shared and must not be
+            modified.
     """
+    expression_cache_size = 1024
+    """ The maximum number of the cached statements (``0`` to disable the cache) """
+
+    _expression_cache      = OrderedDict() # statement => expression (least recently used first)
+    _expression_cache_lock = Lock()
+
+    _re_parameter     = re.compile('^:[a-zA-Z0-9_]+$')
+    _re_root_path     = re.compile('^[a-zA-Z][a-zA-Z0-9_]*$')
+    _re_property_path = re.compile('^[a-zA-Z][a-zA-Z0-9_]*(\.[a-zA-Z][a-zA-Z0-9_]*)+$')
+    _re_statement     = re.compile(
+        '^\s*(?P<left>.+)\s+(?P<operand>{eq}|{ne}|{ge}|{gt}|{le}|{lt}|{xin}|{xnin}|{like}|{rlike}|{indexed})\s+(?P<right>.+)\s*$'.format(
+            eq = ExpressionOperand.OP_EQ,
+            ne = ExpressionOperand.OP_NE,
+            ge = ExpressionOperand.OP_GE,
+            gt = ExpressionOperand.OP_GT,
+            le = ExpressionOperand.OP_LE,
+            lt = ExpressionOperand.OP_LT,
+            xin  = ExpressionOperand.OP_IN,
+            xnin = ExpressionOperand.OP_NOT_IN,
+            like = ExpressionOperand.OP_SQL_LIKE,
+            rlike   = ExpressionOperand.OP_REGEXP_LIKE,
+            indexed = ExpressionOperand.OP_INDEX_SEARCH
+        )
+    )
+    _re_property_path_delimiter = re.compile('\.')
 
     def __init__(self):
         self._is_updated       = False
         self._sub_expressions  = []
         self._analyzed_map     = None
-        self._re_parameter     = re.compile('^:[a-zA-Z0-9_]+$')
-        self._re_root_path     = re.compile('^[a-zA-Z][a-zA-Z0-9_]*$')
-        self._re_property_path = re.compile('^[a-zA-Z][a-zA-Z0-9_]*(\.[a-zA-Z][a-zA-Z0-9_]*)+$')
-        self._re_statement     = re.compile(
-            '^\s*(?P<left>.+)\s+(?P<operand>{eq}|{ne}|{ge}|{gt}|{le}|{lt}|{xin}|{xnin}|{like}|{rlike}|{indexed})\s+(?P<right>.+)\s*$'.format(
-                eq = ExpressionOperand.OP_EQ,
-                ne = ExpressionOperand.OP_NE,
-                ge = ExpressionOperand.OP_GE,
-                gt = ExpressionOperand.OP_GT,
-                le = ExpressionOperand.OP_LE,
-                lt = ExpressionOperand.OP_LT,
-                xin  = ExpressionOperand.OP_IN,
-                xnin = ExpressionOperand.OP_NOT_IN,
-                like = ExpressionOperand.OP_SQL_LIKE,
-                rlike   = ExpressionOperand.OP_REGEXP_LIKE,
-                indexed = ExpressionOperand.OP_INDEX_SEARCH
-            )
-        )
-        self._re_property_path_delimiter = re.compile('\.')
+
+    @staticmethod
+    def clear_expression_cache():
+        """ Forget all cached expressions
+
+            .. versionadded:: 3.1
+        """
+        with Criteria._expression_cache_lock:
+            Criteria._expression_cache.clear()
 
     def get_analyzed_version(self):
         if self._is_updated:
@@ -144,6 +169,7 @@ class Criteria(object):
             raise InvalidExpressionError('There must be at least one property path. It is prone to query injection.')
 
         self._analyzed_map = analyzed_expression
+        self._is_updated   = True
 
         return self._analyzed_map
 
@@ -165,10 +191,44 @@ class Criteria(object):
     def expect(self, statement):
         self._is_updated = False
 
-        expr = self._compile(statement)
+        expr = self._cached_expression(statement)
+
+        if not expr:
+            expr = self._compile(statement)
+
+            self._cache_expression(statement, expr)
 
         self._sub_expressions.append(expr)
 
+    def _cached_expression(self, statement):
+        cache = Criteria._expression_cache
+
+        with Criteria._expression_cache_lock:
+            if statement not in cache:
+                return None
+
+            expr = cache[statement]
+
+            # Mark the statement as recently used.
+            del cache[statement]
+
+            cache[statement] = expr
+
+        return expr
+
+    def _cache_expression(self, statement, expr):
+        cache      = Criteria._expression_cache
+        cache_size = self.expression_cache_size
+
+        if not cache_size:
+            return
+
+        with Criteria._expression_cache_lock:
+            cache[statement] = expr
+
+            while len(cache) > cache_size:
+                cache.popitem(last=False)
+
     @property
     def _fixed_syntax_operands(self):
         return ('in', 'like', 'rlike', 'indexed with')
@@ -2,8 +2,9 @@ import re
 from bson.objectid import ObjectId
 from imagination.loader import Loader
 from imagination.decorator.validator import restrict_type
+from tori.db.cache import QueryCache, EntityCache
 from tori.db.driver.interface import DriverInterface
-from tori.db.session import Session
+from tori.db.session import Session, JoinExecutor
 from tori.db.exception import InvalidUrlError, UnknownDriverError
 
 class ManagerFactory(object):
@@ -74,13 +75,30 @@ class Manager(object):
 
         :param driver: the driver interface
         :type  driver: tori.db.driver.interface.DriverInterface
+        :param join_executor: the executor of the joined sub queries shared by the sessions
+        :type  join_executor: tori.db.session.JoinExecutor
+        :param query_cache: the query result cache shared by the sessions
+        :type  query_cache: tori.db.cache.QueryCache
+        :param entity_cache: the second-level entity cache shared by the sessions
+        :type  entity_cache: tori.db.cache.EntityCache
+
+        .. versionchanged:: 3.1
+
+            The sessions share the join executor which executes up to
+            ``max_join_workers`` independent sub queries concurrently, the
+            query result cache and the second-level entity cache.
     """
-    def __init__(self, driver):
+    max_join_workers = 4
+
+    def __init__(self, driver, join_executor=None, query_cache=None, entity_cache=None):
         assert isinstance(driver, DriverInterface) or issubclass(driver, DriverInterface), \
             'The given driver must implement DriverInterface, {} given.'.format(driver)
         self._driver      = driver
         self._session_map = {}
         self._driver      = driver
+        self._join_executor = join_executor or JoinExecutor(max_workers=self.max_join_workers)
+        self._query_cache   = query_cache or QueryCache()
+        self._entity_cache  = entity_cache or EntityCache()
 
     @property
     def driver(self):
@@ -90,6 +108,30 @@ class Manager(object):
         """
         return self._driver
 
+    @property
+    def join_executor(self):
+        """ The executor of the joined sub queries
+
+        :rtype: tori.db.session.JoinExecutor
+        """
+        return self._join_executor
+
+    @property
+    def query_cache(self):
+        """ The query result cache
+
+        :rtype: tori.db.cache.QueryCache
+        """
+        return self._query_cache
+
+    @property
+    def entity_cache(self):
+        """ The second-level entity cache
+
+        :rtype: tori.db.cache.EntityCache
+        """
+        return self._entity_cache
+
     def open_session(self, id=None, supervised=False):
         """ Open a session
 
@@ -102,7 +144,7 @@ class Manager(object):
             :type  supervised: bool
         """
         if not supervised:
-            return Session(self.driver)
+            return Session(self.driver, self._join_executor, self._query_cache, self._entity_cache)
 
         if not id:
             id = ObjectId()
@@ -110,7 +152,7 @@ class Manager(object):
         if id in self._session_map:
             return self._session_map[id]
 
-        session = Session(self.driver)
+        session = Session(self.driver, self._join_executor, self._query_cache, self._entity_cache)
 
         if supervised:
             self._session_map[id] = session
@@ -10,6 +10,9 @@ class EntityMetadata(object):
         self._collection_name = None
         self._index_list      = []
         self._relational_map  = {}
+        self._change_tracking = False
+        self._deferred_field_list = []
+        self._cache_policy        = None
 
     @property
     def cls(self):
@@ -44,6 +47,42 @@ class EntityMetadata(object):
 
         self._relational_map = value
 
+    @property
+    def change_tracking(self):
+        """ Change-tracking Flag """
+        return self._change_tracking
+
+    @change_tracking.setter
+    def change_tracking(self, value):
+        if self._change_tracking and self._locked:
+            raise ReadOnlyEntityMetadataException('The class metadata is read-only.')
+
+        self._change_tracking = value
+
+    @property
+    def deferred_field_list(self):
+        """ Deferred Field List """
+        return self._deferred_field_list
+
+    @deferred_field_list.setter
+    def deferred_field_list(self, value):
+        if self._deferred_field_list and self._locked:
+            raise ReadOnlyEntityMetadataException('The class metadata is read-only.')
+
+        self._deferred_field_list = value
+
+    @property
+    def cache_policy(self):
+        """ Second-level Cache Policy """
+        return self._cache_policy
+
+    @cache_policy.setter
+    def cache_policy(self, value):
+        if self._cache_policy and self._locked:
+            raise ReadOnlyEntityMetadataException('The class metadata is read-only.')
+
+        self._cache_policy = value
+
     @property
     def index_list(self):
         """ Index List """
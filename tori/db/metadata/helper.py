@@ -3,7 +3,7 @@ from tori.db.metadata.entity import EntityMetadata
 class EntityMetadataHelper(object):
     """ Entity Metadata Helper """
     @staticmethod
-    def imprint(cls, collection_name, indexes):
+    def imprint(cls, collection_name, indexes, change_tracking=False, deferred_fields=[], cache_policy=None):
         """ Imprint the entity metadata to the class (type)
 
             :param cls: the entity class
@@ -12,12 +12,21 @@ class EntityMetadataHelper(object):
             :type  collection_name: str
             :param indexes: the list of indexes
             :type  indexes: list
+            :param change_tracking: the flag to enable the property change tracking
+            :type  change_tracking: bool
+            :param deferred_fields: the list of the fields loaded on first access
+            :type  deferred_fields: list
+            :param cache_policy: the policy of the second-level cache
+            :type  cache_policy: tori.db.cache.CachePolicy
         """
         metadata = EntityMetadata()
 
         metadata.cls             = cls
         metadata.collection_name = collection_name
         metadata.index_list      = indexes
+        metadata.change_tracking = change_tracking
+        metadata.deferred_field_list = list(deferred_fields)
+        metadata.cache_policy        = cache_policy
 
         cls.__tdbm__ = metadata
 
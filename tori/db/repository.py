@@ -4,8 +4,11 @@
 :Status: Stable
 """
 import inspect
+from tornado import gen
 from tori.db.common    import PseudoObjectId, ProxyObject
 from tori.db.criteria  import Query, Order
+from tori.db.driver.observer import QueryStats
+from tori.db.entity    import DeferredFieldLoader
 from tori.db.exception import MissingObjectIdException, EntityAlreadyRecognized, EntityNotRecognized
 from tori.db.mapper    import AssociationType, CascadingType
 from tori.db.uow       import Record
@@ -81,7 +84,10 @@ class Repository(object):
                 This method deal with data mapping.
 
         """
-        spec = inspect.getargspec(self._class.__init__) # constructor contract
+        # The original inspection function is removed since Python 3.11.
+        get_argument_spec = inspect.getfullargspec if hasattr(inspect, 'getfullargspec') else inspect.getargspec
+
+        spec = get_argument_spec(self._class.__init__) # constructor contract
         meta = EntityMetadataHelper.extract(self._class)
         rmap = meta.relational_map # relational map
 
@@ -111,12 +117,78 @@ class Repository(object):
         return self._class(**attributes)
 
     def get(self, id):
-        data = self._session.driver.find_one(self.name, {'_id': id})
+        """ Get the entity by its ID
+
+            The second-level cache is checked before the driver (see
+            :class:`tori.db.cache.EntityCache`).
+
+            :param id: the object ID
+            :return: the entity or ``None``
+        """
+        record = self._session.find_record(id, self._class)
+
+        if record:
+            return record.entity
+
+        cache    = self._session.entity_cache
+        metadata = EntityMetadataHelper.extract(self._class)
+        data     = cache.get(metadata, id)
+
+        if data:
+            return self._dehydrate_object(data)
+
+        version = cache.version(self.name)
+        stats   = QueryStats('find_one', self.name, {'_id': id}, constrains={'limit': 1})
+        data    = self._session.driver.find_one(self.name, {'_id': id})
+
+        stats.queried(1 if data else 0)
+
+        if data:
+            cache.put(metadata, [data], version)
+
+        entity = self._dehydrate_object(data) if data else None
+
+        stats.hydrated()
+        self._session.observe(stats)
+
+        return entity
+
+    @gen.coroutine
+    def get_async(self, id):
+        """ Get the entity by its ID asynchronously
+
+            :param id: the object ID
+            :return: the future of the entity or ``None``
 
-        if not data:
-            return None
+            .. versionadded:: 3.1
+        """
+        record = self._session.find_record(id, self._class)
+
+        if record:
+            raise gen.Return(record.entity)
+
+        cache    = self._session.entity_cache
+        metadata = EntityMetadataHelper.extract(self._class)
+        data     = cache.get(metadata, id)
+
+        if data:
+            raise gen.Return(self._dehydrate_object(data))
+
+        version = cache.version(self.name)
+        stats   = QueryStats('find_one', self.name, {'_id': id}, constrains={'limit': 1})
+        data    = yield self._session.driver.find_one_async(self.name, {'_id': id})
+
+        stats.queried(1 if data else 0)
+
+        if data:
+            cache.put(metadata, [data], version)
 
-        return self._dehydrate_object(data)
+        entity = self._dehydrate_object(data) if data else None
+
+        stats.hydrated()
+        self._session.observe(stats)
+
+        raise gen.Return(entity)
 
     def find(self, criteria, force_loading=False):
         """ Find entity with criteria
@@ -129,12 +201,144 @@ class Repository(object):
             :returns: the result based on the given criteria
             :rtype: object or list of objects
         """
+        stats    = QueryStats('session.query', self.name, criteria, criteria.alias)
         data_set = self.session.query(criteria)
 
-        entity_list = []
+        stats.queried(len(data_set))
+
+        result = self._complete_find(criteria, data_set)
+
+        stats.hydrated()
+        self.session.observe(stats)
+
+        return result
+
+    @gen.coroutine
+    def find_async(self, criteria, force_loading=False):
+        """ Find entity with criteria asynchronously
+
+            :param criteria: the search criteria
+            :type  criteria: tori.db.criteria.Query
+            :param force_loading: the flag to force loading all references behind the proxy
+            :type  force_loading: bool
+
+            :returns: the future of the result based on the given criteria
+
+            .. versionadded:: 3.1
+
+            .. note::
+
+                The references are not loaded. Use
+                :meth:`tori.db.session.Session.load_async` to load them
+                without blocking.
+        """
+        stats    = QueryStats('session.query', self.name, criteria, criteria.alias)
+        data_set = yield self.session.query_async(criteria)
+
+        stats.queried(len(data_set))
+
+        result = yield self._complete_find_async(criteria, data_set)
+
+        stats.hydrated()
+        self.session.observe(stats)
+
+        raise gen.Return(result)
+
+    def iterate(self, criteria, batch_size=100, release=False):
+        """ Iterate entities with criteria
+
+            Unlike :meth:`find`, the data sets are streamed from the cursor of
+            the driver and the entities are hydrated (and prefetched) in
+            batches. This is designed for a large result, e.g., exporting or
+            reindexing a whole collection.
+
+            :param criteria: the search criteria
+            :type  criteria: tori.db.criteria.Query
+            :param batch_size: the number of entities hydrated at once
+            :type  batch_size: int
+            :param release: the flag to release the entities of each batch
+                            from the identity map once the next batch is
+                            requested (see :meth:`tori.db.session.Session.release`)
+            :type  release: bool
+
+            :returns: the generator of entities
+
+            For example,
+
+            .. code-block:: python
+
+                for entity in repository.iterate(criteria, batch_size = 1000, release = True):
+                    index(entity)
+
+            .. versionadded:: 3.1
+
+            .. note::
+
+                With ``release``, the memory usage stays flat regardless of
+                the size of the result as long as the entities are not
+                referred elsewhere. The entities with uncommitted changes
+                are not released.
+        """
+        plan      = self.session.prepare(criteria)
+        data_list = []
+
+        for data in plan.iterate(self.session, batch_size, criteria.definition_map):
+            data_list.append(data)
+
+            if len(data_list) < batch_size:
+                continue
+
+            for entity in self._iterate_batch(criteria, data_list, release):
+                yield entity
+
+            data_list = []
+
+        for entity in self._iterate_batch(criteria, data_list, release):
+            yield entity
+
+    def _iterate_batch(self, criteria, data_list, release):
+        if not data_list:
+            return
+
+        with self.session.hold_records():
+            entity_list = self._dehydrate_result_set(data_list, criteria.projection)
+
+            if criteria.prefetch_list:
+                self.session.prefetch(entity_list, criteria.prefetch_list)
+
+        for entity in entity_list:
+            yield entity
+
+        if release:
+            self.session.release(*entity_list)
+
+    def _complete_find(self, criteria, data_set):
+        """ Turn the data sets of the criteria into the result of :meth:`find` """
+        with self.session.hold_records():
+            entity_list = self._dehydrate_result_set(data_set, criteria.projection)
+
+            if criteria.prefetch_list:
+                self.session.prefetch(entity_list, criteria.prefetch_list)
+
+        return self._format_result(criteria, entity_list)
+
+    @gen.coroutine
+    def _complete_find_async(self, criteria, data_set):
+        """ Asynchronous version of :meth:`_complete_find` """
+        with self.session.hold_records():
+            entity_list = self._dehydrate_result_set(data_set, criteria.projection)
+
+            if criteria.prefetch_list:
+                yield self.session.prefetch_async(entity_list, criteria.prefetch_list)
+
+        raise gen.Return(self._format_result(criteria, entity_list))
+
+    def _dehydrate_result_set(self, data_set, projection=None):
+        entity_list         = []
+        relation_loader_map = {} # The relations are loaded for the whole result set at once.
 
         for data in data_set:
-            entity = self._dehydrate_object(data) \
+            entity = self._dehydrate_object(data, relation_loader_map, projection) \
                 if len(data.keys()) > 1 \
                 else ProxyObject(
                     self._session,
@@ -144,13 +348,20 @@ class Repository(object):
                     None,
                     False
                 )
-            record = self._session.find_record(id, self._class)
+
+            if isinstance(entity, ProxyObject):
+                self._session.proxy_loader.register(entity)
+
+            record = self._session.find_record(data['_id'], self._class)
 
             if record and record.status in [Record.STATUS_DELETED, Record.STATUS_IGNORED]:
                 continue
 
             entity_list.append(entity)
 
+        return entity_list
+
+    def _format_result(self, criteria, entity_list):
         if criteria._limit == 1:
             return entity_list[0] if entity_list else None
 
@@ -159,12 +370,84 @@ class Repository(object):
     def count(self, criteria):
         """ Count the number of entities satisfied the given criteria
 
+            The entities are counted by the backend datastore without being
+            loaded. The sorting and pagination of the criteria are ignored.
+
+            :param criteria: the search criteria
+            :type  criteria: tori.db.criteria.Query
+
+            :rtype: int
+
+            .. versionchanged:: 3.1
+
+                The new-style criteria (with joins) are supported.
+        """
+        return self._session.count(criteria)
+
+    def exists(self, criteria):
+        """ Check if any entity satisfies the given criteria
+
+            Unlike :meth:`filter_one`, no entity is loaded. Only the object ID
+            of the first match is requested from the backend datastore.
+
             :param criteria: the search criteria
             :type  criteria: tori.db.criteria.Query
 
+            :rtype: bool
+
+            .. versionadded:: 3.1
+        """
+        return self._session.exists(criteria)
+
+    def estimated_size(self):
+        """ Estimate the number of entities in the collection
+
+            The number is taken from the metadata of the collection if the
+            driver supports it and may be inaccurate, e.g., right after an
+            unclean shutdown of MongoDB.
+
             :rtype: int
+
+            .. versionadded:: 3.1
         """
-        return criteria.build_cursor(self).count()
+        return self._session.driver.estimated_size(EntityMetadataHelper.extract(self._class))
+
+    def count_async(self, criteria):
+        """ Count the number of entities satisfied the given criteria asynchronously
+
+            :param criteria: the search criteria
+            :type  criteria: tori.db.criteria.Query
+
+            :return: the future of the number of entities
+
+            .. versionadded:: 3.1
+        """
+        return self._session.count_async(criteria)
+
+    def aggregate(self, criteria):
+        """ Group and aggregate the entities satisfied the given criteria
+
+            The aggregation is executed by the backend datastore and only the
+            resulting rows are transferred (see
+            :meth:`tori.db.criteria.Query.aggregate`).
+
+            :param criteria: the search criteria with the aggregated values
+            :type  criteria: tori.db.criteria.Query
+
+            :return: the list of the rows (dictionaries of the grouping
+                     properties and the aggregated values)
+            :rtype: list
+
+            .. versionadded:: 3.1
+        """
+        return self._session.aggregate(criteria)
+
+    def aggregate_async(self, criteria):
+        """ Asynchronous version of :meth:`aggregate`
+
+            .. versionadded:: 3.1
+        """
+        return self._session.aggregate_async(criteria)
 
     def filter(self, condition={}, force_loading=False):
         criteria = self.new_criteria()
@@ -185,6 +468,33 @@ class Repository(object):
 
         return self.find(criteria)
 
+    def filter_async(self, condition={}, force_loading=False):
+        """ Asynchronous version of :meth:`filter`
+
+            .. versionadded:: 3.1
+        """
+        criteria = self.new_criteria()
+
+        criteria._force_loading = force_loading
+
+        criteria.where(condition)
+
+        return self.find_async(criteria)
+
+    def filter_one_async(self, condition={}, force_loading=False):
+        """ Asynchronous version of :meth:`filter_one`
+
+            .. versionadded:: 3.1
+        """
+        criteria = self.new_criteria()
+
+        criteria._force_loading = force_loading
+
+        criteria.where(condition)
+        criteria.limit(1)
+
+        return self.find_async(criteria)
+
     def post(self, entity):
         if entity.__session__:
             raise EntityAlreadyRecognized('The entity has already been recognized by this session.')
@@ -217,7 +527,19 @@ class Repository(object):
         if not entity or not entity.id or not entity.__session__ or isinstance(entity.id, PseudoObjectId):
             raise EntityNotRecognized('The entity is not recognized by this session.')
 
-    def _dehydrate_object(self, raw_data):
+    def _dehydrate_object(self, raw_data, relation_loader_map=None, projection=None):
+        """ Build (or retrieve) the entity from the raw data
+
+            :param raw_data: the raw data
+            :type  raw_data: dict
+            :param relation_loader_map: the map of the relation loaders shared
+                                        by the entities of the same result set
+                                        (optional)
+            :type  relation_loader_map: dict
+            :param projection: the projection used to load the raw data
+                               (optional)
+            :type  projection: dict
+        """
         if '_id' not in raw_data:
             raise MissingObjectIdException('The key _id in the raw data is not found.')
 
@@ -236,7 +558,10 @@ class Repository(object):
         document.id = id
         document.__session__ = self._session
 
-        self._session.apply_relational_map(document)
+        if projection:
+            DeferredFieldLoader.defer(document, projection, data)
+
+        self._session.apply_relational_map(document, relation_loader_map)
         self._session.recognize(document)
 
         return document
@@ -262,6 +587,29 @@ class Repository(object):
 
         return self._has_cascading
 
+    def cacheable(self, ttl=None, enabled=True):
+        """ Define whether the results of the queries on this repository are cached
+
+            :param ttl: the time-to-live of the results in seconds (``None``
+                        for the default TTL of the cache)
+            :type  ttl: float
+            :param enabled: the flag to enable caching
+            :type  enabled: bool
+
+            The policy is kept by the query cache shared by the sessions of
+            the same entity manager (see :class:`tori.db.cache.QueryCache`)
+            and can be overridden per query (see
+            :meth:`tori.db.criteria.Query.cacheable`).
+
+            .. versionadded:: 3.1
+        """
+        if enabled:
+            self._session.query_cache.enable(self.name, ttl)
+
+            return
+
+        self._session.query_cache.disable(self.name)
+
     def new_criteria(self, alias='e'):
         """ Create a criteria
 
@@ -306,4 +654,8 @@ class Repository(object):
             self.index(index)
 
     def __len__(self):
-        return self._session.driver.total_row_count(self.name)
\ No newline at end of file
+        """ Count the entities in the collection exactly (see :meth:`count`)
+
+            Use :meth:`estimated_size` for the fast estimation instead.
+        """
+        return self.count(self.new_criteria())
\ No newline at end of file
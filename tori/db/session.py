@@ -1,16 +1,28 @@
 
+import copy
 import re
-from tori.db.common import ProxyObject, ProxyFactory, ProxyCollection
+from threading import Lock
+from time      import time
+from tornado import gen
+from tori.db.cache import QueryCache, EntityCache
+from tori.db.common import ProxyObject, ProxyFactory, ProxyCollection, ProxyBatchLoader, ProxyRelationLoader
 from tori.db.criteria import Criteria
 from tori.db.repository import Repository
-from tori.db.entity import get_relational_map
-from tori.db.exception import IntegrityConstraintError, UnsupportedRepositoryReferenceError
+from tori.db.entity import get_relational_map, DeferredFieldLoader
+from tori.db.driver.interface import AsyncDriverInterface
+from tori.db.driver.observer import QueryStats, QueryStatsCollector
+from tori.db.exception import IntegrityConstraintError, UnsupportedRepositoryReferenceError, UnsupportedDriverError
 from tori.db.mapper import AssociationType
 from tori.db.metadata.entity import EntityMetadata
 from tori.db.metadata.helper import EntityMetadataHelper
 from tori.db.uow import UnitOfWork
 from tori.graph import DependencyNode, DependencyManager
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError: # Python 2 without the backport "futures"
+    ThreadPoolExecutor = None
+
 class QueryIteration(DependencyNode):
     def __init__(self, join_config, alias, parent_alias, property_path):
         super(QueryIteration, self).__init__()
@@ -44,25 +56,1065 @@ class QueryIteration(DependencyNode):
             'adjacent_nodes':self.adjacent_nodes
         }
 
-    def __repr__(self):
-        return str('{}({})'.format(self.__class__.__name__, self.to_dict()))
+    def __repr__(self):
+        return str('{}({})'.format(self.__class__.__name__, self.to_dict()))
+
+class JoinExecutor(object):
+    """ Join Executor
+
+        The executor of the sub queries of the joined aliases, which is shared
+        by the sessions of the same entity manager.
+
+        :param chunk_size: the maximum number of the joined keys in one native query
+        :type  chunk_size: int
+        :param max_workers: the maximum number of the sub queries executed
+                            concurrently (``1`` to execute them sequentially)
+        :type  max_workers: int
+
+        The joined keys are split into chunks of ``chunk_size`` keys so that
+        the native queries stay below the size limit of the backend datastore.
+        The results of the chunks are merged in order. The independent sub
+        queries, e.g., of the aliases joined to the same entity, are executed
+        concurrently on a thread pool.
+
+        .. note::
+
+            The thread pool requires :mod:`concurrent.futures` (the backport
+            ``futures`` for Python 2). Without the module, the sub queries
+            are executed sequentially.
+
+        .. versionadded:: 3.1
+    """
+    default_chunk_size = 10000
+
+    def __init__(self, chunk_size=None, max_workers=1):
+        self._chunk_size  = chunk_size or self.default_chunk_size
+        self._max_workers = max_workers
+        self._pool        = None
+        self._pool_lock   = Lock()
+
+    @property
+    def chunk_size(self):
+        """ The maximum number of the joined keys in one native query """
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        self._chunk_size = value or self.default_chunk_size
+
+    @property
+    def max_workers(self):
+        """ The maximum number of the sub queries executed concurrently """
+        return self._max_workers
+
+    def chunk(self, key_list):
+        """ Split the list of the joined keys into chunks
+
+            :param key_list: the list of the joined keys
+            :type  key_list: list
+            :rtype: list
+        """
+        return [
+            key_list[offset:offset + self._chunk_size]
+            for offset in range(0, len(key_list), self._chunk_size)
+        ] or [key_list]
+
+    def map(self, callback, task_list):
+        """ Execute the tasks
+
+            :param callback: the function to execute a task
+            :type  callback: callable
+            :param task_list: the list of the tasks
+            :type  task_list: list
+            :return: the list of the results in the same order as the tasks
+            :rtype: list
+        """
+        if len(task_list) < 2 or self._max_workers < 2 or not ThreadPoolExecutor:
+            return [callback(task) for task in task_list]
+
+        return list(self._thread_pool().map(callback, task_list))
+
+    def shutdown(self):
+        """ Shut down the thread pool """
+        with self._pool_lock:
+            if not self._pool:
+                return
+
+            self._pool.shutdown()
+
+            self._pool = None
+
+    def _thread_pool(self):
+        with self._pool_lock:
+            if not self._pool:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+
+            return self._pool
+
+class QueryParameter(object):
+    """ Placeholder of a parameter in the native query template
+
+        :param str name: the name of the parameter
+
+        .. note:: Internal use only
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return ':{}'.format(self.name)
+
+class PreparedQuery(object):
+    """ Prepared Query
+
+        This is the immutable plan of a query compiled by
+        :meth:`Session.prepare`. The join plan, the iterating sequence and
+        the native query templates are computed once. Each execution binds
+        the parameters into its own native queries. Hence, the plan can be
+        executed many times with different parameters, by any session using
+        the same dialect and from multiple threads.
+
+        :param dialect: the dialect of the driver
+        :type  dialect: tori.db.driver.interface.DialectInterface
+        :param query: the query (not modified and not referred afterwards)
+        :type  query: tori.db.criteria.Query
+
+        For example,
+
+        .. code-block:: python
+
+            query = repository.new_criteria('e')
+            query.expect('e.name = :name')
+
+            plan = session.prepare(query)
+
+            alice = plan.find(session, name = 'alice')
+            bob   = plan.find(session, name = 'bob')
+
+        .. versionadded:: 3.1
+    """
+    def __init__(self, dialect, query):
+        self._dialect  = dialect
+        self._query    = self._freeze(query)
+        self._metadata = EntityMetadataHelper.extract(query.origin)
+
+        self._iterations     = () # (alias, parent alias, property path, metadata)
+        self._waves          = () # the groups of the independent iterations
+        self._template_map   = {} # alias => native query template
+        self._constrains     = dialect.get_iterating_constrains(self._query)
+        self._parameter_list = ()
+        self._seek           = self._query.seek # (forward, keyset) for the keyset pagination
+
+        if not query.is_new_style:
+            # Deprecated in Tori 3.1; Only for backward compatibility
+            self._iterations   = ((query.alias, None, None, self._metadata),)
+            self._waves        = (self._iterations,)
+            self._template_map = {query.alias: self._query._condition}
+
+            return
+
+        self._compile_iterations(query)
+        self._compile_templates(query)
+
+    @property
+    def alias(self):
+        """ The alias of the root entity """
+        return self._query.alias
+
+    @property
+    def origin(self):
+        """ The class of the root entity """
+        return self._query.origin
+
+    @property
+    def parameters(self):
+        """ The names of the parameters """
+        return self._parameter_list
+
+    @property
+    def projection(self):
+        """ The projection of the root entity (see :attr:`tori.db.criteria.Query.projection`) """
+        return self._query.projection
+
+    @property
+    def prefetch_list(self):
+        """ The names of the prefetched properties """
+        return self._query.prefetch_list
+
+    def execute(self, session, definition_map=None, **definitions):
+        """ Retrieve the data sets
+
+            The iterations of the same wave (e.g., the aliases joined to the
+            same entity) are executed concurrently by the join executor of
+            the session and the large sets of joined keys are split into
+            chunks (see :class:`JoinExecutor`).
+
+            :param session: the session
+            :type  session: tori.db.session.Session
+            :param definition_map: the parameter-to-value map
+            :type  definition_map: dict
+            :param definitions: the values of the parameters
+            :return: the list of data sets
+        """
+        executor     = session.join_executor
+        cache_policy = self._cache_policy(session)
+        state        = self._begin(definition_map, definitions)
+
+        for wave in self._waves:
+            task_list = self._prepare_wave(state, executor, wave)
+            data_sets = executor.map(
+                lambda task: self._send(session, cache_policy, task),
+                task_list
+            )
+
+            if not self._complete_wave(state, wave, task_list, data_sets):
+                return []
+
+        return state['result_list']
+
+    @gen.coroutine
+    def execute_async(self, session, definition_map=None, **definitions):
+        """ Asynchronous version of :meth:`execute`
+
+            The sub queries of the same wave are sent concurrently.
+        """
+        executor     = session.join_executor
+        cache_policy = self._cache_policy(session)
+        state        = self._begin(definition_map, definitions)
+
+        for wave in self._waves:
+            task_list = self._prepare_wave(state, executor, wave)
+            data_sets = yield [self._send_async(session, cache_policy, task) for task in task_list]
+
+            if not self._complete_wave(state, wave, task_list, data_sets):
+                raise gen.Return([])
+
+        raise gen.Return(state['result_list'])
+
+    def count(self, session, definition_map=None, **definitions):
+        """ Count the data sets
+
+            The joined entities are queried first and only the entities of the
+            root alias are counted by the backend datastore. The sorting and
+            pagination are ignored.
+
+            :param session: the session
+            :type  session: tori.db.session.Session
+            :param definition_map: the parameter-to-value map
+            :type  definition_map: dict
+            :param definitions: the values of the parameters
+            :return: the number of data sets
+            :rtype: int
+        """
+        native_query_list = self._prepare_root_queries(session, definition_map, definitions)
+
+        if not native_query_list:
+            return 0
+
+        # The chunks may overlap. They are counted at once.
+        native_query = self._dialect.get_union_query(native_query_list)
+        stats        = QueryStats('count', self._metadata.collection_name, native_query, self.alias)
+        count        = session.driver.count(self._metadata, native_query)
+
+        stats.queried(0)
+        session.observe(stats)
+
+        return count
+
+    def exists(self, session, definition_map=None, **definitions):
+        """ Check if any data set matches
+
+            Only the object ID of the first matching data set of the root
+            alias is requested from the backend datastore.
+
+            :param session: the session
+            :type  session: tori.db.session.Session
+            :param definition_map: the parameter-to-value map
+            :type  definition_map: dict
+            :param definitions: the values of the parameters
+            :rtype: bool
+        """
+        native_query_list = self._prepare_root_queries(session, definition_map, definitions)
+
+        if not native_query_list:
+            return False
+
+        native_query = self._dialect.get_union_query(native_query_list)
+        stats        = QueryStats('exists', self._metadata.collection_name, native_query, self.alias, {'limit': 1, '_fields': {'_id': True}})
+        existing     = session.driver.exists(self._metadata, native_query)
+
+        stats.queried(1 if existing else 0)
+        session.observe(stats)
+
+        return existing
+
+    @gen.coroutine
+    def count_async(self, session, definition_map=None, **definitions):
+        """ Count the data sets asynchronously
+
+            The joined entities are queried first and only the entities of the
+            root alias are counted by the backend datastore.
+
+            :return: the future of the number of data sets
+        """
+        driver            = session._async_driver()
+        native_query_list = yield self._prepare_root_queries_async(session, definition_map, definitions)
+
+        if not native_query_list:
+            raise gen.Return(0)
+
+        # The chunks may overlap. They are counted at once.
+        native_query = self._dialect.get_union_query(native_query_list)
+        stats        = QueryStats('count', self._metadata.collection_name, native_query, self.alias)
+        count        = yield driver.count_async(self._metadata, native_query)
+
+        stats.queried(0)
+        session.observe(stats)
+
+        raise gen.Return(count)
+
+    def aggregate(self, session, definition_map=None, **definitions):
+        """ Run the aggregation of the query (see :meth:`tori.db.criteria.Query.aggregate`)
+
+            The joined entities are queried first and the entities of the root
+            alias are grouped and aggregated by the backend datastore.
+
+            :param session: the session
+            :type  session: tori.db.session.Session
+            :param definition_map: the parameter-to-value map
+            :type  definition_map: dict
+            :param definitions: the values of the parameters
+            :return: the list of the resulting rows
+            :rtype: list
+        """
+        native_query_list = self._prepare_root_queries(session, definition_map, definitions)
+
+        if not native_query_list:
+            return []
+
+        pipeline = self._dialect.get_aggregation_pipeline(native_query_list, self._query)
+        stats    = QueryStats('aggregate', self._metadata.collection_name, pipeline, self.alias)
+        row_list = session.driver.aggregate(self._metadata, pipeline)
+
+        stats.queried(len(row_list))
+        session.observe(stats)
+
+        return row_list
+
+    @gen.coroutine
+    def aggregate_async(self, session, definition_map=None, **definitions):
+        """ Asynchronous version of :meth:`aggregate` """
+        native_query_list = yield self._prepare_root_queries_async(session, definition_map, definitions)
+
+        if not native_query_list:
+            raise gen.Return([])
+
+        pipeline = self._dialect.get_aggregation_pipeline(native_query_list, self._query)
+        stats    = QueryStats('aggregate', self._metadata.collection_name, pipeline, self.alias)
+        row_list = yield session._async_driver().aggregate_async(self._metadata, pipeline)
+
+        stats.queried(len(row_list))
+        session.observe(stats)
+
+        raise gen.Return(row_list)
+
+    def iterate(self, session, batch_size=None, definition_map=None, **definitions):
+        """ Iterate the data sets
+
+            The joined aliases are queried first as usual. The data sets of
+            the root alias are then streamed from the cursor of the driver
+            (see :meth:`tori.db.driver.interface.DriverInterface.iterate`).
+
+            :param session: the session
+            :type  session: tori.db.session.Session
+            :param batch_size: the number of data sets fetched from the backend datastore at once
+            :type  batch_size: int
+            :param definition_map: the parameter-to-value map
+            :type  definition_map: dict
+            :param definitions: the values of the parameters
+            :return: the generator of data sets
+
+            .. note::
+
+                If the joined keys are split into chunks (see
+                :class:`JoinExecutor`), the results of the chunks are merged
+                before being iterated.
+        """
+        native_query_list = self._prepare_root_queries(session, definition_map, definitions)
+
+        if not native_query_list:
+            return
+
+        if len(native_query_list) == 1:
+            data_iterator = self._iterate_driver(session, self._metadata, native_query_list[0], batch_size)
+        else:
+            constrains = self._dialect.get_chunk_constrains(self._constrains)
+            data_sets  = session.join_executor.map(
+                lambda native_query: self._query_driver(session, (self.alias, self._metadata, native_query, constrains)),
+                native_query_list
+            )
+
+            data_iterator = self._dialect.merge_chunk_results(data_sets, self._constrains)
+
+        # The page before the cursor is retrieved backward.
+        if self._seek and not self._seek[0]:
+            data_iterator = reversed(list(data_iterator))
+
+        for data in data_iterator:
+            yield data
+
+    def find(self, session, definition_map=None, **definitions):
+        """ Find the entities
+
+            :param session: the session
+            :type  session: tori.db.session.Session
+            :param definition_map: the parameter-to-value map
+            :type  definition_map: dict
+            :param definitions: the values of the parameters
+            :return: the result (see :meth:`tori.db.repository.Repository.find`)
+        """
+        repository = session.repository(self.origin)
+
+        return repository._complete_find(self._query, self.execute(session, definition_map, **definitions))
+
+    @gen.coroutine
+    def find_async(self, session, definition_map=None, **definitions):
+        """ Asynchronous version of :meth:`find` """
+        repository = session.repository(self.origin)
+        data_set   = yield self.execute_async(session, definition_map, **definitions)
+        result     = yield repository._complete_find_async(self._query, data_set)
+
+        raise gen.Return(result)
+
+    def _freeze(self, query):
+        """ Copy the settings of the query which are used by the plan """
+        frozen = copy.copy(query)
+
+        frozen._condition      = copy.deepcopy(query._condition)
+        frozen._order_by       = list(query._order_by)
+        frozen._join_map       = {}
+        frozen._prefetch_list  = list(query._prefetch_list)
+        frozen._select_list    = list(query._select_list)
+        frozen._group_list     = list(query._group_list)
+        frozen._aggregate_list = list(query._aggregate_list)
+        frozen._having_list    = list(query._having_list)
+        frozen.definition_map  = dict(query.definition_map)
+
+        return frozen
+
+    def _begin(self, definition_map, definitions):
+        """ Create the state of an execution
+
+            :rtype: dict
+        """
+        parameter_map = dict(self._query.definition_map)
+
+        parameter_map.update(definition_map or {})
+        parameter_map.update(definitions)
+
+        for name in self._parameter_list:
+            if name not in parameter_map:
+                raise KeyError('The parameter "{}" is not defined.'.format(name))
+
+        alias_to_query_map = dict([
+            (alias, self._bind(self._template_map[alias], parameter_map))
+            for alias in self._template_map
+        ])
+
+        if self._seek:
+            alias_to_query_map[self.alias] = self._dialect.process_seek_conditions(
+                alias_to_query_map.get(self.alias, {}),
+                self._query.seek_order,
+                self._seek[1]
+            )
+
+        return {
+            'alias_to_query_map': alias_to_query_map,
+            'join_list_map': {}, # parent alias => [(joined alias, join config)]
+            'result_list':   []
+        }
+
+    def _bind(self, template, parameter_map):
+        if isinstance(template, QueryParameter):
+            return parameter_map[template.name]
+
+        if isinstance(template, dict):
+            return dict([(key, self._bind(template[key], parameter_map)) for key in template])
+
+        if isinstance(template, list):
+            return [self._bind(item, parameter_map) for item in template]
+
+        return template
+
+    def _cache_policy(self, session):
+        """ Retrieve the caching policy of the query
+
+            :return: the tuple of the flag whether the results are cached and the time-to-live
+            :rtype: tuple
+        """
+        cache_policy = self._query.cache_policy or session.query_cache.policy(self._metadata.collection_name)
+
+        return cache_policy or (False, None)
+
+    def _send(self, session, cache_policy, task):
+        """ Execute the sub query of the task through the query cache """
+        alias, metadata, native_query, constrains = task
+        enabled, ttl = cache_policy
+
+        if not enabled:
+            return self._query_driver(session, task)
+
+        cache    = session.query_cache
+        data_set = cache.get(metadata.collection_name, native_query, constrains)
+
+        if data_set is not None:
+            return data_set
+
+        version  = cache.version(metadata.collection_name)
+        data_set = self._query_driver(session, task)
+
+        cache.put(metadata.collection_name, native_query, constrains, data_set, ttl, version)
+
+        return data_set
+
+    @gen.coroutine
+    def _send_async(self, session, cache_policy, task):
+        """ Asynchronous version of :meth:`_send` """
+        alias, metadata, native_query, constrains = task
+        enabled, ttl = cache_policy
+
+        if not enabled:
+            data_set = yield self._query_driver_async(session, task)
+
+            raise gen.Return(data_set)
+
+        cache    = session.query_cache
+        data_set = cache.get(metadata.collection_name, native_query, constrains)
+
+        if data_set is not None:
+            raise gen.Return(data_set)
+
+        version  = cache.version(metadata.collection_name)
+        data_set = yield self._query_driver_async(session, task)
+
+        cache.put(metadata.collection_name, native_query, constrains, data_set, ttl, version)
+
+        raise gen.Return(data_set)
+
+    def _query_driver(self, session, task):
+        """ Execute the sub query of the task with the driver """
+        alias, metadata, native_query, constrains = task
+
+        stats    = QueryStats('query', metadata.collection_name, native_query, alias, constrains)
+        data_set = session.driver.query(metadata, native_query, constrains)
+
+        stats.queried(len(data_set))
+        session.observe(stats)
+
+        return data_set
+
+    @gen.coroutine
+    def _query_driver_async(self, session, task):
+        """ Asynchronous version of :meth:`_query_driver` """
+        alias, metadata, native_query, constrains = task
+
+        stats    = QueryStats('query', metadata.collection_name, native_query, alias, constrains)
+        data_set = yield session._async_driver().query_async(metadata, native_query, constrains)
+
+        stats.queried(len(data_set))
+        session.observe(stats)
+
+        raise gen.Return(data_set)
+
+    def _iterate_driver(self, session, metadata, native_query, batch_size):
+        """ Stream the data sets of the root alias from the driver
+
+            Only the time spent in the driver is measured. The statistics are
+            recorded once the stream is exhausted or closed.
+        """
+        stats          = QueryStats('iterate', metadata.collection_name, native_query, self.alias, self._constrains)
+        data_iterator  = iter(session.driver.iterate(metadata, native_query, self._constrains, batch_size))
+        duration       = 0.0
+        document_count = 0
+
+        try:
+            while True:
+                started_at = time()
+
+                try:
+                    data = next(data_iterator)
+                finally:
+                    duration += time() - started_at
+
+                document_count += 1
+
+                yield data
+        except StopIteration:
+            pass
+        finally:
+            stats.queried(document_count, duration)
+            session.observe(stats)
+
+    def _prepare_root_queries(self, session, definition_map, definitions):
+        """ Query the joined entities and prepare the native queries of the root alias
+
+            :return: the list of the native queries of the root alias (empty
+                     if no root entities can match)
+            :rtype: list
+        """
+        executor = session.join_executor
+        state    = self._begin(definition_map, definitions)
+
+        for wave in self._waves[:-1]:
+            task_list = self._prepare_wave(state, executor, wave)
+            data_sets = executor.map(
+                lambda task: self._query_driver(session, task),
+                task_list
+            )
+
+            if not self._complete_wave(state, wave, task_list, data_sets):
+                return []
+
+        alias, parent_alias, property_path, metadata = self._waves[-1][0]
+
+        return self._prepare_sub_queries(state, executor, alias, parent_alias)
+
+    @gen.coroutine
+    def _prepare_root_queries_async(self, session, definition_map, definitions):
+        """ Asynchronous version of :meth:`_prepare_root_queries` """
+        executor = session.join_executor
+        state    = self._begin(definition_map, definitions)
+
+        for wave in self._waves[:-1]:
+            task_list = self._prepare_wave(state, executor, wave)
+            data_sets = yield [self._query_driver_async(session, task) for task in task_list]
+
+            if not self._complete_wave(state, wave, task_list, data_sets):
+                raise gen.Return([])
+
+        alias, parent_alias, property_path, metadata = self._waves[-1][0]
+
+        raise gen.Return(self._prepare_sub_queries(state, executor, alias, parent_alias))
+
+    def _prepare_wave(self, state, executor, wave):
+        """ Prepare the sub queries of the wave
+
+            :return: the list of the tasks, each of which is the tuple of the
+                     alias, the metadata, the native query and the iterating
+                     constrains
+            :rtype: list
+        """
+        task_list = []
+
+        for alias, parent_alias, property_path, metadata in wave:
+            native_query_list = self._prepare_sub_queries(state, executor, alias, parent_alias)
+            constrains        = {}
+
+            # Only the root entities are sorted, paginated and projected.
+            if not parent_alias:
+                constrains = self._constrains \
+                    if len(native_query_list) == 1 \
+                    else self._dialect.get_chunk_constrains(self._constrains)
+
+            for native_query in native_query_list:
+                task_list.append((alias, metadata, native_query, constrains))
+
+        return task_list
+
+    def _prepare_sub_queries(self, state, executor, alias, parent_alias):
+        """ Prepare the native queries of the iteration
+
+            There is one native query per combination of the chunks of the
+            keys joined to the alias.
+
+            :return: the list of the native queries (empty if the sub query is unnecessary)
+            :rtype: list
+        """
+        alias_to_query_map = state['alias_to_query_map']
+        join_list          = state['join_list_map'].get(alias, [])
+
+        # The root entities are always queried.
+        if parent_alias and alias not in alias_to_query_map and not join_list:
+            return []
+
+        native_query_list = [alias_to_query_map.get(alias, {})]
+
+        for joined_alias, join_config in join_list:
+            chunked_query_list = []
+
+            for key_chunk in executor.chunk(join_config['result_list']):
+                chunk_config = dict(join_config)
+
+                chunk_config['result_list'] = key_chunk
+
+                for native_query in native_query_list:
+                    chunked_query = dict(native_query)
+
+                    self._dialect.process_join_conditions(
+                        {
+                            joined_alias: alias_to_query_map.get(joined_alias, {}),
+                            alias:        chunked_query
+                        },
+                        joined_alias,
+                        chunk_config,
+                        alias
+                    )
+
+                    chunked_query_list.append(chunked_query)
+
+            native_query_list = chunked_query_list
+
+        return native_query_list
+
+    def _complete_wave(self, state, wave, task_list, data_sets):
+        """ Complete the sub queries of the wave with their results
+
+            :return: ``True`` if the main query should continue
+            :rtype: bool
+        """
+        alias_to_data_sets_map = {}
+
+        for task, data_set in zip(task_list, data_sets):
+            alias = task[0]
+
+            if alias not in alias_to_data_sets_map:
+                alias_to_data_sets_map[alias] = []
+
+            alias_to_data_sets_map[alias].append(data_set)
+
+        for alias, parent_alias, property_path, metadata in wave:
+            if alias not in alias_to_data_sets_map:
+                continue
+
+            result_lists = alias_to_data_sets_map[alias]
+
+            if not parent_alias:
+                state['result_list'] = result_lists[0] \
+                    if len(result_lists) == 1 \
+                    else self._dialect.merge_chunk_results(result_lists, self._constrains)
+
+                # The page before the cursor is retrieved backward.
+                if self._seek and not self._seek[0]:
+                    state['result_list'] = list(reversed(state['result_list']))
+
+                continue
+
+            result_list = self._merge_result_lists(result_lists)
+
+            # No result in a sub-query means no result in the main query.
+            if not result_list:
+                return False
+
+            if parent_alias not in state['join_list_map']:
+                state['join_list_map'][parent_alias] = []
+
+            state['join_list_map'][parent_alias].append((
+                alias,
+                {
+                    'parent_alias':  parent_alias,
+                    'property_path': property_path,
+                    'result_list':   result_list
+                }
+            ))
+
+        return True
+
+    def _merge_result_lists(self, result_lists):
+        """ Merge the results of the chunks without duplicates """
+        if len(result_lists) == 1:
+            return result_lists[0]
+
+        result_list = []
+        known_ids   = set()
+
+        for data_set in result_lists:
+            for data in data_set:
+                if data['_id'] in known_ids:
+                    continue
+
+                known_ids.add(data['_id'])
+                result_list.append(data)
+
+        return result_list
+
+    def _compile_iterations(self, query):
+        join_map = {}
+
+        # Register the root entity
+        join_map[query.alias] = {
+            'alias': query.alias,
+            'path':  None,
+            'class': query.origin,
+            'parent_alias': None,
+            'property_path': None,
+            'result_list': []
+        }
+
+        for alias in query.join_map:
+            if alias == query.alias:
+                continue
+
+            join_map[alias] = {
+                'path':   query.join_map[alias]['path'],
+                'class':  None,
+                'mapper': None
+            }
+
+        self._update_join_map(self._metadata, join_map, query.alias)
+
+        self._iterations = tuple([
+            (
+                iteration.alias,
+                iteration.parent_alias,
+                iteration.property_path,
+                EntityMetadataHelper.extract(iteration.join_config['class'])
+            )
+            for iteration in self._compute_iterating_sequence(join_map)
+        ])
+
+        # The iterations are grouped by the height in the join tree. The
+        # iterations of the same wave are independent from one another.
+        height_map = {}
+
+        for alias, parent_alias, property_path, metadata in self._iterations:
+            if alias not in height_map:
+                height_map[alias] = 0
+
+            if parent_alias:
+                height_map[parent_alias] = max(height_map.get(parent_alias, 0), height_map[alias] + 1)
+
+        self._waves = tuple([
+            tuple([iteration for iteration in self._iterations if height_map[iteration[0]] == height])
+            for height in sorted(set([height_map[iteration[0]] for iteration in self._iterations]))
+        ])
+
+    def _compile_templates(self, query):
+        expression_set = query.criteria.get_analyzed_version()
+        placeholder_map = dict([(name, QueryParameter(name)) for name in expression_set.parameters])
+
+        # The native conditions are made with the placeholders of the parameters.
+        for expression in expression_set.expressions:
+            self._dialect.process_non_join_conditions(
+                self._template_map,
+                placeholder_map,
+                expression.left,
+                expression.right,
+                self._dialect.get_native_operand(expression.operand)
+            )
+
+        self._parameter_list = tuple(expression_set.parameters)
+
+    def _compute_iterating_sequence(self, join_map):
+        iterating_sequence = []
+        joining_sequence   = []
+        reference_map      = {}
+
+        # reference_map is used locally for fast reverse lookup
+        # iterating_seq is a final sequence
+
+        # Calculate the iterating sequence
+        for alias in join_map:
+            join_config = join_map[alias]
+
+            parent_alias  = None
+            property_path = None
+
+            if join_config['path']:
+                parent_alias, property_path = join_config['path'].split('.', 2)
+
+            qi = QueryIteration(join_config, alias, parent_alias, property_path)
+
+            joining_sequence.append(qi)
+
+            reference_map[alias] = qi
+
+        # Update the dependency map
+        for key in reference_map:
+            reference_a = reference_map[key]
+
+            if reference_a.parent_alias not in reference_map:
+                continue
+
+            reference_a.connect(reference_map[reference_a.parent_alias])
+
+        iterating_sequence = DependencyManager.get_order(reference_map)
+        iterating_sequence.reverse()
+
+        return iterating_sequence
+
+    def _update_join_map(self, origin_metadata, join_map, origin_alias):
+        link_map           = origin_metadata.relational_map
+        iterating_sequence = []
+
+        # Compute the (local) iterating sequence for updating the join map.
+        # Note: this is not the query iterating sequence.
+        for alias in join_map:
+            join_config = join_map[alias]
+
+            if join_config['class']:
+                continue
+
+            parent_alias, property_path = join_config['path'].split('.', 2)
+
+            join_config['alias']         = alias
+            join_config['property_path'] = property_path
+            join_config['parent_alias']  = parent_alias
+            join_config['result_list']   = []
+
+            iterating_sequence.append((join_config, alias, parent_alias, property_path))
+
+        # Update the immediate properties.
+        for join_config, current_alias, parent_alias, property_path in iterating_sequence:
+            if parent_alias != origin_alias:
+                continue
+
+            if property_path not in link_map:
+                continue
+
+            mapper = link_map[property_path]
+
+            join_config['class']  = mapper.target_class
+            join_config['mapper'] = mapper
+
+        # Update the joined properties.
+        for join_config, current_alias, parent_alias, property_path in iterating_sequence:
+
+            if current_alias not in join_map:
+                continue
+
+            if not join_map[current_alias]['class']:
+                continue
+
+            next_origin_class = join_map[current_alias]['class']
+            next_metadata     = EntityMetadataHelper.extract(next_origin_class)
+            self._update_join_map(next_metadata, join_map, current_alias)
+
+class Session(object):
+    """ Database Session
+
+        :param database_name: the database name
+        :param driver: the driver API
+        :param join_executor: the executor of the joined sub queries (sequential by default)
+        :type  join_executor: tori.db.session.JoinExecutor
+        :param query_cache: the query result cache
+        :type  query_cache: tori.db.cache.QueryCache
+        :param entity_cache: the second-level entity cache
+        :type  entity_cache: tori.db.cache.EntityCache
+
+        .. versionchanged:: 3.1
+
+            Added the join executor, the query result cache, the
+            second-level entity cache and the query statistics.
+    """
+    def __init__(self, driver, join_executor=None, query_cache=None, entity_cache=None):
+        self._driver = driver
+        self._uow    = UnitOfWork(self)
+        self._join_executor    = join_executor or JoinExecutor()
+        self._query_cache      = query_cache or QueryCache()
+        self._entity_cache     = entity_cache or EntityCache()
+        self._query_stats      = QueryStatsCollector()
+        self._proxy_loader     = ProxyBatchLoader(self)
+        self._repository_map   = {}
+        self._registered_types = {}
+        self._re_property_path_delimiter = re.compile('\.')
+
+    @property
+    def driver(self):
+        return self._driver
+
+    @property
+    def join_executor(self):
+        """ The executor of the joined sub queries
+
+            :rtype: tori.db.session.JoinExecutor
+        """
+        return self._join_executor
+
+    @property
+    def query_cache(self):
+        """ The query result cache
+
+            :rtype: tori.db.cache.QueryCache
+        """
+        return self._query_cache
+
+    @property
+    def entity_cache(self):
+        """ The second-level entity cache
+
+            :rtype: tori.db.cache.EntityCache
+        """
+        return self._entity_cache
+
+    @property
+    def query_stats(self):
+        """ The aggregated statistics of the queries of this session
+
+            :rtype: tori.db.driver.observer.QueryStatsCollector
+
+            .. versionadded:: 3.1
+        """
+        return self._query_stats
+
+    def observe(self, stats):
+        """ Record the statistics of a query
+
+            The statistics are aggregated by :attr:`query_stats` and sent to
+            the observers of the driver (see
+            :meth:`tori.db.driver.interface.DriverInterface.add_observer`).
+
+            :param stats: the statistics of the query
+            :type  stats: tori.db.driver.observer.QueryStats
+
+            .. versionadded:: 3.1
+        """
+        self._query_stats.on_query(self._driver, stats)
+        self._driver.notify_query(stats)
+
+    @property
+    def cascading_depth(self):
+        """ The depth of the cascading graph loaded before flushing
+
+            See :attr:`tori.db.uow.UnitOfWork.cascading_depth`.
+        """
+        return self._uow.cascading_depth
+
+    @cascading_depth.setter
+    def cascading_depth(self, value):
+        self._uow.cascading_depth = value
+
+    @property
+    def identity_map_size(self):
+        """ The maximum number of clean entities kept by the session
 
-class Session(object):
-    """ Database Session
+            See :attr:`tori.db.uow.UnitOfWork.identity_map_size`.
+        """
+        return self._uow.identity_map_size
 
-        :param database_name: the database name
-        :param driver: the driver API
-    """
-    def __init__(self, driver):
-        self._driver = driver
-        self._uow    = UnitOfWork(self)
-        self._repository_map   = {}
-        self._registered_types = {}
-        self._re_property_path_delimiter = re.compile('\.')
+    @identity_map_size.setter
+    def identity_map_size(self, value):
+        self._uow.identity_map_size = value
 
     @property
-    def driver(self):
-        return self._driver
+    def proxy_loader(self):
+        """ The batch loader of the proxy objects
+
+            :rtype: tori.db.common.ProxyBatchLoader
+        """
+        return self._proxy_loader
+
+    @property
+    def proxy_batch_size(self):
+        """ The maximum number of proxy objects of the same class resolved
+            with one query
+
+            See :class:`tori.db.common.ProxyBatchLoader`.
+        """
+        return self._proxy_loader.batch_size
+
+    @proxy_batch_size.setter
+    def proxy_batch_size(self, value):
+        self._proxy_loader.batch_size = value
 
     def collection(self, entity_class):
         """ Alias to ``repository()``
@@ -135,157 +1187,108 @@ class Session(object):
         if key not in self._registered_types:
             self._registered_types[key] = entity_class
 
-    def query(self, query):
-        metadata = EntityMetadataHelper.extract(query.origin)
-
-        # Deprecated in Tori 3.1; Only for backward compatibility
-        if not query.is_new_style:
-            return self.driver.query(
-                metadata,
-                query._condition,
-                self.driver.dialect.get_iterating_constrains(query)
-            )
-
-        root_class     = query.origin
-        expression_set = query.criteria.get_analyzed_version()
-
-        # Register the root entity
-        query.join_map[query.alias] = {
-            'alias': query.alias,
-            'path':  None,
-            'class': root_class,
-            'parent_alias': None,
-            'property_path': None,
-            'result_list': []
-        }
-
-        self._update_join_map(metadata, query.join_map, query.alias)
-
-        iterating_sequence = self._compute_iterating_sequence(query.join_map)
-        alias_to_query_map = self.driver.dialect.get_alias_to_native_query_map(query)
-
-        for alias in query.join_map:
-            mapping = query.join_map[alias]
-
-        for iteration in iterating_sequence:
-            if not self._sub_query(query, alias_to_query_map, iteration):
-                break
-
-        return query.join_map[query.alias]['result_list']
-
-    def _sub_query(self, query, alias_to_query_map, iteration):
-        is_join_query = True
-        alias         = iteration.alias
-
-        if alias not in alias_to_query_map:
-            return False
-
-        join_config  = query.join_map[alias]
-        joined_type  = join_config['class']
-        joined_meta  = EntityMetadataHelper.extract(joined_type)
-        native_query = alias_to_query_map[alias]
-        local_constrains = {}
-
-        if not iteration.parent_alias:
-            is_root    = False
-            constrains = self.driver.dialect.get_iterating_constrains(query)
+    def prepare(self, query):
+        """ Compile the query into a reusable plan
 
-        result_list = self.driver.query(joined_meta, native_query, local_constrains)
+            :param query: the query
+            :type  query: tori.db.criteria.Query
+            :rtype: tori.db.session.PreparedQuery
 
-        # No result in a sub-query means no result in the main query.
-        if not result_list:
-            return False
-
-        join_config['result_list'] = result_list
-
-        alias_to_query_map.update(self.driver.dialect.get_alias_to_native_query_map(query))
-
-        return True
-
-    def _compute_iterating_sequence(self, join_map):
-        iterating_sequence = []
-        joining_sequence   = []
-        reference_map      = {}
+            .. versionadded:: 3.1
+        """
+        return PreparedQuery(self.driver.dialect, query)
 
-        # reference_map is used locally for fast reverse lookup
-        # iterating_seq is a final sequence
+    def query(self, query):
+        """ Query the data sets
 
-        # Calculate the iterating sequence
-        for alias in join_map:
-            join_config = join_map[alias]
+            :param query: the query
+            :type  query: tori.db.criteria.Query
+            :return: the list of data sets
 
-            parent_alias  = None
-            property_path = None
+            .. versionchanged:: 3.1
 
-            if join_config['path']:
-                parent_alias, property_path = join_config['path'].split('.', 2)
+                The given query is no longer modified.
+        """
+        return self.prepare(query).execute(self, query.definition_map)
 
-            qi = QueryIteration(join_config, alias, parent_alias, property_path)
+    def query_async(self, query):
+        """ Query the data sets asynchronously
 
-            joining_sequence.append(qi)
+            :param query: the query
+            :type  query: tori.db.criteria.Query
+            :return: the future of the list of data sets
 
-            reference_map[alias] = qi
+            .. versionadded:: 3.1
+        """
+        return self.prepare(query).execute_async(self, query.definition_map)
 
-        # Update the dependency map
-        for key in reference_map:
-            reference_a = reference_map[key]
+    def count(self, query):
+        """ Count the data sets
 
-            if reference_a.parent_alias not in reference_map:
-                continue
+            The joined entities are queried first and only the entities of the
+            root alias are counted by the backend datastore.
 
-            reference_a.connect(reference_map[reference_a.parent_alias])
+            :param query: the query
+            :type  query: tori.db.criteria.Query
+            :return: the number of data sets
+            :rtype: int
 
-        iterating_sequence = DependencyManager.get_order(reference_map)
-        iterating_sequence.reverse()
+            .. versionadded:: 3.1
+        """
+        return self.prepare(query).count(self, query.definition_map)
 
-        return iterating_sequence
+    def exists(self, query):
+        """ Check if any data set matches the query
 
-    def _update_join_map(self, origin_metadata, join_map, origin_alias):
-        link_map           = origin_metadata.relational_map
-        iterating_sequence = []
+            :param query: the query
+            :type  query: tori.db.criteria.Query
+            :rtype: bool
 
-        # Compute the (local) iterating sequence for updating the join map.
-        # Note: this is not the query iterating sequence.
-        for alias in join_map:
-            join_config = join_map[alias]
+            .. versionadded:: 3.1
+        """
+        return self.prepare(query).exists(self, query.definition_map)
 
-            if join_config['class']:
-                continue
+    def count_async(self, query):
+        """ Count the data sets asynchronously
 
-            parent_alias, property_path = join_config['path'].split('.', 2)
+            The joined entities are queried first and only the entities of the
+            root alias are counted by the backend datastore.
 
-            join_config['alias']         = alias
-            join_config['property_path'] = property_path
-            join_config['parent_alias']  = parent_alias
-            join_config['result_list']   = []
+            :param query: the query
+            :type  query: tori.db.criteria.Query
+            :return: the future of the number of data sets
 
-            iterating_sequence.append((join_config, alias, parent_alias, property_path))
+            .. versionadded:: 3.1
+        """
+        return self.prepare(query).count_async(self, query.definition_map)
 
-        # Update the immediate properties.
-        for join_config, current_alias, parent_alias, property_path in iterating_sequence:
-            if parent_alias != origin_alias:
-                continue
+    def aggregate(self, query):
+        """ Run the aggregation of the query
 
-            if property_path not in link_map:
-                continue
+            :param query: the query (see :meth:`tori.db.criteria.Query.aggregate`)
+            :type  query: tori.db.criteria.Query
+            :return: the list of the resulting rows
 
-            mapper = link_map[property_path]
+            .. versionadded:: 3.1
+        """
+        return self.prepare(query).aggregate(self, query.definition_map)
 
-            join_config['class']  = mapper.target_class
-            join_config['mapper'] = mapper
+    def aggregate_async(self, query):
+        """ Run the aggregation of the query asynchronously
 
-        # Update the joined properties.
-        for join_config, current_alias, parent_alias, property_path in iterating_sequence:
+            :param query: the query (see :meth:`tori.db.criteria.Query.aggregate`)
+            :type  query: tori.db.criteria.Query
+            :return: the future of the list of the resulting rows
 
-            if current_alias not in join_map:
-                continue
+            .. versionadded:: 3.1
+        """
+        return self.prepare(query).aggregate_async(self, query.definition_map)
 
-            if not join_map[current_alias]['class']:
-                continue
+    def _async_driver(self):
+        if not isinstance(self._driver, AsyncDriverInterface):
+            raise UnsupportedDriverError('The asynchronous operations require an asynchronous driver.')
 
-            next_origin_class = join_map[current_alias]['class']
-            next_metadata     = EntityMetadataHelper.extract(next_origin_class)
-            self._update_join_map(next_metadata, join_map, current_alias)
+        return self._driver
 
     def delete(self, *entities):
         """ Delete entities
@@ -327,19 +1330,332 @@ class Session(object):
 
         registering_action(targeted_entity)
 
+    def hold_records(self):
+        """ Keep the entities registered or used in the context in the identity map
+
+            See :meth:`tori.db.uow.UnitOfWork.hold_records`.
+
+            .. versionadded:: 3.1
+        """
+        return self._uow.hold_records()
+
     def recognize(self, entity):
         self._uow.register_clean(self._force_load(entity))
 
+    def detach(self, *entities):
+        """ Detach entities from the session
+
+            The uncommitted changes of the detached entities are discarded.
+
+            :param entities: one or more entities
+            :type  entities: type of list of type
+        """
+        for entity in entities:
+            self._uow.detach(entity)
+
+    def release(self, *entities):
+        """ Release entities from the identity map of the session
+
+            The entities with uncommitted changes stay in the session. This is
+            designed to release the memory while iterating a large result (see
+            :meth:`tori.db.repository.Repository.iterate`).
+
+            :param entities: one or more entities
+            :type  entities: type of list of type
+
+            .. versionadded:: 3.1
+        """
+        for entity in entities:
+            self._uow.release(entity)
+
+    def clear(self):
+        """ Detach all entities from the session
+
+            This is designed to release the memory between batches of a long
+            running job.
+
+            .. warning:: All uncommitted changes are discarded.
+        """
+        self._uow.clear()
+
     def flush(self):
         """ Flush all changes of the session.
+
+            :rtype: tori.db.uow.FlushReport
+
+            .. versionchanged:: 3.1
+
+                The report of the flush is returned.
+        """
+        return self._uow.commit()
+
+    @gen.coroutine
+    def flush_async(self):
+        """ Flush all changes of the session asynchronously.
+
+            :return: the future of the report (:class:`tori.db.uow.FlushReport`)
+
+            .. versionadded:: 3.1
+        """
+        self._async_driver()
+
+        report = yield self._uow.commit_async()
+
+        raise gen.Return(report)
+
+    @gen.coroutine
+    def load_async(self, reference):
+        """ Load the entities behind the proxy asynchronously
+
+            :param reference: a proxy object, a proxy collection, a list of
+                              proxy objects or an entity
+            :return: the future of the actual entity or the list of the actual
+                     entities
+
+            If the given entity is loaded with a projection, its unloaded
+            fields are loaded as well.
+
+            .. versionadded:: 3.1
+        """
+        if isinstance(reference, ProxyObject):
+            relation_loader = reference._relation_loader
+
+            if relation_loader and not relation_loader.loaded:
+                yield relation_loader.load_async()
+
+            if reference._object_id and not reference._object:
+                yield self._proxy_loader.load_async(reference)
+
+            raise gen.Return(reference._object)
+
+        if isinstance(reference, ProxyCollection) and not reference._loaded:
+            yield reference._relation_loader.load_async()
+
+        if isinstance(reference, list):
+            entity_list = yield [self.load_async(item) for item in reference]
+
+            raise gen.Return(entity_list)
+
+        projection = DeferredFieldLoader.remaining_projection(reference)
+
+        if projection:
+            data = yield self._find_one_async(
+                EntityMetadataHelper.extract(reference).collection_name,
+                {'_id': reference.id},
+                projection
+            )
+
+            self._complete_deferred_fields(reference, data)
+
+        raise gen.Return(reference)
+
+    def load_deferred_fields(self, entity):
+        """ Load the unloaded fields of the entity loaded with a projection
+
+            This is called automatically on the first access to any unloaded
+            field. (See :class:`tori.db.entity.DeferredFieldLoader`.)
+
+            :param entity: the entity
+
+            .. versionadded:: 3.1
+        """
+        projection = DeferredFieldLoader.remaining_projection(entity)
+
+        if not projection:
+            return
+
+        data = self._find_one(
+            EntityMetadataHelper.extract(entity).collection_name,
+            {'_id': entity.id},
+            projection
+        )
+
+        self._complete_deferred_fields(entity, data)
+
+    def _find_one(self, collection_name, criteria, fields=None):
+        """ Find one data set with the driver and record the statistics """
+        stats = QueryStats('find_one', collection_name, criteria, constrains=self._find_one_constrains(fields))
+        data  = self._driver.find_one(collection_name, criteria, fields)
+
+        stats.queried(1 if data else 0)
+        self.observe(stats)
+
+        return data
+
+    @gen.coroutine
+    def _find_one_async(self, collection_name, criteria, fields=None):
+        """ Asynchronous version of :meth:`_find_one` """
+        stats = QueryStats('find_one', collection_name, criteria, constrains=self._find_one_constrains(fields))
+        data  = yield self._async_driver().find_one_async(collection_name, criteria, fields)
+
+        stats.queried(1 if data else 0)
+        self.observe(stats)
+
+        raise gen.Return(data)
+
+    def _find_one_constrains(self, fields):
+        constrains = {'limit': 1}
+
+        if fields:
+            constrains['_fields'] = fields
+
+        return constrains
+
+    def _complete_deferred_fields(self, entity, data):
+        self._uow.complete_snapshot(entity, DeferredFieldLoader.complete(entity, data or {}))
+
+    def prefetch(self, entity_list, property_name_list):
+        """ Load the relations of the entities with one query per relation
+
+            The proxies of the given properties are resolved in place. The
+            many-to-many relations take one query for the associations and
+            one for the associated entities.
+
+            :param entity_list: the list of entities (or proxies) of the same class
+            :type  entity_list: list
+            :param property_name_list: the names of the mapped properties
+            :type  property_name_list: list
+
+            .. versionadded:: 3.1
+        """
+        self._proxy_loader.load_all([entity for entity in entity_list if isinstance(entity, ProxyObject)])
+
+        entity_list = self._actual_entities(entity_list)
+
+        for property_name in property_name_list:
+            guide = self._prefetching_guide(entity_list, property_name)
+
+            if not guide:
+                continue
+
+            if guide.inverted_by or guide.association == AssociationType.MANY_TO_MANY:
+                self._relation_loader_for_prefetch(entity_list, property_name, guide).load()
+
+            self._proxy_loader.load_all(self._collect_proxies(entity_list, property_name))
+
+    @gen.coroutine
+    def prefetch_async(self, entity_list, property_name_list):
+        """ Asynchronous version of :meth:`prefetch`
+
+            .. versionadded:: 3.1
+        """
+        yield self._proxy_loader.load_all_async([entity for entity in entity_list if isinstance(entity, ProxyObject)])
+
+        entity_list = self._actual_entities(entity_list)
+
+        for property_name in property_name_list:
+            guide = self._prefetching_guide(entity_list, property_name)
+
+            if not guide:
+                continue
+
+            if guide.inverted_by or guide.association == AssociationType.MANY_TO_MANY:
+                yield self._relation_loader_for_prefetch(entity_list, property_name, guide).load_async()
+
+            yield self._proxy_loader.load_all_async(self._collect_proxies(entity_list, property_name))
+
+    def _actual_entities(self, entity_list):
+        return [
+            entity._object if isinstance(entity, ProxyObject) else entity
+            for entity in entity_list
+            if not isinstance(entity, ProxyObject) or entity._object
+        ]
+
+    def _prefetching_guide(self, entity_list, property_name):
+        """ Retrieve the relational guide of the prefetched property
+
+            :rtype: tori.db.mapper.RelatingGuide
+        """
+        if not entity_list:
+            return None
+
+        relational_map = EntityMetadataHelper.extract(entity_list[0]).relational_map
+
+        if property_name not in relational_map:
+            raise IntegrityConstraintError('{} is not a mapped property of {}.'.format(property_name, entity_list[0].__class__.__name__))
+
+        return relational_map[property_name]
+
+    def _collect_proxies(self, entity_list, property_name):
+        """ Collect the proxy objects held by the property of the entities
+
+            :rtype: list
+        """
+        proxy_list = []
+
+        for entity in entity_list:
+            value = entity.__dict__[property_name] if property_name in entity.__dict__ else None
+
+            if isinstance(value, ProxyObject):
+                if value._object_id:
+                    proxy_list.append(value)
+            elif isinstance(value, list) and not isinstance(value, ProxyCollection):
+                proxy_list.extend([item for item in value if isinstance(item, ProxyObject)])
+            elif isinstance(value, ProxyCollection) and value._loaded:
+                proxy_list.extend([item for item in list.__iter__(value) if isinstance(item, ProxyObject)])
+
+        return proxy_list
+
+    def _relation_loader_for_prefetch(self, entity_list, property_name, guide):
+        """ Gather the unloaded holders of the relation of the entities into one relation loader
+
+            :rtype: tori.db.common.ProxyRelationLoader
+        """
+        relation_loader = ProxyRelationLoader(self, guide)
+
+        for entity in entity_list:
+            value = entity.__dict__[property_name] if property_name in entity.__dict__ else None
+
+            if isinstance(value, ProxyCollection) and not value._loaded:
+                relation_loader.add(entity.id, value)
+            elif isinstance(value, ProxyObject) and value._relation_loader and not value._relation_loader.loaded:
+                relation_loader.add(entity.id, value)
+
+        return relation_loader
+
+    def add_flush_listener(self, listener):
+        """ Add a flush listener
+
+            The listener is a callable object which receives the
+            :class:`tori.db.uow.FlushReport` of every flush of this session.
+
+            :param listener: the flush listener
+            :type  listener: callable
+
+            .. versionadded:: 3.1
+        """
+        self._uow.add_flush_listener(listener)
+
+    def remove_flush_listener(self, listener):
+        """ Remove a flush listener
+
+            :param listener: the flush listener
+            :type  listener: callable
+
+            .. versionadded:: 3.1
         """
-        self._uow.commit()
+        self._uow.remove_flush_listener(listener)
 
     def find_record(self, id, cls):
         return self._uow.find_recorded_entity(id, cls)
 
-    def apply_relational_map(self, entity):
-        """ Wire connections according to the relational map """
+    def apply_relational_map(self, entity, relation_loader_map=None):
+        """ Wire connections according to the relational map
+
+            The reverse mappings and the many-to-many associations are loaded
+            lazily. The entities sharing the relation loader map (e.g., the
+            entities of the same result set) are loaded together with one
+            query per relation.
+
+            :param entity: the entity
+            :param relation_loader_map: the map of the property names to the
+                                        shared relation loaders (optional)
+            :type  relation_loader_map: dict
+
+            .. versionchanged:: 3.1
+
+                The reverse mappings are loaded lazily.
+        """
         meta = EntityMetadataHelper.extract(entity)
         rmap = meta.relational_map
 
@@ -347,32 +1663,22 @@ class Session(object):
             guide = rmap[property_name]
             """ :type: tori.db.mapper.RelatingGuide """
 
-            # In the reverse mapping, the lazy loading is not possible but so
-            # the proxy object is still used.
+            # In the reverse mapping, the proxy object is resolved by the relation loader.
             if guide.inverted_by:
-                target_meta = EntityMetadataHelper.extract(guide.target_class)
-
-                api = self._driver.collection(target_meta.collection_name)
+                relation_loader = self._relation_loader(relation_loader_map, property_name, guide)
 
                 if guide.association in [AssociationType.ONE_TO_ONE, AssociationType.MANY_TO_ONE]:
-                    # Replace with Criteria
-                    target = api.find_one({guide.inverted_by: entity.id})
-
-                    entity.__setattr__(property_name, ProxyFactory.make(self, target['_id'], guide))
-                elif guide.association == AssociationType.ONE_TO_MANY:
-                    # Replace with Criteria
-                    proxy_list = [
-                        ProxyFactory.make(self, target['_id'], guide)
-                        for target in api.find({guide.inverted_by: entity.id})
-                    ]
-
-                    entity.__setattr__(property_name, proxy_list)
-                elif guide.association == AssociationType.MANY_TO_MANY:
-                    entity.__setattr__(property_name, ProxyCollection(self, entity, guide))
+                    proxy = ProxyFactory.make(self, None, guide, relation_loader)
+
+                    relation_loader.add(entity.id, proxy)
+
+                    entity.__setattr__(property_name, proxy)
+                elif guide.association in [AssociationType.ONE_TO_MANY, AssociationType.MANY_TO_MANY]:
+                    entity.__setattr__(property_name, ProxyCollection(self, entity, guide, relation_loader))
                 else:
                     raise IntegrityConstraintError('Unknown type of entity association (reverse mapping)')
 
-                return # Done the application
+                continue
 
             # In the direct mapping, the lazy loading is applied wherever applicable.
             if guide.association in [AssociationType.ONE_TO_ONE, AssociationType.MANY_TO_ONE]:
@@ -398,10 +1704,32 @@ class Session(object):
 
                 entity.__setattr__(property_name, proxy_list)
             elif guide.association == AssociationType.MANY_TO_MANY:
-                entity.__setattr__(property_name, ProxyCollection(self, entity, guide))
+                entity.__setattr__(
+                    property_name,
+                    ProxyCollection(
+                        self,
+                        entity,
+                        guide,
+                        self._relation_loader(relation_loader_map, property_name, guide),
+                        entity.__dict__[property_name] if property_name in entity.__dict__ else None
+                    )
+                )
             else:
                 raise IntegrityConstraintError('Unknown type of entity association')
 
+    def _relation_loader(self, relation_loader_map, property_name, guide):
+        """ Retrieve the relation loader of the property
+
+            :rtype: tori.db.common.ProxyRelationLoader
+        """
+        if relation_loader_map is None:
+            return ProxyRelationLoader(self, guide)
+
+        if property_name not in relation_loader_map:
+            relation_loader_map[property_name] = ProxyRelationLoader(self, guide)
+
+        return relation_loader_map[property_name]
+
     def _force_load(self, entity):
         return entity._actual \
             if isinstance(entity, ProxyObject) \
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
+from collections import OrderedDict
+from contextlib  import contextmanager
 from time      import time
-from threading import Lock as ThreadLock
+from bson      import BSON, ObjectId
+from bson.errors import InvalidDocument
+from threading import Lock as ThreadLock, current_thread
+from tornado   import gen
 from tori.graph import DependencyNode as BaseDependencyNode, DependencyManager
-from tori.db.common    import Serializer, PseudoObjectId, ProxyObject
-from tori.db.entity    import BasicAssociation
-from tori.db.exception import UOWRepeatedRegistrationError, UOWUpdateError, UOWUnknownRecordError, IntegrityConstraintError
+from tori.db.common    import Serializer, PseudoObjectId, ProxyObject, ProxyCollection
+from tori.db.entity    import BasicAssociation, ChangeTracker, DeferredFieldLoader
+from tori.db.exception import UOWRepeatedRegistrationError, UOWUpdateError, UOWUnknownRecordError, UOWCommitInProgressError, IntegrityConstraintError, NonRefreshableEntity
 from tori.db.mapper    import CascadingType
 from tori.db.metadata.helper import EntityMetadataHelper
 
@@ -29,20 +34,186 @@ class Record(object):
         self.entity  = entity
         self.status  = status
         self.updated = time()
+        self.tracked = ChangeTracker.enabled(entity)
 
-        self.original_data_set          = Record.serializer.encode(self.entity)
-        self.original_extra_association = Record.serializer.extra_associations(self.entity)
+        self.original_data_set          = None
+        self.original_extra_association = None
+
+        self.take_snapshot()
 
     def mark_as(self, status):
         self.status  = status
         self.updated = time()
 
-    def update(self):
-        self.original_data_set          = Record.serializer.encode(self.entity)
+    def take_snapshot(self):
+        """ Take the snapshot of the entity
+
+            With the change tracking, only the external associations are
+            captured and the recorded property changes are forgotten.
+        """
         self.original_extra_association = Record.serializer.extra_associations(self.entity)
 
+        if self.tracked:
+            ChangeTracker.reset(self.entity)
+
+            return
+
+        self.original_data_set = Record.serializer.encode(self.entity)
+
+    def restore_snapshot(self, data_set):
+        """ Take the snapshot from the stored document of the entity
+
+            This is used when the entity is attached again after being
+            evicted. Only the differences between the entity and the stored
+            document are considered as changed. The unloaded deferred fields
+            are ignored.
+
+            :param data_set: the stored document
+            :type  data_set: dict
+        """
+        original_data_set = dict([
+            (name, data_set[name])
+            for name in data_set
+            if not DeferredFieldLoader.is_deferred(self.entity, name)
+        ])
+
+        if not self.tracked:
+            self.original_data_set = original_data_set
+
+            return
+
+        current_data_set = Record.serializer.encode(self.entity)
+
+        ChangeTracker.reset(self.entity)
+        ChangeTracker.mark(self.entity, *[
+            name
+            for name in set(original_data_set.keys()).union(current_data_set.keys())
+            if name != '_id' and (
+                name not in original_data_set
+                or name not in current_data_set
+                or original_data_set[name] != current_data_set[name]
+            )
+        ])
+
+    def invalidate_snapshot(self):
+        """ Consider every property of the entity as changed
+
+            This is used when the original state of the entity is unknown,
+            e.g., when a detached entity is attached again.
+        """
+        if self.tracked:
+            ChangeTracker.mark(self.entity, *Record.serializer.plan(self.entity).property_names(self.entity))
+
+            return
+
+        self.original_data_set = {}
+
+    def update(self):
+        self.take_snapshot()
+
         self.mark_as(Record.STATUS_CLEAN)
 
+class FlushReport(object):
+    """ Flush Report
+
+        This report is produced by every commit of :class:`UnitOfWork` and
+        given to the flush listeners.
+
+        =============== ====================================================
+        Property        Description
+        =============== ====================================================
+        phase_durations The map of phase names to durations (in seconds)
+        record_counts   The map of status labels to the number of records
+        encode_count    The number of entity encodings
+        driver_calls    The map of driver operations to the number of calls
+        bytes_sent      The approximate BSON size of the written data
+                        (only measured if ``measuring_bytes`` is enabled)
+        =============== ====================================================
+
+        The phases are ``cascading`` (loading related entities), ``graph``
+        (computing the commit order), ``change_set``, ``write`` (driver I/O),
+        ``association`` (diffing many-to-many associations) and
+        ``synchronization`` (updating the records).
+
+        :param measuring_bytes: the flag to measure ``bytes_sent``, which
+                                encodes every written document once more
+        :type  measuring_bytes: bool
+    """
+    def __init__(self, measuring_bytes=False):
+        self.measuring_bytes = measuring_bytes
+        self.started_at      = time()
+        self.finished_at     = None
+        self.phase_durations = {}
+        self.record_counts   = {}
+        self.encode_count    = 0
+        self.driver_calls    = {}
+        self.bytes_sent      = 0
+
+    @property
+    def duration(self):
+        """ The total duration of the flush (in seconds) """
+        return (self.finished_at or time()) - self.started_at
+
+    @contextmanager
+    def measure(self, phase):
+        """ Measure the duration of a phase
+
+            :param phase: the name of the phase
+            :type  phase: str
+        """
+        started_at = time()
+
+        try:
+            yield
+        finally:
+            self.phase_durations[phase] = self.phase_durations.get(phase, 0) + time() - started_at
+
+    def count_records(self, status, count=1):
+        """ Count the records of the given status
+
+            :param status: the status of the records
+            :type  status: int
+            :param count: the number of the records
+            :type  count: int
+        """
+        label = Record.STATUS_LABEL_MAP[status]
+
+        self.record_counts[label] = self.record_counts.get(label, 0) + count
+
+    def count_driver_call(self, operation, sent_data=None):
+        """ Count a driver call
+
+            :param operation: the name of the driver operation
+            :type  operation: str
+            :param sent_data: the written data (a document or a list of documents)
+        """
+        self.driver_calls[operation] = self.driver_calls.get(operation, 0) + 1
+
+        if not self.measuring_bytes or sent_data is None:
+            return
+
+        for document in (sent_data if isinstance(sent_data, list) else [sent_data]):
+            try:
+                self.bytes_sent += len(BSON.encode(document))
+            except InvalidDocument:
+                pass # Not measurable, e.g., the non-string keys accepted by some drivers
+
+    def finish(self):
+        self.finished_at = time()
+
+    def to_dict(self):
+        return {
+            'duration':        self.duration,
+            'phase_durations': self.phase_durations,
+            'record_counts':   self.record_counts,
+            'encode_count':    self.encode_count,
+            'driver_calls':    self.driver_calls,
+            'bytes_sent':      self.bytes_sent
+        }
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self.to_dict())
+
 class DependencyNode(BaseDependencyNode):
     """ Dependency Node
 
@@ -65,14 +236,17 @@ class DependencyNode(BaseDependencyNode):
     def _disavow_connection(self, node):
         return node.status == Record.STATUS_DELETED
 
-    def __eq__(self, other):
-        return self.record.entity.__class__ == other.record.entity.__class__ and self.object_id == other.object_id
+    def _depends_on(self, node):
+        # Only a new entity must be committed before the entities referring
+        # to it as its actual object ID is not known until then.
+        return node.status == Record.STATUS_NEW
 
-    def __ne__(self, other):
-        return self.record.entity.__class__ != other.record.entity.__class__ or self.object_id != other.object_id
-
-    def __hash__(self):
-        return self.created_at
+    def __repr__(self):
+        return '<DependencyNode for {}({}), {}>'.format(
+            self.record.entity.__class__.__name__,
+            self.object_id,
+            Record.STATUS_LABEL_MAP[self.status]
+        )
 
 class UnitOfWork(object):
     """ Unit of Work
@@ -88,24 +262,104 @@ class UnitOfWork(object):
     """
     serializer = Serializer(0)
 
-    def __init__(self, entity_manager):
+    def __init__(self, entity_manager, cascading_depth=1, identity_map_size=None):
         # given property
         self._em = entity_manager
+        self._cascading_depth   = cascading_depth
+        self._identity_map_size = identity_map_size
 
         # caching properties
         self._record_map    = {} # Object Hash => Record
         self._object_id_map = {} # str(ObjectID) => Object Hash
         self._dependency_map = None
 
+        # change tracking properties
+        self._change_map    = {} # Object Hash => Record (only new, dirty, deleted or ignored ones)
+        self._reference_map = {} # Object Hash => set of str(ObjectID) referred by the clean record
+        self._referrer_map  = {} # str(ObjectID) => set of Object Hash of the clean records referring to it
+        self._association_map = {} # (association class, origin ID) => set of Object Hash of the association records
+        self._clean_lru     = OrderedDict() # Object Hash => None (only clean ones, least recently used first)
+        self._hold_depth    = 0
+        self._held_uid_set  = set() # Object Hash of the records used in the current holding context (see hold_records)
+
+        # Flush profiling
+        self._report         = FlushReport()
+        self._flush_listeners = []
+
+        # Cache invalidation
+        self._written_object_id_map = {} # collection name => set of written object IDs (None if unknown)
+
         # Locks
         self._blocker_activated = False
+        self._commit_thread_id  = None
         self._blocking_lock     = ThreadLock()
         self._operational_lock  = ThreadLock()
 
+    @property
+    def cascading_depth(self):
+        """ The depth of the cascading graph loaded before committing
+
+            With the depth of 1, only the entities directly referred by the
+            committing records and the entities referring to the deleted
+            records are loaded. ``0`` disables the loading.
+        """
+        return self._cascading_depth
+
+    @cascading_depth.setter
+    def cascading_depth(self, value):
+        self._cascading_depth = value
+
+    @property
+    def identity_map_size(self):
+        """ The maximum number of clean records kept in the identity map
+
+            When the limit is reached, the least recently used clean records
+            are evicted. New, dirty and deleted records are never evicted
+            before they are committed and the records used within
+            :meth:`hold_records` (e.g., the result of a query being hydrated)
+            are only evicted afterward. ``None`` means unlimited.
+
+            An evicted entity is attached again (with the snapshot taken from
+            the stored document) when it is persisted or deleted.
+        """
+        return self._identity_map_size
+
+    @identity_map_size.setter
+    def identity_map_size(self, value):
+        self._identity_map_size = value
+
+        self._evict_clean_records()
+
+    @contextmanager
+    def hold_records(self):
+        """ Keep the records registered or used in the context from being evicted
+
+            This is used while the result of a query is hydrated so that the
+            entities handed out by the query stay in the identity map even if
+            the result is larger than :attr:`identity_map_size`. The limit is
+            applied again from the next registration after the context.
+
+            .. versionadded:: 3.1
+        """
+        self._hold_depth += 1
+
+        try:
+            yield
+        finally:
+            self._hold_depth -= 1
+
+            if not self._hold_depth:
+                self._held_uid_set = set()
+
     def _freeze(self):
         if not self._blocker_activated:
             return
 
+        # Waiting on the committing thread (e.g., from another coroutine
+        # during an asynchronous commit) would never end.
+        if self._commit_thread_id == current_thread().ident:
+            raise UOWCommitInProgressError('The unit of work cannot be modified while it is being committed.')
+
         self._operational_lock.acquire()
 
     def _unfreeze(self):
@@ -132,28 +386,35 @@ class UnitOfWork(object):
             raise NonRefreshableEntity('The current record is not refreshable.')
 
         collection       = self._em.collection(entity.__class__)
-        updated_data_set = collection.driver.find_one(collection.name, {'_id': entity.id})
+        updated_data_set = self._em._find_one(collection.name, {'_id': entity.id})
 
         # Reset the attributes.
         for attribute_name in updated_data_set:
             entity.__setattr__(attribute_name, updated_data_set[attribute_name])
 
+        DeferredFieldLoader.reset(entity)
+
         # Remove the non-existed attributes.
-        for attribute_name in record.original_data_set:
-            if attribute_name in updated_data_set:
+        original_data_set = record.original_data_set \
+            if record.original_data_set is not None \
+            else Record.serializer.encode(entity)
+
+        for attribute_name in original_data_set:
+            if attribute_name == '_id' or attribute_name in updated_data_set:
                 continue
 
             entity.__delattr__(attribute_name)
 
+        # Remap any one-to-many or many-to-many relationships.
+        self._em.apply_relational_map(entity)
+
         # Update the original data set and reset the status if necessary.
-        record.original_data_set = Record.serializer.encode(entity)
-        record.extra_association = Record.serializer.extra_associations(entity)
+        record.take_snapshot()
 
         if record.status == Record.STATUS_DIRTY:
             record.mark_as(Record.STATUS_CLEAN)
 
-        # Remap any one-to-many or many-to-many relationships.
-        self._em.apply_relational_map(entity)
+        self._index_references(self._retrieve_entity_guid(entity), record)
 
         self._cascade_operation(entity, CascadingType.REFRESH)
 
@@ -192,6 +453,9 @@ class UnitOfWork(object):
 
         self._record_map[uid] = Record(entity, Record.STATUS_NEW)
 
+        self._index_association(uid)
+        self._pin_record(uid, self._record_map[uid])
+
         # Map the pseudo object ID to the entity.
         self._object_id_map[self._convert_object_id_to_str(entity.id, entity)] = uid
 
@@ -206,7 +470,12 @@ class UnitOfWork(object):
 
         self._freeze()
 
-        record = self.retrieve_record(entity)
+        # Re-attach the entity which has been evicted or detached.
+        if not self.has_record(self._em._force_load(entity)):
+            self._reattach(self._em._force_load(entity), True)
+
+        uid    = self._retrieve_record_guid(entity)
+        record = self._record_map[uid]
 
         if record.status == Record.STATUS_NEW:
             try:
@@ -216,6 +485,8 @@ class UnitOfWork(object):
         elif record.status in [Record.STATUS_CLEAN, Record.STATUS_DELETED]:
             record.mark_as(Record.STATUS_DIRTY)
 
+            self._pin_record(uid, record)
+
         self._cascade_operation(entity, CascadingType.PERSIST)
 
         self._unfreeze()
@@ -237,6 +508,46 @@ class UnitOfWork(object):
         # Map the real object ID to the entity
         self._object_id_map[self._convert_object_id_to_str(entity.id, entity)] = uid
 
+        self._index_references(uid, self._record_map[uid])
+        self._index_association(uid)
+        self._release_record(uid)
+
+    def _reattach(self, entity, restoring_snapshot):
+        """ Attach the evicted or detached entity again as clean
+
+            Unlike :meth:`register_clean`, the record is not made evictable
+            as the caller is about to change it.
+
+            :param entity: the target entity
+            :type  entity: object
+            :param restoring_snapshot: the flag to take the snapshot from the
+                                       stored document (see
+                                       :meth:`Record.restore_snapshot`)
+            :type  restoring_snapshot: bool
+        """
+        uid    = self._retrieve_entity_guid(entity)
+        record = Record(entity, Record.STATUS_CLEAN)
+
+        self._record_map[uid] = record
+        self._object_id_map[self._convert_object_id_to_str(entity.id, entity)] = uid
+
+        self._index_references(uid, record)
+        self._index_association(uid)
+
+        if not restoring_snapshot:
+            return
+
+        collection = self._em.collection(entity.__class__)
+        data_set   = self._em._find_one(collection.name, {'_id': entity.id})
+
+        # Without the stored document, the original state is unknown.
+        if data_set is None:
+            record.invalidate_snapshot()
+
+            return
+
+        record.restore_snapshot(data_set)
+
     def register_deleted(self, entity):
         """ Register the entity with the removal bit
 
@@ -258,13 +569,20 @@ class UnitOfWork(object):
             :param entity: the target entity
             :type  entity: object
         """
-        record = self.retrieve_record(entity)
+        # Re-attach the entity which has been evicted or detached.
+        if entity.id and not isinstance(entity.id, PseudoObjectId) and not self.has_record(entity):
+            self._reattach(entity, False)
+
+        uid    = self._retrieve_record_guid(entity)
+        record = self._record_map[uid]
 
         if record.status == Record.STATUS_NEW or isinstance(entity.id, PseudoObjectId):
             record.mark_as(Record.STATUS_IGNORED)
         else:
             record.mark_as(Record.STATUS_DELETED)
 
+        self._pin_record(uid, record)
+
         self._cascade_operation(entity, CascadingType.DELETE)
 
     def _cascade_operation(self, reference, cascading_type):
@@ -285,29 +603,29 @@ class UnitOfWork(object):
             if guide.inverted_by:
                 continue
 
+            if not guide.cascading_options or cascading_type not in guide.cascading_options:
+                continue
+
             actual_data = entity.__getattribute__(property_name)
-            reference   = self.hydrate_entity(actual_data)
 
-            if not guide.cascading_options\
-                or cascading_type not in guide.cascading_options\
-                or not reference:
+            if not actual_data:
                 continue
 
-            if isinstance(reference, list):
-                for sub_reference in actual_data:
-                    self._forward_operation(
-                        self.hydrate_entity(sub_reference),
-                        cascading_type,
-                        guide.target_class
-                    )
+            for sub_reference in (actual_data if isinstance(actual_data, list) else [actual_data]):
+                # Only the supervised entities can be detached. No need to load them.
+                if cascading_type == CascadingType.DETACH:
+                    record = self.find_recorded_entity(self._retrieve_object_id(sub_reference), guide.target_class)
 
-                continue
+                    if record:
+                        self._detach(record.entity)
 
-            self._forward_operation(
-                reference,
-                cascading_type,
-                guide.target_class
-            )
+                    continue
+
+                self._forward_operation(
+                    self.hydrate_entity(sub_reference),
+                    cascading_type,
+                    guide.target_class
+                )
 
     def _forward_operation(self, reference, cascading_type, expected_class):
         if cascading_type == CascadingType.PERSIST:
@@ -334,6 +652,8 @@ class UnitOfWork(object):
             self.register_deleted(reference)
         elif cascading_type == CascadingType.REFRESH:
             self.refresh(reference)
+        elif cascading_type == CascadingType.DETACH:
+            self._detach(reference)
 
     def is_new(self, reference):
         return not reference.id or isinstance(reference.id, PseudoObjectId)
@@ -341,22 +661,123 @@ class UnitOfWork(object):
     def hydrate_entity(self, reference):
         return reference._actual if isinstance(reference, ProxyObject) else reference
 
+    def add_flush_listener(self, listener):
+        """ Add a flush listener
+
+            :param listener: the callable object receiving the flush report
+                             (:class:`FlushReport`) after every commit
+        """
+        self._flush_listeners.append(listener)
+
+    def remove_flush_listener(self, listener):
+        """ Remove the flush listener
+
+            :param listener: the registered listener
+        """
+        self._flush_listeners.remove(listener)
+
     def commit(self):
+        """ Commit all changes
+
+            :rtype: tori.db.uow.FlushReport
+        """
         self._blocking_lock.acquire()
 
+        report = self._begin_commit()
+
+        try:
+            # Make changes on the normal entities.
+            self._commit_changes()
+
+            # Then, make changes on external associations.
+            with report.measure('association'):
+                self._add_or_remove_associations()
+
+            self._commit_changes(BasicAssociation)
+
+            # Synchronize all records
+            with report.measure('synchronization'):
+                self._synchronize_records()
+        finally:
+            self._end_commit()
+
+        self._notify_flush_listeners(report)
+
+        return report
+
+    @gen.coroutine
+    def commit_async(self):
+        """ Commit all changes asynchronously
+
+            The driver must implement
+            :class:`tori.db.driver.interface.AsyncDriverInterface`.
+
+            :return: the future of the report (:class:`FlushReport`)
+
+            .. versionadded:: 3.1
+        """
+        # Waiting for the lock would block the event loop.
+        if not self._blocking_lock.acquire(False):
+            raise UOWCommitInProgressError('The unit of work is being committed.')
+
+        report = self._begin_commit()
+
+        try:
+            # Make changes on the normal entities.
+            yield self._commit_changes_async()
+
+            # Then, make changes on external associations.
+            with report.measure('association'):
+                yield self._add_or_remove_associations_async()
+
+            yield self._commit_changes_async(BasicAssociation)
+
+            # Synchronize all records
+            with report.measure('synchronization'):
+                self._synchronize_records()
+        finally:
+            self._end_commit()
+
+        self._notify_flush_listeners(report)
+
+        raise gen.Return(report)
+
+    def _begin_commit(self):
+        """ Block the registration from other threads and start a new report
+
+            :rtype: tori.db.uow.FlushReport
+        """
         self._blocker_activated = True
 
         self._freeze()
 
-        # Make changes on the normal entities.
-        self._commit_changes()
+        self._commit_thread_id = current_thread().ident
+
+        # Only the flush listeners read the size of the written data.
+        self._report = report = FlushReport(bool(self._flush_listeners))
 
-        # Then, make changes on external associations.
-        self._add_or_remove_associations()
-        self._commit_changes(BasicAssociation)
+        for uid in self._change_map:
+            report.count_records(self._change_map[uid].status)
 
-        # Synchronize all records
-        self._synchronize_records()
+        report.count_records(Record.STATUS_CLEAN, len(self._record_map) - len(self._change_map))
+
+        return report
+
+    def _end_commit(self):
+        self._report.finish()
+
+        # The cached results and documents are stale even if the commit failed halfway.
+        written_object_id_map = self._written_object_id_map
+
+        self._written_object_id_map = {}
+
+        if written_object_id_map:
+            self._em.query_cache.invalidate(*written_object_id_map.keys())
+
+        for collection_name, object_id_set in written_object_id_map.items():
+            self._em.entity_cache.invalidate(collection_name, object_id_set)
+
+        self._commit_thread_id = None
 
         self._unfreeze()
 
@@ -364,104 +785,532 @@ class UnitOfWork(object):
 
         self._blocking_lock.release()
 
+    def _mark_written(self, collection_name, object_id_list=None):
+        """ Mark the documents of the collection as written
+
+            This is called before the change is sent so that the cached
+            results and documents are invalidated even if the driver call
+            fails (see :meth:`_end_commit`).
+
+            :param collection_name: the name of the collection
+            :type  collection_name: str
+            :param object_id_list: the object IDs of the written documents
+                                   (``None`` if unknown)
+            :type  object_id_list: list
+        """
+        # Once unknown, any document of the collection may have been written.
+        if collection_name in self._written_object_id_map and self._written_object_id_map[collection_name] is None:
+            return
+
+        if object_id_list is None:
+            self._written_object_id_map[collection_name] = None
+
+            return
+
+        if collection_name not in self._written_object_id_map:
+            self._written_object_id_map[collection_name] = set()
+
+        self._written_object_id_map[collection_name].update(object_id_list)
+
+    def _notify_flush_listeners(self, report):
+        for listener in self._flush_listeners:
+            listener(report)
+
     def _commit_changes(self, expected_class=None):
         # Load the sub graph of supervised collections.
-        for c in self._em.repositories():
-            if not c.has_cascading():
+        with self._report.measure('cascading'):
+            self._load_cascading_graph()
+
+        with self._report.measure('graph'):
+            commit_levels = self._compute_commit_levels(self._compute_order())
+
+        # Commit changes level by level. As entities on the same level never
+        # depend on each other, their changes can be sent in bulk once the
+        # object IDs of the entities on the lower levels are known.
+        for commit_level in commit_levels:
+            self._commit_level(commit_level, expected_class)
+
+    @gen.coroutine
+    def _commit_changes_async(self, expected_class=None):
+        with self._report.measure('cascading'):
+            yield self._load_cascading_graph_async()
+
+        with self._report.measure('graph'):
+            commit_levels = self._compute_commit_levels(self._compute_order())
+
+        for commit_level in commit_levels:
+            yield self._commit_level_async(commit_level, expected_class)
+
+    def _load_cascading_graph(self):
+        """ Load the entities related to the committing records
+
+            Instead of loading the whole supervised collections, only the
+            entities referred through the cascading associations (up to
+            :attr:`cascading_depth` levels) and the entities of cascading
+            repositories referring to the deleted records are loaded with one
+            query per class or per property.
+        """
+        if not self._cascading_depth or self._cascading_depth < 1:
+            return
+
+        frontier = self._committing_records()
+
+        self._load_referrers(frontier)
+
+        for level in range(self._cascading_depth):
+            frontier = self._load_references(frontier)
+
+            if not frontier:
+                break
+
+    @gen.coroutine
+    def _load_cascading_graph_async(self):
+        """ Asynchronous version of :meth:`_load_cascading_graph`
+
+            The queries of the same level are sent concurrently.
+        """
+        if not self._cascading_depth or self._cascading_depth < 1:
+            return
+
+        frontier = self._committing_records()
+
+        yield self._load_referrers_async(frontier)
+
+        for level in range(self._cascading_depth):
+            frontier = yield self._load_references_async(frontier)
+
+            if not frontier:
+                break
+
+    def _committing_records(self):
+        committing_statuses = [Record.STATUS_NEW, Record.STATUS_DIRTY, Record.STATUS_DELETED]
+
+        return [
+            record
+            for record in self._change_map.values()
+            if record.status in committing_statuses
+        ]
+
+    def _load_references(self, record_list):
+        """ Load the unsupervised entities referred by the given records
+            through the cascading associations
+
+            :param record_list: the list of UOW records
+            :type  record_list: list
+            :return: the list of the records of newly loaded entities
+            :rtype: list
+        """
+        loaded_record_list = []
+
+        for repository, condition in self._compute_reference_conditions(record_list):
+            self._report.count_driver_call('query')
+
+            for entity in repository.filter(condition):
+                loaded_record_list.append(self.retrieve_record(entity))
+
+        return loaded_record_list
+
+    @gen.coroutine
+    def _load_references_async(self, record_list):
+        """ Asynchronous version of :meth:`_load_references` """
+        query_list = self._compute_reference_conditions(record_list)
+
+        for repository, condition in query_list:
+            self._report.count_driver_call('query')
+
+        entity_lists = yield [repository.filter_async(condition) for repository, condition in query_list]
+
+        raise gen.Return([
+            self.retrieve_record(entity)
+            for entity_list in entity_lists
+            for entity in entity_list
+        ])
+
+    def _compute_reference_conditions(self, record_list):
+        """ Compute the queries to load the unsupervised entities referred by
+            the given records through the cascading associations
+
+            :param record_list: the list of UOW records
+            :type  record_list: list
+            :return: the list of tuples of the repository and the condition
+            :rtype: list
+        """
+        class_to_id_map = {} # target class => list of object IDs
+
+        for record in record_list:
+            relational_map = EntityMetadataHelper.extract(record.entity).relational_map
+
+            for property_name in relational_map:
+                guide = relational_map[property_name]
+
+                if guide.inverted_by or not guide.cascading_options or not hasattr(record.entity, property_name):
+                    continue
+
+                data = record.entity.__getattribute__(property_name)
+
+                if (isinstance(data, ProxyCollection) and not data._loaded) or not data:
+                    continue
+
+                for reference in (data if isinstance(data, list) else [data]):
+                    if not reference:
+                        continue
+
+                    object_id = self._retrieve_object_id(reference)
+
+                    if isinstance(object_id, PseudoObjectId) or self.find_recorded_entity(object_id, guide.target_class):
+                        continue
+
+                    if guide.target_class not in class_to_id_map:
+                        class_to_id_map[guide.target_class] = []
+
+                    class_to_id_map[guide.target_class].append(object_id)
+
+        return [
+            (self._em.repository(target_class), {'_id': {'$in': class_to_id_map[target_class]}})
+            for target_class in class_to_id_map
+        ]
+
+    def _load_referrers(self, record_list):
+        """ Load the entities of the cascading repositories referring to the
+            deleted records
+
+            :param record_list: the list of UOW records
+            :type  record_list: list
+        """
+        for repository, condition in self._compute_referrer_conditions(record_list):
+            self._report.count_driver_call('query')
+
+            repository.filter(condition)
+
+    @gen.coroutine
+    def _load_referrers_async(self, record_list):
+        """ Asynchronous version of :meth:`_load_referrers` """
+        query_list = self._compute_referrer_conditions(record_list)
+
+        for repository, condition in query_list:
+            self._report.count_driver_call('query')
+
+        yield [repository.filter_async(condition) for repository, condition in query_list]
+
+    def _compute_referrer_conditions(self, record_list):
+        """ Compute the queries to load the entities of the cascading
+            repositories referring to the deleted records
+
+            :param record_list: the list of UOW records
+            :type  record_list: list
+            :return: the list of tuples of the repository and the condition
+            :rtype: list
+        """
+        class_to_id_map = {} # entity class => list of object IDs
+        query_list      = []
+
+        for record in record_list:
+            if record.status != Record.STATUS_DELETED:
+                continue
+
+            entity_class = record.entity.__class__
+
+            if entity_class not in class_to_id_map:
+                class_to_id_map[entity_class] = []
+
+            class_to_id_map[entity_class].append(record.entity.id)
+
+        if not class_to_id_map:
+            return query_list
+
+        for repository in self._em.repositories():
+            if not repository.has_cascading():
                 continue
 
-            c.filter(force_loading=True)
+            relational_map = EntityMetadataHelper.extract(repository.kind).relational_map
 
-        commit_order = self._compute_order()
+            for property_name in relational_map:
+                guide = relational_map[property_name]
+
+                if guide.inverted_by or guide.target_class not in class_to_id_map:
+                    continue
+
+                query_list.append((repository, {property_name: {'$in': class_to_id_map[guide.target_class]}}))
+
+        return query_list
+
+    def _retrieve_object_id(self, reference):
+        """ Retrieve the object ID of the reference without loading the proxy
+
+            :param reference: an object ID, a proxy or an entity
+        """
+        if isinstance(reference, ObjectId):
+            return reference
+        elif isinstance(reference, ProxyObject):
+            return reference._object_id
+
+        return reference.id
+
+    def _compute_commit_levels(self, commit_order):
+        """ Group the commit order into levels
+
+            The level of a node is one level higher than the highest level of
+            its dependencies.
+
+            :param commit_order: the topologically sorted dependency nodes
+            :type  commit_order: list
+            :rtype: list
+        """
+        level_map     = {}
+        commit_levels = []
 
-        # Commit changes to nodes.
         for commit_node in commit_order:
+            level = 0
+
+            for dependency_node in commit_node.adjacent_nodes:
+                if dependency_node in level_map and commit_node._depends_on(dependency_node):
+                    level = max(level, level_map[dependency_node] + 1)
+
+            level_map[commit_node] = level
+
+            while len(commit_levels) <= level:
+                commit_levels.append([])
+
+            commit_levels[level].append(commit_node)
+
+        return commit_levels
+
+    def _commit_level(self, commit_level, expected_class=None):
+        """ Commit the changes of one commit level grouped by collection
+
+            :param commit_level: the list of dependency nodes of the same level
+            :type  commit_level: list
+            :param expected_class: the expected class of entities
+            :type  expected_class: type
+        """
+        with self._report.measure('change_set'):
+            collection_map = self._compute_level_change_sets(commit_level, expected_class)
+
+        with self._report.measure('write'):
+            for collection_name in collection_map:
+                collection, batch_map = collection_map[collection_name]
+
+                if batch_map[Record.STATUS_NEW]:
+                    self._synchronize_new_batch(collection, batch_map[Record.STATUS_NEW])
+
+                if batch_map[Record.STATUS_DIRTY]:
+                    self._synchronize_update_batch(collection, batch_map[Record.STATUS_DIRTY])
+
+                if batch_map[Record.STATUS_DELETED]:
+                    self._synchronize_delete_batch(collection, batch_map[Record.STATUS_DELETED])
+
+    @gen.coroutine
+    def _commit_level_async(self, commit_level, expected_class=None):
+        """ Asynchronous version of :meth:`_commit_level`
+
+            The changes of different collections are sent concurrently.
+        """
+        with self._report.measure('change_set'):
+            collection_map = self._compute_level_change_sets(commit_level, expected_class)
+
+        with self._report.measure('write'):
+            yield [
+                self._synchronize_collection_async(*collection_map[collection_name])
+                for collection_name in collection_map
+            ]
+
+    @gen.coroutine
+    def _synchronize_collection_async(self, collection, batch_map):
+        if batch_map[Record.STATUS_NEW]:
+            yield self._synchronize_new_batch_async(collection, batch_map[Record.STATUS_NEW])
+
+        if batch_map[Record.STATUS_DIRTY]:
+            yield self._synchronize_update_batch_async(collection, batch_map[Record.STATUS_DIRTY])
+
+        if batch_map[Record.STATUS_DELETED]:
+            yield self._synchronize_delete_batch_async(collection, batch_map[Record.STATUS_DELETED])
+
+    def _compute_level_change_sets(self, commit_level, expected_class=None):
+        """ Compute the change sets of one commit level grouped by collection
+
+            :param commit_level: the list of dependency nodes of the same level
+            :type  commit_level: list
+            :param expected_class: the expected class of entities
+            :type  expected_class: type
+            :return: the map of collection names to the tuples of the repository
+                     and the map of statuses to the batches of changes
+            :rtype: dict
+        """
+        collection_map = {} # collection name => (repository, {status => list})
+
+        for commit_node in commit_level:
             uid    = self._retrieve_entity_guid_by_id(commit_node.object_id, commit_node.record.entity.__class__)
             record = self._record_map[uid]
 
             if expected_class and not isinstance(record.entity, expected_class):
                 continue
 
+            # Clean and ignored records have nothing to synchronize.
+            if record.status not in [Record.STATUS_NEW, Record.STATUS_DIRTY, Record.STATUS_DELETED]:
+                continue
+
             collection = self._em.collection(record.entity.__class__)
+
+            if collection.name not in collection_map:
+                collection_map[collection.name] = (collection, {
+                    Record.STATUS_NEW:     [],
+                    Record.STATUS_DIRTY:   [],
+                    Record.STATUS_DELETED: []
+                })
+
             change_set = self._compute_change_set(record)
+            batch_map  = collection_map[collection.name][1]
 
             if record.status == Record.STATUS_NEW:
-                self._synchronize_new(
-                    collection,
-                    record.entity,
-                    change_set
-                )
+                batch_map[Record.STATUS_NEW].append((record.entity, change_set))
             elif record.status == Record.STATUS_DIRTY and change_set:
-                self._synchronize_update(
-                    collection,
-                    record.entity.id,
-                    record.original_data_set,
-                    change_set
-                )
+                batch_map[Record.STATUS_DIRTY].append((record.entity.id, record.original_data_set, change_set))
             elif record.status == Record.STATUS_DIRTY and not change_set:
                 record.mark_as(Record.STATUS_CLEAN)
             elif record.status == Record.STATUS_DELETED and commit_node.score == 0:
-                self._synchronize_delete(collection, record.entity.id)
+                batch_map[Record.STATUS_DELETED].append(record.entity.id)
             elif record.status == Record.STATUS_DELETED and commit_node.score > 0:
                 record.mark_as(Record.STATUS_CLEAN)
 
-    def _synchronize_new(self, repository, entity, change_set):
-        """ Synchronize the new / unsupervised data
+        return collection_map
+
+    def _synchronize_new_batch(self, repository, batch):
+        """ Synchronize the new / unsupervised data in bulk
 
             :param repository: the target repository
+            :param batch: the list of tuples of the entity and the change set
+        """
+        change_set_list = [change_set for entity, change_set in batch]
+
+        # No cached document is changed by the insertion.
+        self._mark_written(repository.name, [])
+
+        object_id_list = repository.driver.insert_many(repository.name, change_set_list)
+
+        self._report.count_driver_call('insert_many', change_set_list)
+
+        for index in range(len(batch)):
+            self._remap_object_id(batch[index][0], object_id_list[index])
+
+    @gen.coroutine
+    def _synchronize_new_batch_async(self, repository, batch):
+        """ Asynchronous version of :meth:`_synchronize_new_batch` """
+        change_set_list = [change_set for entity, change_set in batch]
+
+        self._mark_written(repository.name, [])
+
+        object_id_list = yield repository.driver.insert_many_async(repository.name, change_set_list)
+
+        self._report.count_driver_call('insert_many', change_set_list)
+
+        for index in range(len(batch)):
+            self._remap_object_id(batch[index][0], object_id_list[index])
+
+    def _remap_object_id(self, entity, object_id):
+        """ Replace the pseudo object ID of the new entity with the actual one
+
             :param entity: the entity
-            :param change_set: the change_set representing the entity
+            :param object_id: the actual object ID
         """
         pseudo_key = self._convert_object_id_to_str(entity.id, entity)
-        object_id  = repository.driver.insert(repository.name, change_set)
         entity.id  = object_id # update the entity ID
         actual_key = self._convert_object_id_to_str(object_id, entity)
 
         self._object_id_map[actual_key] = self._object_id_map[pseudo_key]
 
-    def _synchronize_update(self, repository, object_id, old_data_set, new_data_set):
-        """ Synchronize the updated data
+    def _synchronize_update_batch(self, repository, batch):
+        """ Synchronize the updated data in bulk
 
             :param repository: the target repository
-            :param object_id: the object ID
-            :param old_data_set: the original data (for event interception)
-            :param new_data_set: the updated data
+            :param batch: the list of tuples of the object ID, the original data
+                          and the updated data
         """
+        self._mark_written(repository.name, [object_id for object_id, old_data_set, new_data_set in batch])
 
-        repository.driver.update(
+        repository.driver.update_many(
             repository.name,
-            {'_id': object_id},
-            new_data_set
+            [
+                ({'_id': object_id}, new_data_set)
+                for object_id, old_data_set, new_data_set in batch
+            ]
         )
 
-    def _synchronize_delete(self, repository, object_id):
-        """ Synchronize the deleted data
+        self._report.count_driver_call('update_many', [new_data_set for object_id, old_data_set, new_data_set in batch])
+
+    @gen.coroutine
+    def _synchronize_update_batch_async(self, repository, batch):
+        """ Asynchronous version of :meth:`_synchronize_update_batch` """
+        self._mark_written(repository.name, [object_id for object_id, old_data_set, new_data_set in batch])
+
+        yield repository.driver.update_many_async(
+            repository.name,
+            [
+                ({'_id': object_id}, new_data_set)
+                for object_id, old_data_set, new_data_set in batch
+            ]
+        )
+
+        self._report.count_driver_call('update_many', [new_data_set for object_id, old_data_set, new_data_set in batch])
+
+    def _synchronize_delete_batch(self, repository, object_id_list):
+        """ Synchronize the deleted data in bulk
 
             :param repository: the target repository
-            :param object_id: the object ID
+            :param object_id_list: the list of object IDs
         """
-        repository.driver.remove(repository.name, {'_id': object_id})
+        self._mark_written(repository.name, object_id_list)
+
+        repository.driver.remove_many(repository.name, object_id_list)
+
+        self._report.count_driver_call('remove_many', {'_id': {'$in': list(object_id_list)}})
+
+    @gen.coroutine
+    def _synchronize_delete_batch_async(self, repository, object_id_list):
+        """ Asynchronous version of :meth:`_synchronize_delete_batch` """
+        self._mark_written(repository.name, object_id_list)
+
+        yield repository.driver.remove_many_async(repository.name, object_id_list)
+
+        self._report.count_driver_call('remove_many', {'_id': {'$in': list(object_id_list)}})
 
     def _synchronize_records(self):
         writing_statuses = [Record.STATUS_NEW, Record.STATUS_DIRTY]
         removed_statuses = [Record.STATUS_DELETED, Record.STATUS_IGNORED]
-        uid_list         = list(self._record_map.keys())
 
-        for uid in uid_list:
-            record = self._record_map[uid]
+        for uid in self._change_map:
+            record = self._change_map[uid]
 
             if record.status in removed_statuses:
+                self._unindex_references(uid)
+                self._unindex_association(uid)
+
                 del self._record_map[uid]
+
+                continue
             elif record.status in writing_statuses:
                 record.update()
 
+                if not record.tracked:
+                    self._report.encode_count += 1
+
+            self._index_references(uid, record)
+
+        released_uid_list = [uid for uid in self._change_map if uid in self._record_map]
+        self._change_map  = {}
+
+        for uid in released_uid_list:
+            self._release_record(uid)
+
     def retrieve_record(self, entity):
+        return self._record_map[self._retrieve_record_guid(entity)]
+
+    def _retrieve_record_guid(self, entity):
         uid = self._retrieve_entity_guid(self._em._force_load(entity))
 
         if uid not in self._record_map:
             raise UOWUnknownRecordError('Unable to retrieve the record for this entity.')
 
-        return self._record_map[uid]
+        return uid
 
     def delete_record(self, entity):
         uid = self._retrieve_entity_guid(entity)
@@ -469,17 +1318,198 @@ class UnitOfWork(object):
         if uid not in self._record_map:
             raise UOWUnknownRecordError('Unable to retrieve the record for this entity.')
 
+        self._unindex_references(uid)
+        self._unindex_association(uid)
+
+        if uid in self._change_map:
+            del self._change_map[uid]
+
+        if uid in self._clean_lru:
+            del self._clean_lru[uid]
+
         del self._record_map[uid]
 
+    def detach(self, entity):
+        """ Detach the entity from the unit of work
+
+            Any uncommitted changes of the entity are discarded. Persisting the
+            entity later attaches it again.
+
+            :param entity: the target entity
+            :type  entity: object
+        """
+        self._freeze()
+
+        self._detach(self._em._force_load(entity))
+
+        self._unfreeze()
+
+    def release(self, entity):
+        """ Release the entity from the identity map
+
+            Unlike :meth:`detach`, the entity with uncommitted changes (or
+            registered to be persisted or deleted) stays in the identity map
+            and the associated entities are not affected.
+
+            :param entity: the target entity
+            :type  entity: object
+
+            .. versionadded:: 3.1
+        """
+        if isinstance(entity, ProxyObject):
+            entity = entity._actual
+
+        # The unloaded proxy is not in the identity map.
+        if entity is None:
+            return
+
+        self._freeze()
+
+        self._evict_record(hash(entity))
+
+        self._unfreeze()
+
+    def _detach(self, entity):
+        if not self.has_record(entity):
+            return
+
+        self.delete_record(entity)
+
+        object_key = self._convert_object_id_to_str(entity.id, entity)
+
+        if object_key in self._object_id_map:
+            del self._object_id_map[object_key]
+
+        self._cascade_operation(entity, CascadingType.DETACH)
+
+    def clear(self):
+        """ Detach all entities from the unit of work
+
+            .. warning:: All uncommitted changes are discarded.
+        """
+        self._freeze()
+
+        self._record_map      = {}
+        self._object_id_map   = {}
+        self._dependency_map  = None
+        self._change_map      = {}
+        self._reference_map   = {}
+        self._referrer_map    = {}
+        self._association_map = {}
+        self._clean_lru       = OrderedDict()
+
+        self._unfreeze()
+
+    def _pin_record(self, uid, record):
+        """ Keep the changed record in the identity map until it is committed
+
+            :param uid: the object hash of the record
+            :param record: the UOW record
+            :type  record: tori.db.uow.Record
+        """
+        self._change_map[uid] = record
+
+        if uid in self._clean_lru:
+            del self._clean_lru[uid]
+
+    def _release_record(self, uid):
+        """ Make the clean record evictable
+
+            :param uid: the object hash of the record
+        """
+        if uid in self._clean_lru:
+            del self._clean_lru[uid]
+
+        self._clean_lru[uid] = None
+
+        if self._hold_depth:
+            self._held_uid_set.add(uid)
+
+        self._evict_clean_records()
+
+    def _evict_clean_records(self):
+        """ Evict the least recently used clean records beyond the limit """
+        if self._identity_map_size is None:
+            return
+
+        overflow_count = len(self._clean_lru) - self._identity_map_size
+
+        if overflow_count <= 0:
+            return
+
+        # The held records are recently used. Only a few of them are skipped.
+        evicted_uid_list = []
+
+        for uid in self._clean_lru:
+            if len(evicted_uid_list) == overflow_count:
+                break
+
+            if uid not in self._held_uid_set:
+                evicted_uid_list.append(uid)
+
+        for uid in evicted_uid_list:
+            self._evict_record(uid)
+
+    def _evict_record(self, uid):
+        """ Remove the clean record from the identity map
+
+            :param uid: the object hash of the record
+        """
+        if uid not in self._record_map or uid in self._change_map:
+            return
+
+        record     = self._record_map[uid]
+        object_key = self._convert_object_id_to_str(record.entity.id, record.entity)
+
+        self._unindex_references(uid)
+        self._unindex_association(uid)
+
+        del self._record_map[uid]
+
+        if uid in self._clean_lru:
+            del self._clean_lru[uid]
+
+        if self._object_id_map.get(object_key) == uid:
+            del self._object_id_map[object_key]
+
     def has_record(self, entity):
         return self._retrieve_entity_guid(entity) in self._record_map
 
+    def complete_snapshot(self, entity, property_names):
+        """ Add the lately loaded properties of the entity to its snapshot
+
+            :param entity: the entity
+            :param property_names: the names of the lately loaded properties
+            :type  property_names: list
+        """
+        if not property_names or not self.has_record(entity):
+            return
+
+        record = self.retrieve_record(entity)
+
+        if record.original_data_set is None:
+            return
+
+        record.original_data_set.update(Record.serializer.encode_properties(entity, property_names))
+
     def find_recorded_entity(self, object_id, cls):
         object_key = self._convert_object_id_to_str(object_id, cls=cls)
 
         if object_key in self._object_id_map:
             try:
-                return self._record_map[self._object_id_map[object_key]]
+                uid    = self._object_id_map[object_key]
+                record = self._record_map[uid]
+
+                # Mark the clean record as recently used.
+                if uid in self._clean_lru:
+                    del self._clean_lru[uid]
+
+                    self._clean_lru[uid] = None
+
+                if self._hold_depth:
+                    self._held_uid_set.add(uid)
+
+                return record
             except KeyError as exception:
                 # This exception is raised possibly due to that the record is deleted.
                 del self._object_id_map[object_key]
@@ -494,13 +1524,17 @@ class UnitOfWork(object):
         return DependencyManager.get_order(self._dependency_map)
 
     def _compute_change_set(self, record):
-        current_set = Record.serializer.encode(record.entity)
+        if record.status in [Record.STATUS_NEW, Record.STATUS_DIRTY]:
+            self._report.encode_count += 1
 
         if record.status == Record.STATUS_NEW:
-            return current_set
+            return Record.serializer.encode(record.entity)
         elif record.status == Record.STATUS_DELETED:
             return record.entity.id
+        elif record.tracked:
+            return self._compute_tracked_change_set(record)
 
+        current_set  = Record.serializer.encode(record.entity)
         original_set = dict(record.original_data_set)
 
         change_set = {
@@ -538,6 +1572,35 @@ class UnitOfWork(object):
 
         return change_set
 
+    def _compute_tracked_change_set(self, record):
+        """ Compute the change set only from the properties recorded by
+            :class:`tori.db.entity.ChangeTracker`.
+
+            :param record: the UOW record
+            :type  record: tori.db.uow.Record
+        """
+        changed_property_list = ChangeTracker.changes(record.entity)
+
+        if not changed_property_list:
+            return {}
+
+        current_set = Record.serializer.encode_properties(record.entity, changed_property_list)
+        change_set  = {}
+
+        if current_set:
+            change_set['$set'] = current_set
+
+        removed_property_list = [
+            name
+            for name in changed_property_list
+            if name not in current_set and not hasattr(record.entity, name)
+        ]
+
+        if removed_property_list:
+            change_set['$unset'] = {name: 1 for name in removed_property_list}
+
+        return change_set
+
     def _compute_connection_changes(self, record):
         """ Compute changes in external associations originated from the entity
         of the current record
@@ -552,6 +1615,30 @@ class UnitOfWork(object):
         current  = Record.serializer.extra_associations(record.entity)
         original = dict(record.original_extra_association)
 
+        if record.status == Record.STATUS_DELETED:
+            return dict([(name, {'action': 'purge'}) for name in current])
+
+        # The proxy collections unloaded at the time of the snapshot are compared
+        # with the associations on the storage.
+        for name in list(original.keys()):
+            collection = original[name]
+
+            if not isinstance(collection, ProxyCollection):
+                continue
+
+            # The collection is still not loaded. Hence, nothing has changed.
+            if name in current and current[name] is collection:
+                del original[name]
+                del current[name]
+
+                continue
+
+            original[name] = collection.original_id_list
+
+        for name in current:
+            if isinstance(current[name], ProxyCollection):
+                current[name] = current[name].original_id_list
+
         change_set = {}
 
         original_property_set = set(original.keys())
@@ -560,7 +1647,7 @@ class UnitOfWork(object):
         expected_property_list = original_property_set.intersection(current_property_set)
         expected_property_list = expected_property_list.union(current_property_set.difference(original_property_set))
 
-        unexpected_property_list = expected_property_list if record.status == Record.STATUS_DELETED else original_property_set.difference(current_property_set)
+        unexpected_property_list = original_property_set.difference(current_property_set)
 
         # Find new associations
         for name in expected_property_list:
@@ -588,47 +1675,146 @@ class UnitOfWork(object):
 
         return change_set
 
-    def _load_extra_associations(self, record, change_set):
+    def _load_extra_associations(self, record, change_set, purging_origin_map):
+        """ Register the changes of the associative entities originated from
+            the entity of the record
+
+            The removed associations of each property are loaded with one
+            query. The purging origins are collected in ``purging_origin_map``
+            so that their associations are deleted on the server side at once.
+
+            :param record: the UOW record
+            :type  record: tori.db.uow.Record
+            :param change_set: the connection changes
+            :type  change_set: dict
+            :param purging_origin_map: the map of association classes to the
+                                       lists of purging origin IDs
+            :type  purging_origin_map: dict
+        """
+        for repository, condition in self._compute_extra_association_changes(record, change_set, purging_origin_map):
+            self._report.count_driver_call('query')
+
+            for association in repository.filter(condition):
+                self._register_deleted(association)
+
+    @gen.coroutine
+    def _load_extra_associations_async(self, record, change_set, purging_origin_map):
+        """ Asynchronous version of :meth:`_load_extra_associations` """
+        for repository, condition in self._compute_extra_association_changes(record, change_set, purging_origin_map):
+            self._report.count_driver_call('query')
+
+            association_list = yield repository.filter_async(condition)
+
+            for association in association_list:
+                self._register_deleted(association)
+
+    def _compute_extra_association_changes(self, record, change_set, purging_origin_map):
+        """ Register the new associations and compute the queries to load the
+            removed associations
+
+            :return: the list of tuples of the repository and the condition
+            :rtype: list
+        """
         origin_id      = record.entity.id
         relational_map = EntityMetadataHelper.extract(record.entity).relational_map
+        query_list     = []
 
         for property_name in relational_map:
             if property_name not in change_set:
                 continue
 
             property_change_set = change_set[property_name]
-            guide      = relational_map[property_name]
-            repository = self._em.collection(guide.association_class.cls)
+            association_class   = relational_map[property_name].association_class.cls
 
             if property_change_set['action'] == 'update':
-                for unlinked_destination_id in property_change_set['deleted']:
-                    association = repository.filter_one({'origin': origin_id, 'destination': unlinked_destination_id})
+                repository = self._em.collection(association_class)
 
-                    if not association:
-                        continue
-
-                    self._register_deleted(association)
+                if property_change_set['deleted']:
+                    query_list.append((repository, {
+                        'origin':      origin_id,
+                        'destination': {'$in': list(property_change_set['deleted'])}
+                    }))
 
                 for new_destination_id in property_change_set['new']:
                     association = repository.new(origin=origin_id, destination=new_destination_id)
 
                     self._register_new(association)
 
-                return
+                continue
             elif property_change_set['action'] == 'purge':
-                for association in repository.filter({'origin': origin_id}):
-                    self._register_deleted(association)
+                if association_class not in purging_origin_map:
+                    purging_origin_map[association_class] = []
+
+                purging_origin_map[association_class].append(origin_id)
 
-                return
+                continue
 
             raise RuntimeError('Unknown changes on external associations for {}'.format(origin_id))
 
+        return query_list
+
     def _add_or_remove_associations(self):
-        # Find out if UOW needs to deal with extra records (associative collection).
-        uid_list = list(self._record_map.keys())
+        purging_origin_map = {} # association class => list of origin IDs
 
-        for uid in uid_list:
-            record = self._record_map[uid]
+        for record, change_set in self._compute_association_changes():
+            self._load_extra_associations(record, change_set, purging_origin_map)
+
+        for association_class in purging_origin_map:
+            repository = self._em.collection(association_class)
+            condition  = {'origin': {'$in': purging_origin_map[association_class]}}
+
+            self._mark_written(repository.name)
+
+            repository.driver.remove(repository.name, condition)
+
+            self._report.count_driver_call('remove', condition)
+            self._forget_associations(association_class, purging_origin_map[association_class])
+
+    @gen.coroutine
+    def _add_or_remove_associations_async(self):
+        purging_origin_map = {} # association class => list of origin IDs
+
+        for record, change_set in self._compute_association_changes():
+            yield self._load_extra_associations_async(record, change_set, purging_origin_map)
+
+        for association_class in purging_origin_map:
+            repository = self._em.collection(association_class)
+            condition  = {'origin': {'$in': purging_origin_map[association_class]}}
+
+            self._mark_written(repository.name)
+
+            yield repository.driver.remove_async(repository.name, condition)
+
+            self._report.count_driver_call('remove', condition)
+            self._forget_associations(association_class, purging_origin_map[association_class])
+
+    def _forget_associations(self, association_class, origin_id_list):
+        """ Remove the records of the associations deleted on the server side
+
+            :param association_class: the association class
+            :type  association_class: type
+            :param origin_id_list: the list of the object IDs of the origins
+            :type  origin_id_list: list
+        """
+        for origin_id in set(origin_id_list):
+            association_key = (association_class, origin_id)
+
+            if association_key not in self._association_map:
+                continue
+
+            for uid in list(self._association_map[association_key]):
+                self.delete_record(self._record_map[uid].entity)
+
+    def _compute_association_changes(self):
+        """ Find out if UOW needs to deal with extra records (associative collection).
+
+            :return: the list of tuples of the record and the connection changes
+            :rtype: list
+        """
+        association_changes = []
+
+        for uid in list(self._change_map.keys()):
+            record = self._change_map[uid]
 
             if record.status == Record.STATUS_CLEAN:
                 continue
@@ -638,10 +1824,12 @@ class UnitOfWork(object):
             if not change_set:
                 continue
 
-            self._load_extra_associations(record, change_set)
+            association_changes.append((record, change_set))
+
+        return association_changes
 
     def _retrieve_entity_guid(self, entity):
-        return self._retrieve_entity_guid_by_id(entity.id, entity.__class__)\
+        return self._retrieve_entity_guid_by_id(entity.id, entity._class)\
             if isinstance(entity, ProxyObject)\
             else hash(entity)
 
@@ -666,69 +1854,171 @@ class UnitOfWork(object):
         return object_key
 
     def _construct_dependency_graph(self):
+        """ Construct the dependency graph of the changed records
+
+            Only the new, dirty and deleted records are walked through. A clean
+            record is only included when a changed record refers to it or when
+            it refers to a deleted record.
+        """
         self._dependency_map = {}
 
-        for uid in self._record_map:
-            record = self._record_map[uid]
+        committing_statuses = [Record.STATUS_NEW, Record.STATUS_DIRTY, Record.STATUS_DELETED]
 
-            object_id = self._convert_object_id_to_str(record.entity.id, record.entity)
+        for uid in self._change_map:
+            record = self._change_map[uid]
+
+            if record.status not in committing_statuses:
+                continue
 
-            current_set       = Record.serializer.encode(record.entity)
-            extra_association = Record.serializer.extra_associations(record.entity)
+            object_id = self._convert_object_id_to_str(record.entity.id, record.entity)
 
             # Register the current entity into the dependency map if it's never
             # been registered or eventually has no dependencies.
             if object_id not in self._dependency_map:
                 self._dependency_map[object_id] = DependencyNode(record)
 
-            relational_map = EntityMetadataHelper.extract(record.entity).relational_map
+            for other_key in self._retrieve_reference_keys(record.entity):
+                other_uid = self._object_id_map.get(other_key)
+
+                if other_uid not in self._record_map:
+                    continue # The referred entity is not supervised by this unit of work.
+
+                other_record = self._record_map[other_uid]
+
+                self._register_dependency(record, other_record)
 
-            if not relational_map:
+            if record.status != Record.STATUS_DELETED or object_id not in self._referrer_map:
                 continue
 
-            # Go through the relational map to establish relationship between dependency nodes.
-            for property_name in relational_map:
-                guide = relational_map[property_name]
+            # Register the clean records referring to the deleted entity.
+            for referrer_uid in self._referrer_map[object_id]:
+                referrer = self._record_map[referrer_uid]
 
-                # Ignore a property from reverse mapping.
-                if guide.inverted_by:
-                    continue
+                if referrer.status != Record.STATUS_CLEAN:
+                    continue # The dependencies of a changed record are computed from its current state.
+
+                self._register_dependency(referrer, record)
+
+        return self._dependency_map
+
+    def _retrieve_reference_keys(self, entity, including_unloaded=True):
+        """ Retrieve the keys of the entities referred by the given entity
+
+            :param entity: the entity
+            :param including_unloaded: the flag to include the references held
+                                       by unloaded proxy collections
+            :type  including_unloaded: bool
+            :rtype: list
+        """
+        reference_keys = []
+        relational_map = EntityMetadataHelper.extract(entity).relational_map
+
+        for property_name in relational_map:
+            guide = relational_map[property_name]
+
+            # Ignore a property from reverse mapping.
+            if guide.inverted_by or not hasattr(entity, property_name):
+                continue
 
-                # ``data`` can be either an object ID or list.
-                data = current_set[property_name]
+            data = entity.__getattribute__(property_name)
 
-                if not data:
-                    # Ignore anything evaluated as False.
+            # Checking the length of an unloaded proxy collection loads it.
+            if isinstance(data, ProxyCollection) and not data._loaded:
+                if not including_unloaded:
                     continue
-                elif not isinstance(data, list):
-                    other_uid    = self._retrieve_entity_guid_by_id(data, guide.target_class)
-                    other_record = self._record_map[other_uid]
 
-                    self._register_dependency(record, other_record)
+                data = list(data._stored_value or []) # The stored object IDs are used instead.
 
+            if not data:
+                continue # Ignore anything evaluated as False.
+
+            for reference in (data if isinstance(data, list) else [data]):
+                if not reference:
                     continue
 
-                for dependency_object_id in data:
-                    other_uid    = self._retrieve_entity_guid_by_id(dependency_object_id, guide.target_class)
-                    other_record = self._record_map[other_uid]
+                other_id = self._retrieve_object_id(reference)
 
-                    self._register_dependency(record, other_record)
+                reference_keys.append(self._convert_object_id_to_str(other_id, cls=guide.target_class))
 
-        return self._dependency_map
+        return reference_keys
+
+    def _index_references(self, uid, record):
+        """ Index the references of the clean record for reverse lookup
+
+            :param uid: the object hash of the record
+            :param record: the UOW record
+            :type  record: tori.db.uow.Record
+        """
+        self._unindex_references(uid)
+
+        reference_keys = set(self._retrieve_reference_keys(record.entity, False))
+
+        if not reference_keys:
+            return
 
-    def _retrieve_dependency_order(self, node, priority_order):
-        if node.walked:
+        self._reference_map[uid] = reference_keys
+
+        for reference_key in reference_keys:
+            if reference_key not in self._referrer_map:
+                self._referrer_map[reference_key] = set()
+
+            self._referrer_map[reference_key].add(uid)
+
+    def _unindex_references(self, uid):
+        """ Remove the references of the record from the reverse lookup index
+
+            :param uid: the object hash of the record
+        """
+        if uid not in self._reference_map:
             return
 
-        node.walked = True
+        for reference_key in self._reference_map[uid]:
+            referrer_set = self._referrer_map[reference_key]
+
+            referrer_set.discard(uid)
+
+            if not referrer_set:
+                del self._referrer_map[reference_key]
+
+        del self._reference_map[uid]
 
-        initial_order = list(node.adjacent_nodes)
+    def _index_association(self, uid):
+        """ Index the association record by its origin (see :meth:`_forget_associations`)
+
+            :param uid: the object hash of the record
+        """
+        entity = self._record_map[uid].entity
+
+        if not isinstance(entity, BasicAssociation):
+            return
+
+        association_key = (type(entity), entity.origin)
+
+        if association_key not in self._association_map:
+            self._association_map[association_key] = set()
+
+        self._association_map[association_key].add(uid)
+
+    def _unindex_association(self, uid):
+        """ Remove the association record from the index of the origins
+
+            :param uid: the object hash of the record
+        """
+        entity = self._record_map[uid].entity
+
+        if not isinstance(entity, BasicAssociation):
+            return
+
+        association_key = (type(entity), entity.origin)
+        uid_set         = self._association_map.get(association_key)
+
+        if uid_set is None:
+            return
 
-        for adjacent_node in initial_order:
-            self._retrieve_dependency_order(adjacent_node, priority_order)
+        uid_set.discard(uid)
 
-        if node not in priority_order:
-            priority_order.append(node)
+        if not uid_set:
+            del self._association_map[association_key]
 
     def _register_dependency(self, a, b):
         key_a = self._convert_object_id_to_str(a.entity.id, a.entity)
@@ -29,6 +29,19 @@ class SingletonInitializationException(Exception):
     attribute `_singleton_instance` not a reference to its own class.
     """
 
+# Dependency Graph
+class CircularDependencyError(Exception):
+    """
+    Exception thrown only when the dependency graph is not acyclic.
+
+    The unresolvable nodes, which are either in the cycles or depending on
+    them, are available as the property ``nodes``.
+    """
+    def __init__(self, message, nodes):
+        super(CircularDependencyError, self).__init__(message)
+
+        self.nodes = nodes
+
 # Dependency-injectable Application
 class InvalidConfigurationError(Exception):
     """
@@ -1,41 +1,63 @@
-from time import time
+from collections import deque
+from itertools   import count
+from time        import time
+from tori.exception import CircularDependencyError
 
 class DependencyNode(object):
     """ Dependency Node
 
         This is designed to be bi-directional to maximize flexibility on
         traversing the graph.
+
+        Each node is identified by a sequence number which is unique within
+        the process. Hence, two nodes created at the same time never collide.
     """
+    _sequence = count()
+
     def __init__(self):
         self.created_at     = int(time() * 1000000)
+        self.sequence       = next(DependencyNode._sequence)
         self.adjacent_nodes = set()
         self.reverse_edges  = set()
-        self.walked         = False
+        self._score         = None
 
     def connect(self, other):
         self.adjacent_nodes.add(other)
         other.reverse_edges.add(self)
 
+        other._score = None
+
     def _disavow_connection(self, node):
         return False
 
+    def _depends_on(self, node):
+        """ Check if this node must be ordered after the given adjacent node.
+
+            :param node: the adjacent node
+            :rtype: bool
+        """
+        return True
+
     @property
     def score(self):
-        score = 0
-
-        for node in self.reverse_edges:
-            if self._disavow_connection(node):
-                continue
+        if self._score is None:
+            self._score = len([
+                node
+                for node in self.reverse_edges
+                if not self._disavow_connection(node)
+            ])
 
-            score += 1
+        return self._score
 
-        return score
+    def reset_score(self):
+        """ Reset the cached score """
+        self._score = None
 
     def __eq__(self, other):
-        return self.created_at == other.created_at
+        return self.sequence == other.sequence
 
     def __ne__(self, other):
-        return self.created_at != other.created_at
+        return self.sequence != other.sequence
 
     def __lt__(self, other):
         return self.score < other.score
@@ -50,36 +72,65 @@ class DependencyNode(object):
         return self.score >= other.score
 
     def __hash__(self):
-        return self.created_at
+        return self.sequence
 
     def __repr__(self):
-        return '<DependencyNode for {}, {}>'.format(self.object_id, self.score)
+        return '<{} #{}, {}>'.format(self.__class__.__name__, self.sequence, self.score)
 
 class DependencyManager(object):
     @staticmethod
     def get_order(dependency_map):
-        # After constructing the dependency graph (as a supposedly directed acyclic
-        # graph), do the topological sorting from the dependency graph.
+        """ Sort the dependency graph topologically.
+
+            Every node is placed after all of its adjacent nodes (dependencies).
+            The sort is iterative (Kahn's algorithm) and runs in linear time.
+            Nodes without any ordering constraint keep the order of the map.
+
+            :param dependency_map: the map of the keys to the dependency nodes
+            :type  dependency_map: dict
+            :rtype: list
+
+            :raise tori.exception.CircularDependencyError: only if the graph is
+                not acyclic.
+        """
+        node_list = [dependency_map[key] for key in dependency_map]
+        in_degree = {}
+        ready     = deque()
+
+        for node in node_list:
+            in_degree[node] = 0
+
+        for node in node_list:
+            for adjacent_node in node.adjacent_nodes:
+                if adjacent_node in in_degree and node._depends_on(adjacent_node):
+                    in_degree[node] += 1
+
+        for node in node_list:
+            if not in_degree[node]:
+                ready.append(node)
+
         final_order = []
 
-        for id in dependency_map:
-            node = dependency_map[id]
+        while ready:
+            node = ready.popleft()
 
-            DependencyManager._retrieve_dependency_order(node, final_order)
+            final_order.append(node)
 
-        return final_order
+            for dependent_node in node.reverse_edges:
+                if dependent_node not in in_degree or not dependent_node._depends_on(node):
+                    continue
 
-    @staticmethod
-    def _retrieve_dependency_order(node, priority_order):
-        if node.walked:
-            return
+                in_degree[dependent_node] -= 1
 
-        node.walked = True
+                if not in_degree[dependent_node]:
+                    ready.append(dependent_node)
 
-        initial_order = list(node.adjacent_nodes)
+        if len(final_order) < len(node_list):
+            cyclic_nodes = [node for node in node_list if in_degree[node]]
 
-        for adjacent_node in initial_order:
-            DependencyManager._retrieve_dependency_order(adjacent_node, priority_order)
+            raise CircularDependencyError(
+                'Unable to resolve the circular dependency between {}'.format(cyclic_nodes),
+                cyclic_nodes
+            )
 
-        if node not in priority_order:
-            priority_order.append(node)
\ No newline at end of file
+        return final_order